@@ -0,0 +1,97 @@
+"""
+Per-event memory footprint of a mirrored calendar.
+
+Builds a calendar of events the way the mirror stores them (one JSON document per
+row), loads it back and measures, with tracemalloc, the memory held by the raw
+dicts, the eager `Event` models and the lazy `LazyEvent` views.
+
+    poetry run python benchmarks/event_memory.py --events 50000
+"""
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+from dataclasses import fields
+from datetime import datetime, timedelta
+
+from multi_agent_functions.v1.google.calender.model.calender_list import CalendarListEntry
+from multi_agent_functions.v1.google.calender.model.events import Event, LazyEvent
+from multi_agent_functions.v1.google.tasks.model.tasklist import TaskList
+
+EVENT_FIELDS = [f.name for f in fields(Event)]
+TIME_ZONES = ['Africa/Johannesburg', 'Europe/London', 'America/New_York']
+
+
+def make_event(index: int, rng: random.Random) -> dict:
+    start = datetime(2025, 1, 1, 8) + timedelta(hours=rng.randrange(24 * 365))
+    zone = rng.choice(TIME_ZONES)
+    event = {
+        'kind': 'calendar#event',
+        'etag': f'"{3400000000000000 + index}"',
+        'id': f'{index:08x}{rng.getrandbits(64):016x}',
+        'status': rng.choice(['confirmed', 'confirmed', 'tentative']),
+        'htmlLink': f'https://www.google.com/calendar/event?eid={index:08x}',
+        'created': '2024-12-01T10:00:00.000Z',
+        'updated': f'2025-01-{1 + index % 28:02d}T10:00:00.000Z',
+        'summary': f'Meeting {index}',
+        'creator': {'email': 'will@example.com', 'self': True},
+        'organizer': {'email': 'will@example.com', 'self': True},
+        'start': {'dateTime': start.isoformat() + '+02:00', 'timeZone': zone},
+        'end': {'dateTime': (start + timedelta(minutes=30)).isoformat() + '+02:00', 'timeZone': zone},
+        'iCalUID': f'{index:08x}@google.com',
+        'sequence': 0,
+        'reminders': {'useDefault': True},
+        'eventType': 'default',
+    }
+    if index % 3 == 0:
+        event['attendees'] = [
+            {'email': f'guest{n}@example.com', 'responseStatus': rng.choice(['accepted', 'needsAction'])}
+            for n in range(3)
+        ]
+    if index % 5 == 0:
+        event['description'] = f'Agenda for meeting {index}'
+        event['location'] = 'Cape Town'
+    return event
+
+
+def read(event: LazyEvent, names) -> LazyEvent:
+    for name in names:
+        getattr(event, name)
+    return event
+
+
+def measure(label: str, rows, build, count: int) -> None:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = build(rows)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f'{label:<34} {(after - before) / count:>8.0f} bytes/event {(after - before) / 2 ** 20:>8.1f} MiB')
+    del objects
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--events', type=int, default=50000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    rows = [json.dumps(make_event(index, rng)) for index in range(args.events)]
+    dicts = [json.loads(row) for row in rows]
+    print(f'{args.events} events')
+    measure('raw dicts', rows, lambda rows: [json.loads(row) for row in rows], args.events)
+    measure('Event (from raw dicts)', dicts, lambda dicts: [Event.from_dict(data) for data in dicts], args.events)
+    measure('LazyEvent, id and summary read', dicts, lambda dicts: [read(LazyEvent(data), ('id', 'summary')) for data in dicts], args.events)
+    measure('LazyEvent, every field read', dicts, lambda dicts: [read(LazyEvent(data), EVENT_FIELDS) for data in dicts], args.events)
+
+    entries = [{'kind': 'calendar#calendarListEntry', 'etag': f'"{n}"', 'id': f'cal{n}@group.calendar.google.com', 'timeZone': rng.choice(TIME_ZONES), 'accessRole': 'owner'} for n in range(args.events)]
+    measure('CalendarListEntry', entries, lambda entries: [CalendarListEntry.from_dict(data) for data in entries], args.events)
+    tasklists = [{'kind': 'tasks#taskList', 'id': f'list{n}', 'etag': f'"{n}"', 'title': f'List {n}', 'updated': '2025-01-01T10:00:00.000Z'} for n in range(args.events)]
+    measure('TaskList', tasklists, lambda tasklists: [TaskList.from_dict(data) for data in tasklists], args.events)
+
+
+if __name__ == '__main__':
+    main()
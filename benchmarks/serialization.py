@@ -0,0 +1,94 @@
+"""
+Speed of `Event.to_dict` with compiled serializers against the previous path.
+
+The previous path serialized every nested model with `dataclasses.asdict` and looked
+up the pytz time zone of each start and end on every call. Both paths serialize the
+same events, and their output is checked to be identical.
+
+    poetry run python benchmarks/serialization.py --events 10000
+"""
+import argparse
+import inspect
+import random
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, is_dataclass
+
+from event_memory import make_event
+
+from multi_agent_functions.v1.google.calender.model import events
+from multi_agent_functions.v1.google.calender.model.events import Event, EventDateTime
+
+
+def legacy_event_datetime_to_dict(self) -> dict:
+    result = asdict(self)
+    if self.date_time:
+        if self.time_zone:
+            try:
+                from pytz import timezone
+                tz = timezone(self.time_zone)
+                if self.date_time.tzinfo is None:
+                    aware_datetime = tz.localize(self.date_time)
+                else:
+                    aware_datetime = self.date_time.astimezone(tz)
+                result['dateTime'] = aware_datetime.isoformat()
+            except ImportError:
+                result['dateTime'] = self.date_time.isoformat() + (self.time_zone if self.time_zone else '')
+            except Exception:
+                result['dateTime'] = self.date_time.isoformat()
+        else:
+            result['dateTime'] = self.date_time.isoformat()
+    if self.date:
+        result['date'] = self.date.isoformat()
+    return result
+
+
+@contextmanager
+def legacy_serialization():
+    """
+    Temporarily restores the `asdict` based `to_dict` of the nested event models.
+    """
+    models = [cls for _, cls in inspect.getmembers(events, inspect.isclass)
+              if is_dataclass(cls) and cls.__module__ == events.__name__ and cls not in (Event, EventDateTime)]
+    saved = {cls: cls.__dict__['to_dict'] for cls in models + [EventDateTime]}
+    for cls in models:
+        cls.to_dict = lambda self: asdict(self)
+    EventDateTime.to_dict = legacy_event_datetime_to_dict
+    try:
+        yield
+    finally:
+        for cls, to_dict in saved.items():
+            cls.to_dict = to_dict
+
+
+def timed(models, repeat: int):
+    best, output = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = [model.to_dict() for model in models]
+        best = min(best, time.perf_counter() - started)
+    return best, output
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--events', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    models = [Event.from_dict(make_event(index, rng)) for index in range(args.events)]
+    with legacy_serialization():
+        legacy_seconds, legacy_output = timed(models, args.repeat)
+    compiled_seconds, compiled_output = timed(models, args.repeat)
+    if compiled_output != legacy_output:
+        raise SystemExit('Serialized output differs from the asdict path')
+
+    print(f'{args.events} events, best of {args.repeat}')
+    print(f'{"asdict + pytz lookup":<24} {legacy_seconds * 1000:>8.1f} ms {legacy_seconds / args.events * 1e6:>7.1f} us/event')
+    print(f'{"compiled serializers":<24} {compiled_seconds * 1000:>8.1f} ms {compiled_seconds / args.events * 1e6:>7.1f} us/event')
+    print(f'speedup {legacy_seconds / compiled_seconds:.1f}x, identical output')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,18 @@
+import sys
+from uuid import uuid4
+
 from langchain.chat_models import init_chat_model
 from langchain_core.messages import HumanMessage
 
+from multi_agent_functions.v1.google.http import default_pool
+from multi_agent_functions.v1.google.quota import default_quota
+from multi_agent_functions.v1.llm.prompt_cache import GeminiContextCache
 from multi_agent_functions.v1.llm.rate_limited_model import RateLimitedModel
+from multi_agent_functions.v1.llm.response_cache import ResponseCache
+from multi_agent_functions.v2.checkpoint import SQLAlchemyCheckpointSaver
+from multi_agent_functions.v2.compaction import HistoryCompactor
+from multi_agent_functions.v2.pacing import summarize_timings
+from multi_agent_functions.v2.router import FastPathRouter
 from multi_agent_functions.v2.supervisor_graph import SupervisorGraph
 
 
@@ -13,20 +24,56 @@ model = init_chat_model(
 
 model = RateLimitedModel(
     model,
-    int(60/9)
+    requests_per_minute=9,
+    prompt_cache=GeminiContextCache(),
+    response_cache=ResponseCache.tiered('sqlite:///response_cache.db'),
 )
 
-state = SupervisorGraph.init_state()
-graph = SupervisorGraph().compile(model)
+router = FastPathRouter('router_decisions.jsonl')
+graph = SupervisorGraph(router=router).compile(model, SQLAlchemyCheckpointSaver('sqlite:///checkpoints.db'))
+
+# Pass a thread id to continue a previous conversation, or to resume a run that was interrupted.
+thread_id = sys.argv[1] if len(sys.argv) > 1 else str(uuid4())
+config = {'configurable': {'thread_id': thread_id}}
+print("Thread:", thread_id)
 
 """
 could you create a event for tomorrow 9 am with title warframes with all the tasks in my warframe tasklist as summary
 """
 
-state['messages'].append(HumanMessage('could you create a event called warframes for 9 am tomorrow, for 30 minutes with description of all the tasks in my warframe tasklist, then afterwards add the event id to the tasklist'))
+snapshot = graph.get_state(config)
+if snapshot.next:
+    # The last run stopped mid-turn; passing None continues from the last completed node.
+    print("Resuming interrupted run at:", ', '.join(snapshot.next))
+    turn_input = None
+else:
+    turn_input = {'messages': [HumanMessage('could you create a event called warframes for 9 am tomorrow, for 30 minutes with description of all the tasks in my warframe tasklist, then afterwards add the event id to the tasklist')]}
 
 while True:
-    # state['messages'].append(HumanMessage(input("User: ")))
-    state = graph.invoke(state)
+    # turn_input = {'messages': [HumanMessage(input("User: "))]}
+    turn_start = len(graph.get_state(config).values.get('timings', []))
+    for mode, chunk in graph.stream(turn_input, config, stream_mode=["messages", "values"]):
+        if mode == "messages":
+            message, metadata = chunk
+            if isinstance(message.content, str) and message.content:
+                print(message.content, end="", flush=True)
+        else:
+            state = chunk
+    print()
     print("AI:", state['messages'][-1].content)
+    latency = summarize_timings(state['timings'][turn_start:])
+    print(f"Turn latency: {latency['wall_seconds']:.1f}s ({latency['wait_seconds']:.1f}s waiting on quota, {latency['work_seconds']:.1f}s working)")
+    print(HistoryCompactor.format_report(state.get('compaction')))
+    cache = model.prompt_cache_metrics
+    print(f"Prompt cache: {cache.cached_tokens} cached / {cache.uncached_tokens} uncached input tokens over {cache.calls} calls")
+    responses = model.response_cache_metrics
+    print(f"Response cache: {responses.hits}/{responses.lookups} hits ({responses.hit_rate:.0%}), {responses.bypassed} bypassed")
+    routing = router.metrics()
+    precision = f"{routing.shadow_precision:.0%}" if routing.shadow_precision is not None else "n/a"
+    print(f"Fast path: {routing.routed} routed, {routing.fallbacks} to the LLM, shadow precision {precision} ({routing.shadow_checks} checks, {routing.examples} examples)")
+    pool = default_pool.metrics()
+    utilization = f"{pool.utilization:.0%}" if pool.utilization is not None else "n/a"
+    print(f"Google API pool: {pool.requests} requests on {pool.transports_created} transports, peak {pool.peak_in_flight} in flight, utilization {utilization}")
+    quota = default_quota.metrics()
+    print(f"Google API quota: {quota.throttled} throttled, {quota.retries} retried, limits {quota.concurrency_limit:.1f} in flight / {quota.rate_limit:.1f} per second")
     break
\ No newline at end of file
@@ -16,7 +16,7 @@ model = init_chat_model(
 
 model = RateLimitedModel(
     model,
-    int(60/9)
+    requests_per_minute=9,
 )
 
 agent = SupervisorAgent()
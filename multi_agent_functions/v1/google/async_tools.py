@@ -0,0 +1,36 @@
+import asyncio
+import functools
+from typing import Any, Callable, Coroutine
+
+from langchain_core.tools import StructuredTool
+
+
+def to_async(func: Callable[..., Any]) -> Callable[..., Coroutine[Any, Any, Any]]:
+    """
+    Wraps a blocking function in a coroutine that runs it on a worker thread.
+
+    Args:
+        func (Callable[..., Any]): The blocking function, e.g. a Google client method.
+
+    Returns:
+        Callable[..., Coroutine[Any, Any, Any]]: A coroutine function with the same signature.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return await asyncio.to_thread(func, *args, **kwargs)
+    return wrapper
+
+
+def to_structured_tool(func: Callable[..., Any]) -> StructuredTool:
+    """
+    Creates a tool that runs `func` directly when invoked synchronously and on a
+    worker thread when invoked from an event loop, so blocking `.execute()` calls
+    never stall other conversations.
+
+    Args:
+        func (Callable[..., Any]): The function to expose as a tool.
+
+    Returns:
+        StructuredTool: The tool with both sync and async entry points.
+    """
+    return StructuredTool.from_function(func=func, coroutine=to_async(func))
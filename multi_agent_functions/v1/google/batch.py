@@ -0,0 +1,159 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from googleapiclient.errors import HttpError
+
+from multi_agent_functions.v1.llm.retry_policy import RetryPolicy
+
+# Google's batch endpoint accepts up to 1000 sub-requests, but the Calendar and Tasks APIs
+# recommend at most 50 per batch; larger batches are split.
+MAX_BATCH_SIZE = 50
+
+# Transient server errors, worth sending a sub-request again for if it can safely be repeated.
+SERVER_ERROR_STATUSES = (500, 502, 503, 504)
+
+
+@dataclass(frozen=True)
+class BatchItemResult:
+    """
+    The outcome of one sub-request of a batch.
+
+    Args:
+        index (int): Position of the sub-request in the list passed to `execute_batch`.
+        result (Optional[Dict[str, Any]]): The response body, or None for failures and empty responses (e.g. deletes).
+        error (Optional[str]): The error message, or None if the sub-request succeeded.
+        status (Optional[int]): The HTTP status of a failed sub-request.
+    """
+    index: int
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    status: Optional[int] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def rate_limited(self) -> bool:
+        # Calendar reports exceeded rate limits as 403 rateLimitExceeded / userRateLimitExceeded.
+        if self.status == 403:
+            return 'rate limit' in (self.error or '').lower()
+        return self.status == 429
+
+    @property
+    def server_error(self) -> bool:
+        return self.status in SERVER_ERROR_STATUSES
+
+
+def is_idempotent(request) -> bool:
+    """
+    Whether a request can be sent again after a server error. POST requests (inserts,
+    imports, moves, quick adds, clears) may have taken effect before the error was
+    returned, so they are not.
+    """
+    return getattr(request, 'method', 'POST') != 'POST'
+
+
+def _error_result(index: int, exception: Exception) -> BatchItemResult:
+    if isinstance(exception, HttpError):
+        return BatchItemResult(index, error=exception.reason or str(exception), status=exception.status_code)
+    return BatchItemResult(index, error=f'{type(exception).__name__}: {exception}')
+
+
+def _execute_chunk(service, requests: Dict[int, Any], run: Callable[[Callable[[Any], Any]], Any]) -> Dict[int, BatchItemResult]:
+    def round_trip(http) -> Dict[int, BatchItemResult]:
+        # Collected afresh on every attempt, in case `run` sends the round trip again.
+        results: Dict[int, BatchItemResult] = {}
+
+        def callback(request_id: str, response: Any, exception: Optional[Exception]) -> None:
+            index = int(request_id)
+            if exception is not None:
+                results[index] = _error_result(index, exception)
+            else:
+                results[index] = BatchItemResult(index, result=response or None)
+
+        batch = service.new_batch_http_request(callback=callback)
+        for index, request in requests.items():
+            batch.add(request, request_id=str(index))
+        batch.execute(http=http)
+        return results
+
+    try:
+        return run(round_trip)
+    except Exception as e:
+        # The round trip failed as a whole: its sub-requests share the error, the other chunks' results are kept.
+        return {index: _error_result(index, e) for index in requests}
+
+
+def execute_batch(
+    service,
+    requests: Sequence[Any],
+    http=None,
+    max_batch_size: int = MAX_BATCH_SIZE,
+    retry_policy: Optional[RetryPolicy] = None,
+    on_rate_limited: Optional[Callable[[Optional[float]], None]] = None,
+    idempotent: Callable[[Any], bool] = is_idempotent,
+    run: Optional[Callable[[Callable[[Any], Any]], Any]] = None,
+) -> List[BatchItemResult]:
+    """
+    Sends API requests through the batch endpoint, one round trip per `max_batch_size` requests.
+
+    A failing sub-request does not affect the others; its error is reported in its result.
+    With a retry policy, sub-requests that were rate limited, and those that failed with
+    a server error and are `idempotent`, are sent again after the policy's backoff,
+    without repeating the ones that succeeded. Other failures are reported as they are.
+    Every rate-limited sub-request, including those that are retried here, is reported
+    to `on_rate_limited`, so quota control sees them (e.g. `QuotaController.throttled`).
+
+    Each round trip is sent through `run`, which can admit it under quota control and
+    send it again if the batch request as a whole was throttled. A round trip that still
+    fails reports its error for its own sub-requests only; the results of the other
+    round trips are kept.
+
+    Args:
+        service: The discovery service the requests were built with.
+        requests (Sequence[Any]): Unexecuted API requests, e.g. `service.tasks().insert(...)`.
+        http: The transport to send the batch with. Defaults to the service's own.
+        max_batch_size (int): Maximum number of sub-requests per round trip.
+        retry_policy (Optional[RetryPolicy]): Retries failed sub-requests. None reports them as they are.
+        on_rate_limited (Optional[Callable[[Optional[float]], None]]): Called once per rate-limited sub-request,
+            with the delay before it is retried, or None if it is not.
+        idempotent (Callable[[Any], bool]): Whether a request may be sent again after a server error.
+            Defaults to `is_idempotent`, which excludes POST requests.
+        run (Optional[Callable[[Callable[[Any], Any]], Any]]): Called with each round trip, a function of the
+            transport to send it on, and returns its result. Defaults to sending it on `http`.
+
+    Returns:
+        List[BatchItemResult]: One result per request, in the order of `requests`.
+    """
+    if run is None:
+        run = lambda round_trip: round_trip(http)
+    results: Dict[int, BatchItemResult] = {}
+    pending = dict(enumerate(requests))
+    attempt = 0
+    started = time.monotonic()
+    while pending:
+        attempt += 1
+        indexed = list(pending.items())
+        for start in range(0, len(indexed), max_batch_size):
+            results.update(_execute_chunk(service, dict(indexed[start:start + max_batch_size]), run))
+        failed = [
+            index for index in pending
+            if index in results and (results[index].rate_limited or (results[index].server_error and idempotent(pending[index])))
+        ]
+        delay = None
+        if retry_policy is not None and failed and attempt < retry_policy.max_attempts:
+            delay = retry_policy.backoff(attempt)
+            if retry_policy.deadline_seconds is not None and time.monotonic() - started + delay > retry_policy.deadline_seconds:
+                delay = None
+        if on_rate_limited is not None:
+            for index in failed:
+                if results[index].rate_limited:
+                    on_rate_limited(delay)
+        if delay is None:
+            break
+        print(f"Batch: retrying {len(failed)} of {len(requests)} sub-requests in {delay:.1f}s")
+        time.sleep(delay)
+        pending = {index: pending[index] for index in failed}
+    return [results.get(index, BatchItemResult(index, error='No response in batch')) for index in range(len(requests))]
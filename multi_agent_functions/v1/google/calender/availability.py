@@ -0,0 +1,129 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from dateutil import tz
+
+from multi_agent_functions.v1.google.calender.interval_index import IntervalIndex
+from multi_agent_functions.v1.google.calender.mirror import CalendarMirror
+
+
+class CalendarAvailability:
+    """
+    Free/busy, conflict and free-slot queries answered from an interval index over the
+    mirrored events of a calendar, without calling the API.
+
+    The index of a calendar covers a window around now (by default from a day ago to
+    180 days ahead) and is rebuilt when the calendar's mirror syncs, or when a query
+    falls outside the window. Events written through the mirror's client mark the
+    calendar stale, so the next query syncs them in and sees them; changes made
+    elsewhere are seen within the mirror's `max_age_seconds`, or at once with `refresh`.
+    """
+
+    def __init__(self, mirror: CalendarMirror, default_timezone: str = 'Africa/Johannesburg', past_days: int = 1, future_days: int = 180):
+        """
+        Args:
+            mirror (CalendarMirror): The mirror to read events from.
+            default_timezone (str): Time zone of query times and event times given without one.
+            past_days (int): Days before now covered by a freshly built index.
+            future_days (int): Days after now covered by a freshly built index.
+        """
+        self.mirror = mirror
+        self.default_timezone = default_timezone
+        self.past_days = past_days
+        self.future_days = future_days
+        self._indexes: Dict[str, Tuple[Optional[float], IntervalIndex]] = {}
+        self._lock = threading.Lock()
+
+    def _parse(self, value: str) -> datetime:
+        moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=tz.gettz(self.default_timezone))
+        return moment.astimezone(timezone.utc)
+
+    def _format(self, moment: datetime) -> str:
+        return moment.astimezone(tz.gettz(self.default_timezone)).isoformat()
+
+    def _index(self, calendar_id: str, start: datetime, end: datetime, refresh: bool = False) -> IntervalIndex:
+        resource = f'events:{calendar_id}'
+        self.mirror.sync(resource, force=refresh)
+        synced_at = self.mirror.synced_at(resource)
+        with self._lock:
+            cached = self._indexes.get(calendar_id)
+            if cached is not None and cached[0] == synced_at and cached[1].covers(start, end):
+                return cached[1]
+            now = datetime.now(timezone.utc)
+            window_start = min(start, now - timedelta(days=self.past_days))
+            window_end = max(end, now + timedelta(days=self.future_days))
+            index = IntervalIndex.from_events(self.mirror.all_events(calendar_id), window_start, window_end, self.default_timezone)
+            self._indexes[calendar_id] = (synced_at, index)
+            return index
+
+    def free_busy(self, time_min: str, time_max: str, calendar_id: str = 'primary', refresh: bool = False) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Returns the busy and free periods of a calendar between two times, expanding recurring events.
+        Answered from the local mirror, so it is much faster than listing events.
+
+        Args:
+            time_min (str): Start of the range, as an ISO 8601 date-time. Times without an offset are local.
+            time_max (str): End of the range, as an ISO 8601 date-time.
+            calendar_id (str): Calendar identifier. Defaults to 'primary'.
+            refresh (bool): Sync the calendar first, even if the mirror is recent, e.g. to pick up changes made elsewhere.
+
+        Returns:
+            Dict[str, List[Dict[str, str]]]: 'busy' and 'free' lists of {'start': ..., 'end': ...} periods.
+        """
+        start, end = self._parse(time_min), self._parse(time_max)
+        index = self._index(calendar_id, start, end, refresh)
+        return {
+            'busy': [{'start': self._format(block_start), 'end': self._format(block_end)} for block_start, block_end in index.busy(start, end)],
+            'free': [{'start': self._format(gap_start), 'end': self._format(gap_end)} for gap_start, gap_end in index.free(start, end)],
+        }
+
+    def find_conflicts(self, start: str, end: str, calendar_id: str = 'primary', refresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        Returns the events, including occurrences of recurring events, that overlap a time range.
+        Use before scheduling to check whether the time is free.
+
+        Args:
+            start (str): Start of the range, as an ISO 8601 date-time. Times without an offset are local.
+            end (str): End of the range, as an ISO 8601 date-time.
+            calendar_id (str): Calendar identifier. Defaults to 'primary'.
+            refresh (bool): Sync the calendar first, even if the mirror is recent, e.g. to pick up changes made elsewhere.
+
+        Returns:
+            List[Dict[str, Any]]: The conflicting occurrences with 'event_id', 'summary', 'start' and 'end'. Empty if the range is free.
+        """
+        range_start, range_end = self._parse(start), self._parse(end)
+        index = self._index(calendar_id, range_start, range_end, refresh)
+        return [
+            {
+                'event_id': interval.event_id,
+                'summary': interval.summary,
+                'start': self._format(interval.start),
+                'end': self._format(interval.end),
+            }
+            for interval in index.overlapping(range_start, range_end)
+        ]
+
+    def next_free_slot(self, duration_minutes: int, after: Optional[str] = None, before: Optional[str] = None, calendar_id: str = 'primary', refresh: bool = False) -> Optional[Dict[str, str]]:
+        """
+        Finds the earliest free period of a given length on a calendar.
+
+        Args:
+            duration_minutes (int): Length of the slot in minutes.
+            after (Optional[str]): Earliest start, as an ISO 8601 date-time. Defaults to now.
+            before (Optional[str]): Latest end, as an ISO 8601 date-time. Defaults to 14 days after `after`.
+            calendar_id (str): Calendar identifier. Defaults to 'primary'.
+            refresh (bool): Sync the calendar first, even if the mirror is recent, e.g. to pick up changes made elsewhere.
+
+        Returns:
+            Optional[Dict[str, str]]: The slot's 'start' and 'end', or None if there is no free slot in the range.
+        """
+        range_start = self._parse(after) if after else datetime.now(timezone.utc).replace(microsecond=0)
+        range_end = self._parse(before) if before else range_start + timedelta(days=14)
+        index = self._index(calendar_id, range_start, range_end, refresh)
+        slot = index.next_free_slot(timedelta(minutes=duration_minutes), range_start, range_end)
+        if slot is None:
+            return None
+        return {'start': self._format(slot[0]), 'end': self._format(slot[1])}
@@ -4,15 +4,123 @@ from pathlib import Path
 
 from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from multi_agent_functions.v1.google.calender.model.events import Event
-from multi_agent_functions.v1.google.calender.model.calender_list import CalendarListEntry
-from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, Field
+from multi_agent_functions.v1.google.batch import BatchItemResult, execute_batch
+from multi_agent_functions.v1.google.fields import item_fields, list_fields
+from multi_agent_functions.v1.google.http import ServicePool, default_pool
+from multi_agent_functions.v1.google.paging import iter_items
+from multi_agent_functions.v1.google.quota import QuotaController, default_quota
+from multi_agent_functions.v1.llm.retry_policy import RetryPolicy
+from multi_agent_functions.v1.google.calender.model.events import Event, LazyEvent
+from multi_agent_functions.v1.google.calender.model.calender_list import CalendarListEntry, LazyCalendarListEntry
+from typing import Optional, Dict, Any, Callable, Iterator, List, Sequence
+
+# Default projections (partial responses) of the read tools: the fields the agents use.
+# Passing fields='*' returns full resources.
+CALENDAR_LIST_FIELDS = 'kind,etag,id,summary,summaryOverride,description,timeZone,accessRole,primary,hidden,selected,colorId,backgroundColor'
+EVENT_FIELDS = 'id,status,htmlLink,summary,description,location,start,end,recurrence,recurringEventId,originalStartTime,transparency,visibility,attendees(email,displayName,responseStatus,optional),organizer(email,displayName),reminders,eventType'
+EVENT_LIST_FIELDS = 'id,status,summary,location,start,end,recurrence,recurringEventId,attendees(email,responseStatus)'
+
+# CalendarListEntry.from_dict needs these keys.
+_CALENDAR_LIST_REQUIRED = ('kind', 'etag', 'id')
+_ENVELOPE = ('nextPageToken', 'nextSyncToken')
+
+_TIME_DESCRIPTION = "The {} time of the event: 'date' (yyyy-mm-dd) for all-day events, or 'dateTime' (RFC 3339), optionally with 'timeZone' (RFC 5545)."
+
+
+class NewEvent(BaseModel):
+    summary: str = Field(description="Title of the event.")
+    start: Dict[str, Any] = Field(description=_TIME_DESCRIPTION.format('start'))
+    end: Dict[str, Any] = Field(description=_TIME_DESCRIPTION.format('end'))
+    location: Optional[str] = Field(default=None, description="Geographic location of the event.")
+    description: Optional[str] = Field(default=None, description="Description of the event.")
+    attendees: Optional[List[Dict[str, Any]]] = Field(default=None, description="The attendees of the event, each with an 'email'.")
+    visibility: Optional[str] = Field(default=None, description="Visibility of the event.")
+
+
+class EventPatch(BaseModel):
+    event_id: str = Field(description="Event identifier.")
+    summary: Optional[str] = Field(default=None, description="Title of the event.")
+    start: Optional[Dict[str, Any]] = Field(default=None, description=_TIME_DESCRIPTION.format('start'))
+    end: Optional[Dict[str, Any]] = Field(default=None, description=_TIME_DESCRIPTION.format('end'))
+    location: Optional[str] = Field(default=None, description="Geographic location of the event.")
+    description: Optional[str] = Field(default=None, description="Description of the event.")
+    attendees: Optional[List[Dict[str, Any]]] = Field(default=None, description="The attendees of the event, each with an 'email'.")
+    visibility: Optional[str] = Field(default=None, description="Visibility of the event.")
+
+
+def _body(item: Any) -> Dict[str, Any]:
+    """
+    Returns the fields that were set, whether the tool passed a model or a plain dict.
+    """
+    values = item.model_dump() if isinstance(item, BaseModel) else dict(item)
+    return {key: value for key, value in values.items() if value is not None}
+
 
 class GoogleCalendarClient:
-    def __init__(self):
+    def __init__(self, batch_retry_policy: Optional[RetryPolicy] = None, pool: Optional[ServicePool] = None, quota: Optional[QuotaController] = None):
+        """
+        Args:
+            batch_retry_policy (Optional[RetryPolicy]): Backoff for resending the failed sub-requests of batch operations.
+            pool (Optional[ServicePool]): Where the service and HTTP transports come from. Defaults to the process-wide pool.
+            quota (Optional[QuotaController]): Paces requests and retries throttled ones. Defaults to the process-wide controller.
+        """
         self.credentials = self.__get_credentials()
-        self.service = build('calendar', 'v3', credentials=self.credentials)
+        self.pool = pool or default_pool
+        self.quota = quota or default_quota
+        self.service = self.pool.service('calendar', 'v3', self.credentials)
+        self.batch_retry_policy = batch_retry_policy or RetryPolicy()
+        self._change_listeners: List[Callable[[str], None]] = []
+
+    def on_change(self, listener: Callable[[str], None]) -> None:
+        """
+        Registers a callback told the key of every resource this client changes ('calendar_list'
+        or 'events:<calendar id>'), once the change succeeded. Mirrors use it to go stale.
+        """
+        self._change_listeners.append(listener)
+
+    def _changed(self, resources: Sequence[str]) -> None:
+        for resource in resources:
+            for listener in self._change_listeners:
+                listener(resource)
+
+    def _execute(self, api_request_object, changes: Sequence[str] = ()):
+        """
+        Executes an API request under the shared quota controller, on the calling thread's pooled HTTP transport.
+
+        Args:
+            api_request_object: The request to send.
+            changes (Sequence[str]): Keys of the resources the request modifies, reported to the change listeners once it succeeded.
+        """
+        result = self.quota.execute(
+            lambda: self.pool.execute(api_request_object, self.credentials),
+            # Inserts, imports and quick adds are not idempotent; a server error may come after the event was created.
+            retry_server_errors=api_request_object.method != 'POST',
+        )
+        self._changed(changes)
+        return result
+
+    def _send_round_trip(self, round_trip: Callable[[Any], Any]) -> Any:
+        """
+        Sends one batch round trip on the calling thread's pooled transport, under the shared quota controller.
+        Only a throttled batch request is sent again: its sub-requests were not processed.
+        """
+        def send() -> Any:
+            with self.pool.lease(self.credentials) as http:
+                return round_trip(http)
+
+        return self.quota.execute(send, retry_server_errors=False)
+
+    def _execute_batch(self, api_request_objects: List, changes: Sequence[str] = ()) -> List[BatchItemResult]:
+        """
+        Executes API requests through the batch endpoint, resending only the sub-requests that failed transiently.
+        Each round trip is admitted by the shared quota controller on its own, so a throttled round trip is
+        sent again without repeating the ones before it. The `changes` are reported if any sub-request succeeded.
+        """
+        results = execute_batch(self.service, api_request_objects, retry_policy=self.batch_retry_policy, on_rate_limited=self.quota.throttled, run=self._send_round_trip)
+        if any(result.ok for result in results):
+            self._changed(changes)
+        return results
 
     def calendar_list_delete(self, calendar_id: str) -> None:
         """
@@ -21,14 +129,15 @@ class GoogleCalendarClient:
         Args:
             calendar_id (str): The ID of the calendar to delete.
         """
-        self.service.calendarList().delete(calendarId=calendar_id).execute()
+        self._execute(self.service.calendarList().delete(calendarId=calendar_id), changes=['calendar_list'])
 
-    def calendar_list_get(self, calendar_id: str) -> CalendarListEntry:
+    def calendar_list_get(self, calendar_id: str, fields: Optional[str] = None) -> CalendarListEntry:
         """
         Returns a calendar from the user's calendar list.
 
         Args:
             calendar_id (str): The ID of the calendar to retrieve.
+            fields (Optional[str]): Fields to return, e.g. 'id,summary,timeZone'. Defaults to the commonly used fields; '*' returns all.
 
         Returns:
             CalendarListEntry: The retrieved calendar list entry.
@@ -37,7 +146,10 @@ class GoogleCalendarClient:
             Exception: If the calendar is not found or an error occurs.
         """
         try:
-            calendar_data = self.service.calendarList().get(calendarId=calendar_id).execute()
+            calendar_data = self._execute(self.service.calendarList().get(
+                calendarId=calendar_id,
+                fields=item_fields(fields, CALENDAR_LIST_FIELDS, _CALENDAR_LIST_REQUIRED),
+            ))
             if calendar_data:
                 return CalendarListEntry.from_dict(calendar_data)
             else:
@@ -73,7 +185,7 @@ class GoogleCalendarClient:
             if summary_override is not None:
                 body['summaryOverride'] = summary_override
 
-            calendar_data = self.service.calendarList().insert(body=body).execute()
+            calendar_data = self._execute(self.service.calendarList().insert(body=body), changes=['calendar_list'])
             if calendar_data:
                 return CalendarListEntry.from_dict(calendar_data)
             else:
@@ -81,37 +193,65 @@ class GoogleCalendarClient:
         except Exception as e:
             raise Exception(f"Failed to insert calendar list entry: {e}")
 
-    def calendar_list_list(self, max_results: Optional[int] = None, min_access_role: Optional[str] = None, page_token: Optional[str] = None, show_deleted: Optional[bool] = None, show_hidden: Optional[bool] = None, sync_token: Optional[str] = None) -> List[CalendarListEntry]:
+    def calendar_list_list(self, max_results: Optional[int] = None, min_access_role: Optional[str] = None, page_token: Optional[str] = None, show_deleted: Optional[bool] = None, show_hidden: Optional[bool] = None, sync_token: Optional[str] = None, max_items: Optional[int] = 250, fields: Optional[str] = None) -> List[LazyCalendarListEntry]:
         """
-        Returns the calendars on the user's calendar list.
+        Returns the calendars on the user's calendar list, following result pages up to `max_items`.
 
         Args:
             max_results (Optional[int]): Maximum number of entries returned on one result page.
             min_access_role (Optional[str]): The minimum access role for the calendars to return.
-            page_token (Optional[str]): Token specifying which result page to return.
+            page_token (Optional[str]): Token specifying which result page to start from.
             show_deleted (Optional[bool]): Whether to include deleted calendars in the results.
             show_hidden (Optional[bool]): Whether to include hidden calendars in the results.
             sync_token (Optional[str]): Token obtained from the nextSyncToken field returned on the last page of results from the previous list request.
+            max_items (Optional[int]): Maximum number of entries to return in total. Defaults to 250.
+            fields (Optional[str]): Fields to return for each entry, e.g. 'id,summary'. Defaults to the commonly used fields; '*' returns all.
 
         Returns:
-            List[CalendarListEntry]: A list of calendar list entries.
+            List[LazyCalendarListEntry]: A list of calendar list entries, parsed on first access.
+        """
+        return list(self.iter_calendar_list(max_results, min_access_role, page_token, show_deleted, show_hidden, sync_token, max_items=max_items, fields=fields))
+
+    def iter_calendar_list(self, max_results: Optional[int] = None, min_access_role: Optional[str] = None, page_token: Optional[str] = None, show_deleted: Optional[bool] = None, show_hidden: Optional[bool] = None, sync_token: Optional[str] = None, max_items: Optional[int] = None, prefetch: bool = False, fields: Optional[str] = None) -> Iterator[LazyCalendarListEntry]:
+        """
+        Streams the calendars on the user's calendar list, fetching result pages lazily.
+
+        Args:
+            max_results (Optional[int]): Maximum number of entries returned on one result page.
+            min_access_role (Optional[str]): The minimum access role for the calendars to return.
+            page_token (Optional[str]): Token specifying which result page to start from.
+            show_deleted (Optional[bool]): Whether to include deleted calendars in the results.
+            show_hidden (Optional[bool]): Whether to include hidden calendars in the results.
+            sync_token (Optional[str]): Token obtained from the nextSyncToken field returned on the last page of results from the previous list request.
+            max_items (Optional[int]): Stop after this many entries. None streams every page.
+            prefetch (bool): Fetch the next page on a background thread while the current one is consumed.
+            fields (Optional[str]): Fields to return for each entry. Defaults to the commonly used fields; '*' returns all.
+
+        Yields:
+            LazyCalendarListEntry: Each calendar list entry, parsed on first access.
         """
         kwargs = {}
         if max_results is not None:
             kwargs['maxResults'] = max_results
         if min_access_role is not None:
             kwargs['minAccessRole'] = min_access_role
-        if page_token is not None:
-            kwargs['pageToken'] = page_token
         if show_deleted is not None:
             kwargs['showDeleted'] = show_deleted
         if show_hidden is not None:
             kwargs['showHidden'] = show_hidden
         if sync_token is not None:
             kwargs['syncToken'] = sync_token
-
-        calendars_data = self.service.calendarList().list(**kwargs).execute()
-        return [CalendarListEntry.from_dict(item) for item in calendars_data.get('items', [])]
+        projection = list_fields(fields, CALENDAR_LIST_FIELDS, _CALENDAR_LIST_REQUIRED, _ENVELOPE)
+        if projection is not None:
+            kwargs['fields'] = projection
+
+        return iter_items(
+            lambda token: self._execute(self.service.calendarList().list(**kwargs, pageToken=token)),
+            LazyCalendarListEntry.from_dict,
+            page_token=page_token,
+            prefetch=prefetch,
+            max_items=max_items,
+        )
 
     def calendar_list_patch(self, calendar_id: str, color_id: Optional[str] = None, hidden: Optional[bool] = None, selected: Optional[bool] = None, summary_override: Optional[str] = None) -> Optional[CalendarListEntry]:
         """
@@ -138,7 +278,7 @@ class GoogleCalendarClient:
         if summary_override is not None:
             body['summaryOverride'] = summary_override
 
-        calendar_data = self.service.calendarList().patch(calendarId=calendar_id, body=body).execute()
+        calendar_data = self._execute(self.service.calendarList().patch(calendarId=calendar_id, body=body), changes=['calendar_list'])
         return CalendarListEntry.from_dict(calendar_data) if calendar_data else None
 
     def calendar_list_update(self, calendar_id: str, id: str, color_id: Optional[str] = None, hidden: Optional[bool] = None, selected: Optional[bool] = None, summary_override: Optional[str] = None) -> Optional[CalendarListEntry]:
@@ -167,7 +307,7 @@ class GoogleCalendarClient:
         if summary_override is not None:
             body['summaryOverride'] = summary_override
 
-        calendar_data = self.service.calendarList().update(calendarId=calendar_id, body=body).execute()
+        calendar_data = self._execute(self.service.calendarList().update(calendarId=calendar_id, body=body), changes=['calendar_list'])
         return CalendarListEntry.from_dict(calendar_data) if calendar_data else None
 
     def calendar_list_watch(self, id: str, type: str, address: str, expiration: Optional[str] = None, token: Optional[str] = None) -> Dict[str, Any]:
@@ -193,7 +333,7 @@ class GoogleCalendarClient:
             body['expiration'] = expiration
         if token is not None:
             body['token'] = token
-        return self.service.calendarList().watch(body=body).execute()
+        return self._execute(self.service.calendarList().watch(body=body))
 
     def events_delete(self, calendar_id: str, event_id: str) -> None:
         """
@@ -203,20 +343,21 @@ class GoogleCalendarClient:
             calendar_id (str): Calendar identifier.
             event_id (str): Event identifier.
         """
-        self.service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
+        self._execute(self.service.events().delete(calendarId=calendar_id, eventId=event_id), changes=[f'events:{calendar_id}'])
 
-    def events_get(self, calendar_id: str, event_id: str) -> Optional[Event]:
+    def events_get(self, calendar_id: str, event_id: str, fields: Optional[str] = None) -> Optional[Event]:
         """
         Returns an event based on its Google Calendar ID.
 
         Args:
             calendar_id (str): Calendar identifier.
             event_id (str): Event identifier.
+            fields (Optional[str]): Fields to return, e.g. 'id,summary,start,end'. Defaults to the commonly used fields; '*' returns all.
 
         Returns:
             Optional[Event]: The retrieved event, or None if not found.
         """
-        event_data = self.service.events().get(calendarId=calendar_id, eventId=event_id).execute()
+        event_data = self._execute(self.service.events().get(calendarId=calendar_id, eventId=event_id, fields=item_fields(fields, EVENT_FIELDS)))
         return Event.from_dict(event_data) if event_data else None
 
     def events_import(self, calendar_id: str, i_cal_uid: str, start: Dict[str, Any], end: Dict[str, Any], sequence: Optional[int] = None, status: Optional[str] = None, summary: Optional[str] = None, description: Optional[str] = None, location: Optional[str] = None, attendees: Optional[List[Dict[str, Any]]] = None, reminders: Optional[Dict[str, Any]] = None, visibility: Optional[str] = None) -> Optional[Event]:
@@ -275,7 +416,7 @@ class GoogleCalendarClient:
         if visibility is not None:
             body['visibility'] = visibility
 
-        event_data = self.service.events().import_(calendarId=calendar_id, body=body).execute()
+        event_data = self._execute(self.service.events().import_(calendarId=calendar_id, body=body), changes=[f'events:{calendar_id}'])
         return Event.from_dict(event_data) if event_data else None
 
     def events_insert(self, calendar_id: str, summary: str, start: Dict[str, Any], end: Dict[str, Any], location: Optional[str] = None, description: Optional[str] = None, attendees: Optional[List[Dict[str, Any]]] = None, reminders: Optional[Dict[str, Any]] = None, visibility: Optional[str] = None) -> Optional[Event]:
@@ -331,46 +472,76 @@ class GoogleCalendarClient:
         if visibility is not None:
             body['visibility'] = visibility
 
-        event_data = self.service.events().insert(calendarId=calendar_id, body=body).execute()
+        event_data = self._execute(self.service.events().insert(calendarId=calendar_id, body=body), changes=[f'events:{calendar_id}'])
         return Event.from_dict(event_data) if event_data else None
 
-    def events_instances(self, calendar_id: str, event_id: str, max_results: Optional[int] = None, original_start: Optional[str] = None, page_token: Optional[str] = None, show_deleted: Optional[bool] = None, time_max: Optional[str] = None, time_min: Optional[str] = None) -> List[Event]:
+    def events_instances(self, calendar_id: str, event_id: str, max_results: Optional[int] = None, original_start: Optional[str] = None, page_token: Optional[str] = None, show_deleted: Optional[bool] = None, time_max: Optional[str] = None, time_min: Optional[str] = None, max_items: Optional[int] = 250, fields: Optional[str] = None) -> List[LazyEvent]:
         """
-        Returns instances of the specified recurring event.
+        Returns instances of the specified recurring event, following result pages up to `max_items`.
 
         Args:
             calendar_id (str): Calendar identifier.
             event_id (str): Recurring event identifier.
             max_results (Optional[int]): Maximum number of instances returned on one result page.
             original_start (Optional[str]): The original start time of the instance in the result.
-            page_token (Optional[str]): Token specifying which result page to return.
+            page_token (Optional[str]): Token specifying which result page to start from.
             show_deleted (Optional[bool]): Whether to include deleted events.
             time_max (Optional[str]): Upper bound (exclusive) for an event's start time to filter by.
             time_min (Optional[str]): Lower bound (inclusive) for an event's start time to filter by.
+            max_items (Optional[int]): Maximum number of instances to return in total. Defaults to 250.
+            fields (Optional[str]): Fields to return for each instance, e.g. 'id,start,end'. Defaults to the commonly used fields; '*' returns all.
 
         Returns:
-            List[Event]: A list of event instances.
+            List[LazyEvent]: A list of event instances, parsed on first access.
+        """
+        return list(self.iter_instances(calendar_id, event_id, max_results, original_start, page_token, show_deleted, time_max, time_min, max_items=max_items, fields=fields))
+
+    def iter_instances(self, calendar_id: str, event_id: str, max_results: Optional[int] = None, original_start: Optional[str] = None, page_token: Optional[str] = None, show_deleted: Optional[bool] = None, time_max: Optional[str] = None, time_min: Optional[str] = None, max_items: Optional[int] = None, prefetch: bool = False, fields: Optional[str] = None) -> Iterator[LazyEvent]:
+        """
+        Streams instances of the specified recurring event, fetching result pages lazily.
+
+        Args:
+            calendar_id (str): Calendar identifier.
+            event_id (str): Recurring event identifier.
+            max_results (Optional[int]): Maximum number of instances returned on one result page.
+            original_start (Optional[str]): The original start time of the instance in the result.
+            page_token (Optional[str]): Token specifying which result page to start from.
+            show_deleted (Optional[bool]): Whether to include deleted events.
+            time_max (Optional[str]): Upper bound (exclusive) for an event's start time to filter by.
+            time_min (Optional[str]): Lower bound (inclusive) for an event's start time to filter by.
+            max_items (Optional[int]): Stop after this many instances. None streams every page.
+            prefetch (bool): Fetch the next page on a background thread while the current one is consumed.
+            fields (Optional[str]): Fields to return for each instance. Defaults to the commonly used fields; '*' returns all.
+
+        Yields:
+            LazyEvent: Each event instance, parsed on first access.
         """
         kwargs = {}
         if max_results is not None:
             kwargs['maxResults'] = max_results
         if original_start is not None:
             kwargs['originalStart'] = original_start
-        if page_token is not None:
-            kwargs['pageToken'] = page_token
         if show_deleted is not None:
             kwargs['showDeleted'] = show_deleted
         if time_max is not None:
             kwargs['timeMax'] = time_max
         if time_min is not None:
             kwargs['timeMin'] = time_min
+        projection = list_fields(fields, EVENT_LIST_FIELDS, envelope=_ENVELOPE)
+        if projection is not None:
+            kwargs['fields'] = projection
 
-        instances_data = self.service.events().instances(calendarId=calendar_id, eventId=event_id, **kwargs).execute()
-        return [Event.from_dict(item) for item in instances_data.get('items', [])]
+        return iter_items(
+            lambda token: self._execute(self.service.events().instances(calendarId=calendar_id, eventId=event_id, **kwargs, pageToken=token)),
+            LazyEvent.from_dict,
+            page_token=page_token,
+            prefetch=prefetch,
+            max_items=max_items,
+        )
 
-    def events_list(self, calendar_id: str = 'primary', i_cal_uid: Optional[str] = None, max_attendees: Optional[int] = None, max_results: Optional[int] = None, order_by: Optional[str] = None, page_token: Optional[str] = None, q: Optional[str] = None, show_deleted: Optional[bool] = None, show_hidden_invitations: Optional[bool] = None, single_events: Optional[bool] = None, sync_token: Optional[str] = None, time_max: Optional[str] = None, time_min: Optional[str] = None, time_zone: Optional[str] = None, updated_min: Optional[str] = None) -> List[Event]:
+    def events_list(self, calendar_id: str = 'primary', i_cal_uid: Optional[str] = None, max_attendees: Optional[int] = None, max_results: Optional[int] = None, order_by: Optional[str] = None, page_token: Optional[str] = None, q: Optional[str] = None, show_deleted: Optional[bool] = None, show_hidden_invitations: Optional[bool] = None, single_events: Optional[bool] = None, sync_token: Optional[str] = None, time_max: Optional[str] = None, time_min: Optional[str] = None, time_zone: Optional[str] = None, updated_min: Optional[str] = None, max_items: Optional[int] = 250, fields: Optional[str] = None) -> List[LazyEvent]:
         """
-        Returns events on the specified calendar.
+        Returns events on the specified calendar, following result pages up to `max_items`.
 
         Args:
             calendar_id (str): Calendar identifier. Defaults to 'primary'.
@@ -378,7 +549,7 @@ class GoogleCalendarClient:
             max_attendees (Optional[int]): The maximum number of attendees to include in the response.
             max_results (Optional[int]): Maximum number of events returned on one result page.
             order_by (Optional[str]): The order of the events returned in the result.
-            page_token (Optional[str]): Token specifying which result page to return.
+            page_token (Optional[str]): Token specifying which result page to start from.
             q (Optional[str]): Free text search terms to find events that match these terms in the following fields: summary, description, location, attendee's displayName, attendee's email.
             show_deleted (Optional[bool]): Whether to include deleted events.
             show_hidden_invitations (Optional[bool]): Whether to include events with hidden invitations.
@@ -389,8 +560,41 @@ class GoogleCalendarClient:
             time_zone (Optional[str]): Time zone used in the response.
             updated_min (Optional[str]): Lower bound for an event's last modification time (inclusive) to filter by.
 
+            max_items (Optional[int]): Maximum number of events to return in total. Defaults to 250.
+            fields (Optional[str]): Fields to return for each event, e.g. 'id,summary,start,end'. Defaults to the commonly used fields; '*' returns all.
+
         Returns:
-            List[Event]: A list of events.
+            List[LazyEvent]: A list of events, parsed on first access.
+        """
+        return list(self.iter_events(calendar_id, i_cal_uid, max_attendees, max_results, order_by, page_token, q, show_deleted, show_hidden_invitations, single_events, sync_token, time_max, time_min, time_zone, updated_min, max_items=max_items, fields=fields))
+
+    def iter_events(self, calendar_id: str = 'primary', i_cal_uid: Optional[str] = None, max_attendees: Optional[int] = None, max_results: Optional[int] = None, order_by: Optional[str] = None, page_token: Optional[str] = None, q: Optional[str] = None, show_deleted: Optional[bool] = None, show_hidden_invitations: Optional[bool] = None, single_events: Optional[bool] = None, sync_token: Optional[str] = None, time_max: Optional[str] = None, time_min: Optional[str] = None, time_zone: Optional[str] = None, updated_min: Optional[str] = None, max_items: Optional[int] = None, prefetch: bool = False, fields: Optional[str] = None) -> Iterator[LazyEvent]:
+        """
+        Streams events on the specified calendar, fetching result pages lazily.
+
+        Args:
+            calendar_id (str): Calendar identifier. Defaults to 'primary'.
+            i_cal_uid (Optional[str]): Specifies an iCalendar UID in the response.
+            max_attendees (Optional[int]): The maximum number of attendees to include in the response.
+            max_results (Optional[int]): Maximum number of events returned on one result page.
+            order_by (Optional[str]): The order of the events returned in the result.
+            page_token (Optional[str]): Token specifying which result page to start from.
+            q (Optional[str]): Free text search terms to find events that match these terms in the following fields: summary, description, location, attendee's displayName, attendee's email.
+            show_deleted (Optional[bool]): Whether to include deleted events.
+            show_hidden_invitations (Optional[bool]): Whether to include events with hidden invitations.
+            single_events (Optional[bool]): Whether to expand recurring events into instances and return single events.
+            sync_token (Optional[str]): Token obtained from the nextSyncToken field returned on the last page of results from the previous list request.
+            time_max (Optional[str]): Upper bound (exclusive) for an event's start time to filter by.
+            time_min (Optional[str]): Lower bound (inclusive) for an event's start time to filter by.
+            time_zone (Optional[str]): Time zone used in the response.
+            updated_min (Optional[str]): Lower bound for an event's last modification time (inclusive) to filter by.
+
+            max_items (Optional[int]): Stop after this many events. None streams every page.
+            prefetch (bool): Fetch the next page on a background thread while the current one is consumed.
+            fields (Optional[str]): Fields to return for each event. Defaults to the commonly used fields; '*' returns all.
+
+        Yields:
+            LazyEvent: Each event, parsed on first access.
         """
         kwargs = {}
         if i_cal_uid is not None:
@@ -401,8 +605,6 @@ class GoogleCalendarClient:
             kwargs['maxResults'] = max_results
         if order_by is not None:
             kwargs['orderBy'] = order_by
-        if page_token is not None:
-            kwargs['pageToken'] = page_token
         if q is not None:
             kwargs['q'] = q
         if show_deleted is not None:
@@ -421,9 +623,17 @@ class GoogleCalendarClient:
             kwargs['timeZone'] = time_zone
         if updated_min is not None:
             kwargs['updatedMin'] = updated_min
-
-        events_data = self.service.events().list(calendarId=calendar_id, **kwargs).execute()
-        return [Event.from_dict(item) for item in events_data.get('items', [])]
+        projection = list_fields(fields, EVENT_LIST_FIELDS, envelope=_ENVELOPE)
+        if projection is not None:
+            kwargs['fields'] = projection
+
+        return iter_items(
+            lambda token: self._execute(self.service.events().list(calendarId=calendar_id, **kwargs, pageToken=token)),
+            LazyEvent.from_dict,
+            page_token=page_token,
+            prefetch=prefetch,
+            max_items=max_items,
+        )
 
     def events_move(self, calendar_id: str, event_id: str, destination_calendar_id: str) -> Optional[Event]:
         """
@@ -437,7 +647,10 @@ class GoogleCalendarClient:
         Returns:
             Optional[Event]: The moved event, or None if move failed.
         """
-        event_data = self.service.events().move(calendarId=calendar_id, eventId=event_id, destination=destination_calendar_id).execute()
+        event_data = self._execute(
+            self.service.events().move(calendarId=calendar_id, eventId=event_id, destination=destination_calendar_id),
+            changes=[f'events:{calendar_id}', f'events:{destination_calendar_id}'],
+        )
         return Event.from_dict(event_data) if event_data else None
 
     def events_patch(self, calendar_id: str, event_id: str, summary: Optional[str] = None, location: Optional[str] = None, description: Optional[str] = None, start: Optional[Dict[str, Any]] = None, end: Optional[Dict[str, Any]] = None, attendees: Optional[List[Dict[str, Any]]] = None, reminders: Optional[Dict[str, Any]] = None, visibility: Optional[str] = None) -> Optional[Event]:
@@ -491,7 +704,7 @@ class GoogleCalendarClient:
         if visibility is not None:
             body['visibility'] = visibility
 
-        event_data = self.service.events().patch(calendarId=calendar_id, eventId=event_id, body=body).execute()
+        event_data = self._execute(self.service.events().patch(calendarId=calendar_id, eventId=event_id, body=body), changes=[f'events:{calendar_id}'])
         return Event.from_dict(event_data) if event_data else None
 
     def events_quick_add(self, calendar_id: str, text: str) -> Optional[Event]:
@@ -505,7 +718,7 @@ class GoogleCalendarClient:
         Returns:
             Optional[Event]: The created event, or None if creation failed.
         """
-        event_data = self.service.events().quickAdd(calendarId=calendar_id, text=text).execute()
+        event_data = self._execute(self.service.events().quickAdd(calendarId=calendar_id, text=text), changes=[f'events:{calendar_id}'])
         return Event.from_dict(event_data) if event_data else None
 
     def events_update(self, calendar_id: str, event_id: str, summary: str, start: Dict[str, Any], end: Dict[str, Any], location: Optional[str] = None, description: Optional[str] = None, attendees: Optional[List[Dict[str, Any]]] = None, reminders: Optional[Dict[str, Any]] = None, visibility: Optional[str] = None) -> Optional[Event]:
@@ -557,9 +770,81 @@ class GoogleCalendarClient:
         if visibility is not None:
             body['visibility'] = visibility
 
-        event_data = self.service.events().update(calendarId=calendar_id, eventId=event_id, body=body).execute()
+        event_data = self._execute(self.service.events().update(calendarId=calendar_id, eventId=event_id, body=body), changes=[f'events:{calendar_id}'])
         return Event.from_dict(event_data) if event_data else None
 
+    def events_insert_many(self, calendar_id: str, events: List[NewEvent]) -> List[BatchItemResult]:
+        """
+        Creates several events in a single batched request, e.g. a week of events at once.
+
+        Args:
+            calendar_id (str): Calendar identifier.
+            events (List[NewEvent]): The events to create.
+
+        Returns:
+            List[BatchItemResult]: The created event or the error, for each event in order.
+        """
+        requests = []
+        for event in events:
+            body = _body(event)
+            for key in ('start', 'end'):
+                # Same default as events_insert
+                if 'dateTime' in body[key] and 'timeZone' not in body[key]:
+                    body[key] = {**body[key], 'timeZone': 'Africa/Johannesburg'}
+            requests.append(self.service.events().insert(calendarId=calendar_id, body=body))
+        return self._execute_batch(requests, changes=[f'events:{calendar_id}'])
+
+    def events_patch_many(self, calendar_id: str, patches: List[EventPatch]) -> List[BatchItemResult]:
+        """
+        Updates several events in a single batched request. Only the fields given in each patch change.
+
+        Args:
+            calendar_id (str): Calendar identifier.
+            patches (List[EventPatch]): The updates, each with the event's ID and the fields to change.
+
+        Returns:
+            List[BatchItemResult]: The updated event or the error, for each patch in order.
+        """
+        requests = []
+        for patch in patches:
+            body = _body(patch)
+            event_id = body.pop('event_id')
+            requests.append(self.service.events().patch(calendarId=calendar_id, eventId=event_id, body=body))
+        return self._execute_batch(requests, changes=[f'events:{calendar_id}'])
+
+    def events_delete_many(self, calendar_id: str, event_ids: List[str]) -> List[BatchItemResult]:
+        """
+        Deletes several events in a single batched request.
+
+        Args:
+            calendar_id (str): Calendar identifier.
+            event_ids (List[str]): The identifiers of the events to delete.
+
+        Returns:
+            List[BatchItemResult]: The outcome of each deletion in order.
+        """
+        return self._execute_batch([
+            self.service.events().delete(calendarId=calendar_id, eventId=event_id)
+            for event_id in event_ids
+        ], changes=[f'events:{calendar_id}'])
+
+    def events_move_many(self, calendar_id: str, event_ids: List[str], destination_calendar_id: str) -> List[BatchItemResult]:
+        """
+        Moves several events to another calendar in a single batched request.
+
+        Args:
+            calendar_id (str): Calendar identifier of the source calendar.
+            event_ids (List[str]): The identifiers of the events to move.
+            destination_calendar_id (str): Calendar identifier of the target calendar.
+
+        Returns:
+            List[BatchItemResult]: The moved event or the error, for each event in order.
+        """
+        return self._execute_batch([
+            self.service.events().move(calendarId=calendar_id, eventId=event_id, destination=destination_calendar_id)
+            for event_id in event_ids
+        ], changes=[f'events:{calendar_id}', f'events:{destination_calendar_id}'])
+
     def events_watch(self, calendar_id: str, id: str, type: str, address: str, expiration: Optional[str] = None, token: Optional[str] = None) -> Dict[str, Any]:
         """
         Watch for changes to Events resources.
@@ -584,7 +869,7 @@ class GoogleCalendarClient:
             body['expiration'] = expiration
         if token is not None:
             body['token'] = token
-        return self.service.events().watch(calendarId=calendar_id, body=body).execute()
+        return self._execute(self.service.events().watch(calendarId=calendar_id, body=body))
 
     def __get_credentials(self):
         """
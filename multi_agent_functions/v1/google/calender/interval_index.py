@@ -0,0 +1,240 @@
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, timezone
+from typing import Iterable, List, Optional, Set, Tuple
+
+from dateutil import tz
+from dateutil.rrule import rrulestr
+
+from multi_agent_functions.v1.google.calender.model.events import Event, EventDateTime
+
+
+@dataclass(frozen=True)
+class Interval:
+    """
+    A span of time an event occupies. Start and end are timezone-aware and in UTC.
+    """
+    start: datetime
+    end: datetime
+    event_id: str
+    summary: Optional[str] = None
+
+
+def _resolve(value: EventDateTime, zone) -> Optional[datetime]:
+    """
+    Turns an EventDateTime into an aware datetime in `zone`. All-day dates start at midnight.
+    """
+    if value is None:
+        return None
+    if value.date_time is not None:
+        moment = value.date_time
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=zone)
+        return moment.astimezone(zone)
+    if value.date is not None:
+        return datetime.combine(value.date, time(), zone)
+    return None
+
+
+def _rule_set(event: Event, start: datetime):
+    # RRULE UNTIL is a floating date for all-day events and UTC for timed ones, so expand accordingly.
+    dtstart = start.replace(tzinfo=None) if event.start.date_time is None else start
+    return rrulestr('\n'.join(event.recurrence), dtstart=dtstart, forceset=True)
+
+
+def _occurrences(event: Event, start: datetime, zone, window_start: datetime, window_end: datetime) -> List[datetime]:
+    """
+    Expands the start times of a recurring event that fall within the window.
+    """
+    all_day = event.start.date_time is None
+    rules = _rule_set(event, start)
+    lower, upper = window_start.astimezone(zone), window_end.astimezone(zone)
+    if all_day:
+        lower, upper = lower.replace(tzinfo=None), upper.replace(tzinfo=None)
+    occurrences = rules.between(lower, upper, inc=True)
+    if all_day:
+        occurrences = [occurrence.replace(tzinfo=zone) for occurrence in occurrences]
+    return occurrences
+
+
+def _is_open_ended(line: str) -> bool:
+    line = line.upper()
+    return line.startswith('RRULE') and 'UNTIL=' not in line and 'COUNT=' not in line
+
+
+def series_end(event: Event, default_timezone: str = 'Africa/Johannesburg') -> Optional[datetime]:
+    """
+    Returns the UTC end of the last occurrence of a recurring event.
+
+    Args:
+        event (Event): The recurring master event.
+        default_timezone (str): Time zone of times without one, e.g. all-day dates.
+
+    Returns:
+        Optional[datetime]: The end of the series, or None if it never ends (a rule without
+            UNTIL or COUNT) or its recurrence cannot be expanded.
+    """
+    if any(_is_open_ended(line) for line in event.recurrence or ()):
+        return None
+    zone = tz.gettz((event.start and event.start.time_zone) or default_timezone)
+    start = _resolve(event.start, zone)
+    end = _resolve(event.end, zone)
+    if start is None or end is None:
+        return None
+    try:
+        occurrences = list(_rule_set(event, start))
+    except (ValueError, TypeError) as e:
+        print(f"Interval index: could not expand recurrence of {event.id}: {e}")
+        return None
+    last = occurrences[-1] if occurrences else start
+    if last.tzinfo is None:
+        last = last.replace(tzinfo=zone)
+    return (last + (end - start)).astimezone(timezone.utc)
+
+
+def event_intervals(event: Event, window_start: datetime, window_end: datetime, default_timezone: str = 'Africa/Johannesburg', overridden: Optional[Set[Tuple[str, datetime]]] = None) -> List[Interval]:
+    """
+    Returns the intervals an event occupies within a window, expanding recurring events.
+
+    Args:
+        event (Event): The event, possibly a recurring master.
+        window_start (datetime): Aware start of the window.
+        window_end (datetime): Aware end of the window.
+        default_timezone (str): Time zone of times without one, e.g. all-day dates.
+        overridden (Optional[Set[Tuple[str, datetime]]]): (recurring event id, original UTC start) of
+            instances that were moved or cancelled, and are therefore not generated from the rule.
+
+    Returns:
+        List[Interval]: The occupied intervals, in UTC.
+    """
+    zone = tz.gettz((event.start and event.start.time_zone) or default_timezone)
+    start = _resolve(event.start, zone)
+    end = _resolve(event.end, zone)
+    if start is None or end is None:
+        return []
+    duration = end - start
+    if not event.recurrence:
+        starts = [start]
+    else:
+        try:
+            # Occurrences starting up to one duration before the window still overlap it.
+            starts = _occurrences(event, start, zone, window_start - duration, window_end)
+        except (ValueError, TypeError) as e:
+            print(f"Interval index: could not expand recurrence of {event.id}: {e}")
+            starts = [start]
+    intervals = []
+    for occurrence in starts:
+        occurrence_end = occurrence + duration
+        utc_start = occurrence.astimezone(timezone.utc)
+        if overridden and (event.id, utc_start) in overridden:
+            continue
+        if occurrence_end > window_start and occurrence < window_end:
+            intervals.append(Interval(utc_start, occurrence_end.astimezone(timezone.utc), event.id, event.summary))
+    return intervals
+
+
+class IntervalIndex:
+    """
+    Sorted start times over the busy intervals of a calendar, for overlap, free/busy
+    and free-slot queries.
+
+    Intervals are sorted by start. Since no interval is longer than the longest one,
+    the intervals overlapping [start, end) all start within [start - longest, end),
+    which two binary searches find.
+    """
+
+    def __init__(self, intervals: Iterable[Interval], window_start: datetime, window_end: datetime):
+        """
+        Args:
+            intervals (Iterable[Interval]): The busy intervals.
+            window_start (datetime): Start of the time range the intervals were expanded for.
+            window_end (datetime): End of the time range the intervals were expanded for.
+        """
+        self.intervals = sorted(intervals, key=lambda interval: (interval.start, interval.end))
+        self.starts = [interval.start for interval in self.intervals]
+        self.longest = max((interval.end - interval.start for interval in self.intervals), default=timedelta(0))
+        self.window_start = window_start
+        self.window_end = window_end
+
+    @classmethod
+    def from_events(cls, events: Iterable[Event], window_start: datetime, window_end: datetime, default_timezone: str = 'Africa/Johannesburg') -> "IntervalIndex":
+        """
+        Builds the index of the time blocked by events within a window.
+
+        Recurring events are expanded. Cancelled events, cancelled or moved instances of
+        recurring events and transparent ("show as available") events do not block time.
+
+        Args:
+            events (Iterable[Event]): The events, including cancelled instances of recurring events.
+            window_start (datetime): Aware start of the window to expand recurring events in.
+            window_end (datetime): Aware end of the window.
+            default_timezone (str): Time zone of times without one.
+
+        Returns:
+            IntervalIndex: The index.
+        """
+        events = list(events)
+        overridden = set()
+        for event in events:
+            if event.recurring_event_id and event.original_start_time:
+                zone = tz.gettz(event.original_start_time.time_zone or default_timezone)
+                original = _resolve(event.original_start_time, zone)
+                if original is not None:
+                    overridden.add((event.recurring_event_id, original.astimezone(timezone.utc)))
+        intervals = [
+            interval
+            for event in events
+            if event.status != 'cancelled' and event.transparency != 'transparent'
+            for interval in event_intervals(event, window_start, window_end, default_timezone, overridden)
+        ]
+        return cls(intervals, window_start, window_end)
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        return self.window_start <= start and end <= self.window_end
+
+    def overlapping(self, start: datetime, end: datetime) -> List[Interval]:
+        """
+        Returns the intervals that overlap [start, end), ordered by start.
+        """
+        low = bisect_left(self.starts, start - self.longest)
+        high = bisect_left(self.starts, end)
+        return [interval for interval in self.intervals[low:high] if interval.end > start]
+
+    def busy(self, start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+        """
+        Returns the merged busy blocks within [start, end), clipped to it.
+        """
+        blocks: List[Tuple[datetime, datetime]] = []
+        for interval in self.overlapping(start, end):
+            block_start, block_end = max(interval.start, start), min(interval.end, end)
+            if blocks and block_start <= blocks[-1][1]:
+                blocks[-1] = (blocks[-1][0], max(blocks[-1][1], block_end))
+            else:
+                blocks.append((block_start, block_end))
+        return blocks
+
+    def free(self, start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+        """
+        Returns the gaps between the busy blocks within [start, end).
+        """
+        gaps = []
+        cursor = start
+        for block_start, block_end in self.busy(start, end):
+            if block_start > cursor:
+                gaps.append((cursor, block_start))
+            cursor = max(cursor, block_end)
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def is_free(self, start: datetime, end: datetime) -> bool:
+        return not self.overlapping(start, end)
+
+    def next_free_slot(self, duration: timedelta, after: datetime, before: datetime) -> Optional[Tuple[datetime, datetime]]:
+        """
+        Returns the earliest free slot of `duration` that starts at or after `after` and ends by `before`.
+        """
+        for gap_start, gap_end in self.free(after, before):
+            if gap_end - gap_start >= duration:
+                return gap_start, gap_start + duration
+        return None
@@ -1,7 +1,11 @@
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 
-@dataclass(frozen=True)
+from multi_agent_functions.v1.google.interning import interned
+from multi_agent_functions.v1.google.lazy import LazyModel, lazy_field
+from multi_agent_functions.v1.google.serialization import serializer
+
+@dataclass(frozen=True, slots=True)
 class DefaultReminder:
     method: str
     minutes: int
@@ -31,9 +35,9 @@ class DefaultReminder:
         Returns:
             Dict[str, Any]: A dictionary representation of the DefaultReminder object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Notification:
     type: str
     method: str
@@ -63,9 +67,9 @@ class Notification:
         Returns:
             Dict[str, Any]: A dictionary representation of the Notification object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NotificationSettings:
     notifications: List[Notification] = field(default_factory=list)
 
@@ -92,9 +96,9 @@ class NotificationSettings:
         Returns:
             Dict[str, Any]: A dictionary representation of the NotificationSettings object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ConferenceProperties:
     allowedConferenceSolutionTypes: List[str] = field(default_factory=list)
 
@@ -121,9 +125,9 @@ class ConferenceProperties:
         Returns:
             Dict[str, Any]: A dictionary representation of the ConferenceProperties object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CalendarListEntry:
     kind: str
     etag: str
@@ -180,20 +184,20 @@ class CalendarListEntry:
         conference_properties = ConferenceProperties.from_dict(data["conferenceProperties"]) if "conferenceProperties" in data else None
 
         return cls(
-            kind=data["kind"],
+            kind=interned(data["kind"]),
             etag=data["etag"],
             id=data["id"],
             summary=data.get("summary"),
             description=data.get("description"),
             location=data.get("location"),
-            timeZone=data.get("timeZone"),
+            timeZone=interned(data.get("timeZone")),
             summaryOverride=data.get("summaryOverride"),
-            colorId=data.get("colorId"),
+            colorId=interned(data.get("colorId")),
             backgroundColor=data.get("backgroundColor"),
             foregroundColor=data.get("foregroundColor"),
             hidden=data.get("hidden"),
             selected=data.get("selected"),
-            accessRole=data.get("accessRole"),
+            accessRole=interned(data.get("accessRole")),
             defaultReminders=default_reminders,
             notificationSettings=notification_settings,
             primary=data.get("primary"),
@@ -208,4 +212,44 @@ class CalendarListEntry:
         Returns:
             Dict[str, Any]: A dictionary representation of the CalendarListEntry object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
+
+
+def _default_reminders(data: List[Dict[str, Any]]) -> List[DefaultReminder]:
+    return [DefaultReminder.from_dict(dr) for dr in data]
+
+
+class LazyCalendarListEntry(LazyModel):
+    """
+    A CalendarListEntry that parses its fields from the raw API dict on first access.
+
+    Has the same attributes and `to_dict()` as `CalendarListEntry.from_dict(data)`; its repr is the raw dict.
+    """
+    __model__ = CalendarListEntry
+    __required__ = ('kind', 'etag', 'id')
+
+    kind = lazy_field('kind', interned)
+    etag = lazy_field('etag')
+    id = lazy_field('id')
+    summary = lazy_field('summary')
+    description = lazy_field('description')
+    location = lazy_field('location')
+    timeZone = lazy_field('timeZone', interned)
+    summaryOverride = lazy_field('summaryOverride')
+    colorId = lazy_field('colorId', interned)
+    backgroundColor = lazy_field('backgroundColor')
+    foregroundColor = lazy_field('foregroundColor')
+    hidden = lazy_field('hidden')
+    selected = lazy_field('selected')
+    accessRole = lazy_field('accessRole', interned)
+    defaultReminders = lazy_field('defaultReminders', _default_reminders, default_factory=list)
+    notificationSettings = lazy_field('notificationSettings', NotificationSettings.from_dict)
+    primary = lazy_field('primary')
+    deleted = lazy_field('deleted')
+    conferenceProperties = lazy_field('conferenceProperties', ConferenceProperties.from_dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the entry to a dictionary, like `CalendarListEntry.to_dict`.
+        """
+        return serializer(CalendarListEntry)(self)
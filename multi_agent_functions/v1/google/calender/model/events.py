@@ -1,10 +1,24 @@
-from dataclasses import dataclass, field, asdict
-from datetime import datetime, date
+from dataclasses import dataclass, field
+from datetime import datetime, date, timedelta, timezone
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
+
+from multi_agent_functions.v1.google.interning import interned
+from multi_agent_functions.v1.google.lazy import LazyModel, lazy_field
+from multi_agent_functions.v1.google.serialization import pytz_timezone, serializer
+
+@lru_cache(maxsize=None)
+def _offset_timezone(offset: timedelta) -> timezone:
+    return timezone(offset)
+
 def _parse_datetime(dt_str: Optional[str]) -> Optional[datetime]:
     if dt_str:
         try:
-            return datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
+            parsed = datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
+            # Datetimes with the same UTC offset share one tzinfo instead of each holding a copy.
+            if parsed.tzinfo is not None:
+                parsed = parsed.replace(tzinfo=_offset_timezone(parsed.utcoffset()))
+            return parsed
         except ValueError:
             # Handle cases where timezone info might be missing or malformed
             return datetime.strptime(dt_str, "%Y-%m-%dT%H:%M:%S")
@@ -15,7 +29,7 @@ def _parse_date(date_str: Optional[str]) -> Optional[date]:
         return date.fromisoformat(date_str)
     return None
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Creator:
     id: Optional[str] = None
     email: Optional[str] = None
@@ -41,7 +55,7 @@ class Creator:
             return None
         return cls(
             id=data.get('id'),
-            email=data.get('email'),
+            email=interned(data.get('email')),
             display_name=data.get('displayName'),
             self=data.get('self')
         )
@@ -53,9 +67,9 @@ class Creator:
         Returns:
             Dict[str, Any]: A dictionary representation of the Creator object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Organizer:
     id: Optional[str] = None
     email: Optional[str] = None
@@ -81,7 +95,7 @@ class Organizer:
             return None
         return cls(
             id=data.get('id'),
-            email=data.get('email'),
+            email=interned(data.get('email')),
             display_name=data.get('displayName'),
             self=data.get('self')
         )
@@ -93,9 +107,9 @@ class Organizer:
         Returns:
             Dict[str, Any]: A dictionary representation of the Organizer object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EventDateTime:
     date: Optional[date] = None
     date_time: Optional[datetime] = None
@@ -120,7 +134,7 @@ class EventDateTime:
         return cls(
             date=_parse_date(data.get('date')),
             date_time=_parse_datetime(data.get('dateTime')),
-            time_zone=data.get('timeZone')
+            time_zone=interned(data.get('timeZone'))
         )
 
     def to_dict(self) -> Dict[str, Any]:
@@ -130,15 +144,14 @@ class EventDateTime:
         Returns:
             Dict[str, Any]: A dictionary representation of the EventDateTime object.
         """
-        result = asdict(self)
+        result = serializer(EventDateTime)(self)
         if self.date_time:
             # Ensure timezone is included in the ISO format if available
             if self.time_zone:
                 # For naive datetimes, assume the specified time_zone
                 # For aware datetimes, convert to the specified time_zone
                 try:
-                    from pytz import timezone
-                    tz = timezone(self.time_zone)
+                    tz = pytz_timezone(self.time_zone)
                     if self.date_time.tzinfo is None: # Naive datetime
                         aware_datetime = tz.localize(self.date_time)
                     else: # Aware datetime
@@ -156,7 +169,7 @@ class EventDateTime:
             result['date'] = self.date.isoformat()
         return result
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Attendee:
     id: Optional[str] = None
     email: Optional[str] = None
@@ -194,13 +207,13 @@ class Attendee:
             return None
         return cls(
             id=data.get('id'),
-            email=data.get('email'),
+            email=interned(data.get('email')),
             display_name=data.get('displayName'),
             organizer=data.get('organizer'),
             self=data.get('self'),
             resource=data.get('resource'),
             optional=data.get('optional'),
-            response_status=data.get('responseStatus'),
+            response_status=interned(data.get('responseStatus')),
             comment=data.get('comment'),
             additional_guests=data.get('additionalGuests')
         )
@@ -212,9 +225,9 @@ class Attendee:
         Returns:
             Dict[str, Any]: A dictionary representation of the Attendee object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ExtendedProperties:
     private: Optional[Dict[str, str]] = None
     shared: Optional[Dict[str, str]] = None
@@ -246,9 +259,9 @@ class ExtendedProperties:
         Returns:
             Dict[str, Any]: A dictionary representation of the ExtendedProperties object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ConferenceSolutionKey:
     type: Optional[str] = None
 
@@ -275,9 +288,9 @@ class ConferenceSolutionKey:
         Returns:
             Dict[str, Any]: A dictionary representation of the ConferenceSolutionKey object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ConferenceSolution:
     key: Optional[ConferenceSolutionKey] = None
     name: Optional[str] = None
@@ -312,9 +325,9 @@ class ConferenceSolution:
         Returns:
             Dict[str, Any]: A dictionary representation of the ConferenceSolution object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ConferenceRequestStatus:
     status_code: Optional[str] = None
 
@@ -341,9 +354,9 @@ class ConferenceRequestStatus:
         Returns:
             Dict[str, Any]: A dictionary representation of the ConferenceRequestStatus object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CreateConferenceRequest:
     request_id: Optional[str] = None
     conference_solution_key: Optional[ConferenceSolutionKey] = None
@@ -378,9 +391,9 @@ class CreateConferenceRequest:
         Returns:
             Dict[str, Any]: A dictionary representation of the CreateConferenceRequest object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EntryPoint:
     entry_point_type: Optional[str] = None
     uri: Optional[str] = None
@@ -430,9 +443,9 @@ class EntryPoint:
         Returns:
             Dict[str, Any]: A dictionary representation of the EntryPoint object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ConferenceData:
     create_request: Optional[CreateConferenceRequest] = None
     entry_points: Optional[List[EntryPoint]] = field(default_factory=list)
@@ -476,9 +489,9 @@ class ConferenceData:
         Returns:
             Dict[str, Any]: A dictionary representation of the ConferenceData object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Gadget:
     type: Optional[str] = None
     title: Optional[str] = None
@@ -528,9 +541,9 @@ class Gadget:
         Returns:
             Dict[str, Any]: A dictionary representation of the Gadget object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ReminderOverride:
     method: Optional[str] = None
     minutes: Optional[int] = None
@@ -562,9 +575,9 @@ class ReminderOverride:
         Returns:
             Dict[str, Any]: A dictionary representation of the ReminderOverride object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Reminders:
     use_default: Optional[bool] = None
     overrides: Optional[List[ReminderOverride]] = field(default_factory=list)
@@ -596,9 +609,9 @@ class Reminders:
         Returns:
             Dict[str, Any]: A dictionary representation of the Reminders object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Source:
     url: Optional[str] = None
     title: Optional[str] = None
@@ -630,9 +643,9 @@ class Source:
         Returns:
             Dict[str, Any]: A dictionary representation of the Source object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WorkingLocationCustomLocation:
     label: Optional[str] = None
 
@@ -659,9 +672,9 @@ class WorkingLocationCustomLocation:
         Returns:
             Dict[str, Any]: A dictionary representation of the WorkingLocationCustomLocation object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WorkingLocationOfficeLocation:
     building_id: Optional[str] = None
     floor_id: Optional[str] = None
@@ -702,9 +715,9 @@ class WorkingLocationOfficeLocation:
         Returns:
             Dict[str, Any]: A dictionary representation of the WorkingLocationOfficeLocation object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WorkingLocationProperties:
     type: Optional[str] = None
     home_office: Optional[Any] = None # Value can be anything, typically empty object
@@ -742,9 +755,9 @@ class WorkingLocationProperties:
         Returns:
             Dict[str, Any]: A dictionary representation of the WorkingLocationProperties object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OutOfOfficeProperties:
     auto_decline_mode: Optional[str] = None
     decline_message: Optional[str] = None
@@ -776,9 +789,9 @@ class OutOfOfficeProperties:
         Returns:
             Dict[str, Any]: A dictionary representation of the OutOfOfficeProperties object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FocusTimeProperties:
     auto_decline_mode: Optional[str] = None
     decline_message: Optional[str] = None
@@ -813,9 +826,9 @@ class FocusTimeProperties:
         Returns:
             Dict[str, Any]: A dictionary representation of the FocusTimeProperties object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Attachment:
     file_url: Optional[str] = None
     title: Optional[str] = None
@@ -856,9 +869,9 @@ class Attachment:
         Returns:
             Dict[str, Any]: A dictionary representation of the Attachment object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BirthdayProperties:
     contact: Optional[str] = None
     type: Optional[str] = None
@@ -893,9 +906,9 @@ class BirthdayProperties:
         Returns:
             Dict[str, Any]: A dictionary representation of the BirthdayProperties object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Event:
     kind: Optional[str] = None
     etag: Optional[str] = None
@@ -996,17 +1009,17 @@ class Event:
             Event: An Event object populated with the provided data.
         """
         return cls(
-            kind=data.get('kind'),
+            kind=interned(data.get('kind')),
             etag=data.get('etag'),
             id=data.get('id'),
-            status=data.get('status'),
+            status=interned(data.get('status')),
             html_link=data.get('htmlLink'),
             created=_parse_datetime(data.get('created')),
             updated=_parse_datetime(data.get('updated')),
             summary=data.get('summary'),
             description=data.get('description'),
             location=data.get('location'),
-            color_id=data.get('colorId'),
+            color_id=interned(data.get('colorId')),
             creator=Creator.from_dict(data.get('creator', {})),
             organizer=Organizer.from_dict(data.get('organizer', {})),
             start=EventDateTime.from_dict(data.get('start', {})),
@@ -1015,8 +1028,8 @@ class Event:
             recurrence=data.get('recurrence'),
             recurring_event_id=data.get('recurringEventId'),
             original_start_time=EventDateTime.from_dict(data.get('originalStartTime', {})),
-            transparency=data.get('transparency'),
-            visibility=data.get('visibility'),
+            transparency=interned(data.get('transparency')),
+            visibility=interned(data.get('visibility')),
             i_cal_uid=data.get('iCalUID'),
             sequence=data.get('sequence'),
             attendees=[Attendee.from_dict(att) for att in data.get('attendees', []) if att] if data.get('attendees') else None,
@@ -1038,7 +1051,7 @@ class Event:
             focus_time_properties=FocusTimeProperties.from_dict(data.get('focusTimeProperties', {})),
             attachments=[Attachment.from_dict(att) for att in data.get('attachments', []) if att] if data.get('attachments') else None,
             birthday_properties=BirthdayProperties.from_dict(data.get('birthdayProperties', {})),
-            event_type=data.get('eventType')
+            event_type=interned(data.get('eventType'))
         )
 
     def to_dict(self) -> Dict[str, Any]:
@@ -1181,3 +1194,68 @@ class Event:
         if self.event_type is not None:
             result['eventType'] = self.event_type
         return result
+
+
+def _attendees(data: Optional[List[Dict[str, Any]]]) -> Optional[List[Attendee]]:
+    return [Attendee.from_dict(att) for att in data if att] if data else None
+
+
+def _attachments(data: Optional[List[Dict[str, Any]]]) -> Optional[List[Attachment]]:
+    return [Attachment.from_dict(att) for att in data if att] if data else None
+
+
+class LazyEvent(LazyModel):
+    """
+    An Event that parses its fields from the raw API dict on first access.
+
+    Has the same attributes and `to_dict()` as `Event.from_dict(data)`; its repr is
+    the raw dict. Listing many events this way only pays for the fields that are
+    actually read.
+    """
+    __model__ = Event
+
+    kind = lazy_field('kind', interned)
+    etag = lazy_field('etag')
+    id = lazy_field('id')
+    status = lazy_field('status', interned)
+    html_link = lazy_field('htmlLink')
+    created = lazy_field('created', _parse_datetime)
+    updated = lazy_field('updated', _parse_datetime)
+    summary = lazy_field('summary')
+    description = lazy_field('description')
+    location = lazy_field('location')
+    color_id = lazy_field('colorId', interned)
+    creator = lazy_field('creator', Creator.from_dict)
+    organizer = lazy_field('organizer', Organizer.from_dict)
+    start = lazy_field('start', EventDateTime.from_dict)
+    end = lazy_field('end', EventDateTime.from_dict)
+    end_time_unspecified = lazy_field('endTimeUnspecified')
+    recurrence = lazy_field('recurrence')
+    recurring_event_id = lazy_field('recurringEventId')
+    original_start_time = lazy_field('originalStartTime', EventDateTime.from_dict)
+    transparency = lazy_field('transparency', interned)
+    visibility = lazy_field('visibility', interned)
+    i_cal_uid = lazy_field('iCalUID')
+    sequence = lazy_field('sequence')
+    attendees = lazy_field('attendees', _attendees)
+    attendees_omitted = lazy_field('attendeesOmitted')
+    extended_properties = lazy_field('extendedProperties', ExtendedProperties.from_dict)
+    hangout_link = lazy_field('hangoutLink')
+    conference_data = lazy_field('conferenceData', ConferenceData.from_dict)
+    gadget = lazy_field('gadget', Gadget.from_dict)
+    anyone_can_add_self = lazy_field('anyoneCanAddSelf')
+    guests_can_invite_others = lazy_field('guestsCanInviteOthers')
+    guests_can_modify = lazy_field('guestsCanModify')
+    guests_can_see_other_guests = lazy_field('guestsCanSeeOtherGuests')
+    private_copy = lazy_field('privateCopy')
+    locked = lazy_field('locked')
+    reminders = lazy_field('reminders', Reminders.from_dict)
+    source = lazy_field('source', Source.from_dict)
+    working_location_properties = lazy_field('workingLocationProperties', WorkingLocationProperties.from_dict)
+    out_of_office_properties = lazy_field('outOfOfficeProperties', OutOfOfficeProperties.from_dict)
+    focus_time_properties = lazy_field('focusTimeProperties', FocusTimeProperties.from_dict)
+    attachments = lazy_field('attachments', _attachments)
+    birthday_properties = lazy_field('birthdayProperties', BirthdayProperties.from_dict)
+    event_type = lazy_field('eventType', interned)
+
+    to_dict = Event.to_dict
@@ -2,7 +2,10 @@ from typing import List
 from langchain_core.tools import create_schema_from_function, BaseTool, StructuredTool
 from datetime import datetime
 
+from multi_agent_functions.v1.google.tool_selection import MUTATING, READ_ONLY, SERIALIZATION, UTILITY, WATCH, ToolSelector, categorized
+from multi_agent_functions.v1.google.calender.availability import CalendarAvailability
 from multi_agent_functions.v1.google.calender.client import GoogleCalendarClient
+from multi_agent_functions.v1.google.calender.mirror import CalendarMirror
 from multi_agent_functions.v1.google.calender.model.events import Event
 from multi_agent_functions.v1.google.calender.model.calender_list import CalendarListEntry
 from multi_agent_functions.v1.google.calender.state import GoogleCalendarAgentState
@@ -10,6 +13,8 @@ from multi_agent_functions.v1.google.calender.state import GoogleCalendarAgentSt
 class GoogleCalendarToolkit:
     def __init__(self):
         self.client = GoogleCalendarClient()
+        self.mirror = CalendarMirror(self.client)
+        self.availability = CalendarAvailability(self.mirror)
 
     def get_current_time(self) -> str:
         """
@@ -18,31 +23,51 @@ class GoogleCalendarToolkit:
         return datetime.now().astimezone().isoformat()
 
     def get_tools(self) -> List[BaseTool]:
-        return list(map(
-            StructuredTool.from_function,
-            [
-                self.get_current_time,
-                Event.from_dict,
-                CalendarListEntry.from_dict,
-                Event.to_dict,
-                CalendarListEntry.to_dict,
-                self.client.calendar_list_list,
-                self.client.calendar_list_delete,
-                self.client.calendar_list_get,
-                self.client.calendar_list_insert,
-                self.client.calendar_list_patch,
-                self.client.calendar_list_update,
-                self.client.calendar_list_watch,
-                self.client.events_list,
-                self.client.events_delete,
-                self.client.events_get,
-                self.client.events_import,
-                self.client.events_insert,
-                self.client.events_instances,
-                self.client.events_move,
-                self.client.events_patch,
-                self.client.events_quick_add,
-                self.client.events_update,
-                self.client.events_watch,
-            ]
-        ))
+        return [
+            categorized(self.get_current_time, UTILITY),
+            categorized(Event.from_dict, READ_ONLY, 'events', SERIALIZATION),
+            categorized(CalendarListEntry.from_dict, READ_ONLY, 'calendar_list', SERIALIZATION),
+            categorized(Event.to_dict, READ_ONLY, 'events', SERIALIZATION),
+            categorized(CalendarListEntry.to_dict, READ_ONLY, 'calendar_list', SERIALIZATION),
+            categorized(self.client.calendar_list_list, READ_ONLY, 'calendar_list'),
+            categorized(self.mirror.list_calendars, READ_ONLY, 'calendar_list'),
+            categorized(self.client.calendar_list_delete, MUTATING, 'calendar_list'),
+            categorized(self.client.calendar_list_get, READ_ONLY, 'calendar_list'),
+            categorized(self.client.calendar_list_insert, MUTATING, 'calendar_list'),
+            categorized(self.client.calendar_list_patch, MUTATING, 'calendar_list'),
+            categorized(self.client.calendar_list_update, MUTATING, 'calendar_list'),
+            categorized(self.client.calendar_list_watch, READ_ONLY, 'calendar_list', WATCH),
+            categorized(self.client.events_list, READ_ONLY, 'events'),
+            categorized(self.mirror.list_events, READ_ONLY, 'events'),
+            categorized(self.availability.free_busy, READ_ONLY, 'events'),
+            categorized(self.availability.find_conflicts, READ_ONLY, 'events'),
+            categorized(self.availability.next_free_slot, READ_ONLY, 'events'),
+            categorized(self.client.events_delete, MUTATING, 'events'),
+            categorized(self.client.events_get, READ_ONLY, 'events'),
+            categorized(self.client.events_import, MUTATING, 'events'),
+            categorized(self.client.events_insert, MUTATING, 'events'),
+            categorized(self.client.events_instances, READ_ONLY, 'events'),
+            categorized(self.client.events_move, MUTATING, 'events'),
+            categorized(self.client.events_patch, MUTATING, 'events'),
+            categorized(self.client.events_quick_add, MUTATING, 'events'),
+            categorized(self.client.events_update, MUTATING, 'events'),
+            categorized(self.client.events_insert_many, MUTATING, 'events'),
+            categorized(self.client.events_patch_many, MUTATING, 'events'),
+            categorized(self.client.events_delete_many, MUTATING, 'events'),
+            categorized(self.client.events_move_many, MUTATING, 'events'),
+            categorized(self.client.events_watch, READ_ONLY, 'events', WATCH),
+        ]
+
+    def get_tool_selector(self) -> ToolSelector:
+        """
+        Returns a selector that narrows the tools to the events or calendar list operations a subtask needs.
+        """
+        return ToolSelector(
+            self.get_tools(),
+            resources={
+                'events': r'\b(events?|meetings?|appointments?|schedul\w*|instances?|recurr\w*|busy|free|availab\w*|conflicts?|slots?|agenda)\b',
+                'calendar_list': r'\b(calendar ?list|calendars|subscri\w*|colou?rs?|hidden|selected)\b',
+            },
+            # Events of calendars other than 'primary' need the calendar's id.
+            dependencies={'events': ['calendar_list']},
+        )
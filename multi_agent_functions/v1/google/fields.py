@@ -0,0 +1,44 @@
+from typing import Optional, Sequence
+
+# Passing this as `fields` requests the full resources.
+ALL_FIELDS = '*'
+
+
+def item_fields(fields: Optional[str], default: str, required: Sequence[str] = ()) -> Optional[str]:
+    """
+    Resolves the `fields` projection of a get request (a partial response).
+
+    Args:
+        fields (Optional[str]): The requested projection, e.g. 'id,summary,start'. None uses `default`;
+            '*' requests the full resource.
+        default (str): The tool's default projection.
+        required (Sequence[str]): Fields the model's `from_dict` cannot do without, added if missing.
+
+    Returns:
+        Optional[str]: The value for the request's `fields` parameter, or None for the full resource.
+    """
+    fields = default if fields is None else fields.strip()
+    if fields == ALL_FIELDS:
+        return None
+    selected = [field.strip() for field in fields.split(',') if field.strip()]
+    names = {field.split('(', 1)[0].split('/', 1)[0] for field in selected}
+    return ','.join(selected + [field for field in required if field not in names])
+
+
+def list_fields(fields: Optional[str], default: str, required: Sequence[str] = (), envelope: Sequence[str] = ('nextPageToken',)) -> Optional[str]:
+    """
+    Resolves the `fields` projection of a list request, applying the item projection to `items`.
+
+    Args:
+        fields (Optional[str]): The requested projection of each item. None uses `default`; '*' requests full items.
+        default (str): The tool's default item projection.
+        required (Sequence[str]): Item fields the model's `from_dict` cannot do without, added if missing.
+        envelope (Sequence[str]): Fields of the response page itself that paging needs.
+
+    Returns:
+        Optional[str]: The value for the request's `fields` parameter, or None for full responses.
+    """
+    items = item_fields(fields, default, required)
+    if items is None:
+        return None
+    return ','.join([*envelope, f'items({items})'])
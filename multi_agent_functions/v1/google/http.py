@@ -0,0 +1,179 @@
+import hashlib
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple
+
+import httplib2
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build
+
+
+@dataclass(frozen=True)
+class ServicePoolMetrics:
+    """
+    Args:
+        services (int): Discovery services built.
+        service_hits (int): Service lookups answered by an already built service.
+        transports (int): Live HTTP transports, one per thread and credentials that made requests.
+        transports_created (int): HTTP transports created, including those of threads that have exited.
+        requests (int): Requests (including whole batches) sent through the pool.
+        in_flight (int): Requests currently being sent.
+        peak_in_flight (int): Most requests ever sent at the same time.
+        busy_seconds (float): Total time transports spent sending requests.
+        uptime_seconds (float): Time since the pool was created.
+    """
+    services: int
+    service_hits: int
+    transports: int
+    transports_created: int
+    requests: int
+    in_flight: int
+    peak_in_flight: int
+    busy_seconds: float
+    uptime_seconds: float
+
+    @property
+    def mean_in_flight(self) -> float:
+        """
+        Average number of requests being sent at any moment since the pool was created.
+        """
+        return self.busy_seconds / self.uptime_seconds if self.uptime_seconds else 0.0
+
+    @property
+    def utilization(self) -> Optional[float]:
+        """
+        Average share of the peak concurrency in use, or None before the first request.
+        """
+        if not self.peak_in_flight:
+            return None
+        return min(1.0, self.mean_in_flight / self.peak_in_flight)
+
+
+def credentials_key(credentials) -> Hashable:
+    """
+    Identifies credentials by the account, OAuth client and scopes they authorize, so
+    credentials loaded separately (e.g. by two clients reading the same token file)
+    share services and transports. Credentials without a refresh token are identified
+    by the object itself.
+    """
+    refresh_token = getattr(credentials, 'refresh_token', None)
+    if not refresh_token:
+        return ('object', id(credentials))
+    return (
+        type(credentials).__name__,
+        getattr(credentials, 'client_id', None),
+        tuple(sorted(getattr(credentials, 'scopes', None) or ())),
+        hashlib.sha256(refresh_token.encode()).hexdigest(),
+    )
+
+
+class ServicePool:
+    """
+    Process-wide Google API services and HTTP transports.
+
+    Each API version is built once per set of credentials (see `credentials_key`),
+    from the discovery documents bundled with google-api-python-client
+    (`static_discovery`), so no discovery request is made. Service objects only
+    assemble requests and are shared by all threads and clients. httplib2 connections
+    are not thread-safe, so requests are sent on an authorized transport owned by the
+    calling thread, which keeps its connection alive between requests.
+    """
+
+    def __init__(self):
+        self._services: Dict[Hashable, Tuple[Any, Any]] = {}
+        self._local = threading.local()
+        self._transports: "weakref.WeakSet[AuthorizedHttp]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._builds = 0
+        self._transports_created = 0
+        self._hits = 0
+        self._requests = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._busy_seconds = 0.0
+
+    def service(self, api: str, version: str, credentials) -> Any:
+        """
+        Returns the shared service for an API version, building it on first use.
+
+        Args:
+            api (str): The API name, e.g. 'calendar'.
+            version (str): The API version, e.g. 'v3'.
+            credentials: The credentials the service authorizes requests with.
+
+        Returns:
+            Any: The discovery service.
+        """
+        key = (api, version, credentials_key(credentials))
+        with self._lock:
+            entry = self._services.get(key)
+            if entry is not None:
+                self._hits += 1
+                return entry[1]
+            service = build(api, version, credentials=credentials, static_discovery=True, cache_discovery=False)
+            self._builds += 1
+            # Holding the credentials keeps an id() used as their key from being reused while the entry exists.
+            self._services[key] = (credentials, service)
+            return service
+
+    def http(self, credentials) -> AuthorizedHttp:
+        """
+        Returns the calling thread's transport for a set of credentials.
+        """
+        transports = getattr(self._local, 'transports', None)
+        if transports is None:
+            transports = self._local.transports = {}
+        key = credentials_key(credentials)
+        entry = transports.get(key)
+        if entry is None:
+            entry = transports[key] = (credentials, AuthorizedHttp(credentials, http=httplib2.Http()))
+            with self._lock:
+                self._transports.add(entry[1])
+                self._transports_created += 1
+        return entry[1]
+
+    @contextmanager
+    def lease(self, credentials) -> Iterator[AuthorizedHttp]:
+        """
+        Yields the calling thread's transport for one request and records its use.
+        """
+        http = self.http(credentials)
+        with self._lock:
+            self._requests += 1
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        started = time.monotonic()
+        try:
+            yield http
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._busy_seconds += time.monotonic() - started
+
+    def execute(self, request, credentials) -> Any:
+        """
+        Executes an API request on the calling thread's transport.
+        """
+        with self.lease(credentials) as http:
+            return request.execute(http=http)
+
+    def metrics(self) -> ServicePoolMetrics:
+        with self._lock:
+            return ServicePoolMetrics(
+                services=self._builds,
+                service_hits=self._hits,
+                transports=len(self._transports),
+                transports_created=self._transports_created,
+                requests=self._requests,
+                in_flight=self._in_flight,
+                peak_in_flight=self._peak_in_flight,
+                busy_seconds=self._busy_seconds,
+                uptime_seconds=time.monotonic() - self._started,
+            )
+
+
+default_pool = ServicePool()
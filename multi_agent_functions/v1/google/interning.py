@@ -0,0 +1,11 @@
+import sys
+from typing import Optional
+
+
+def interned(value: Optional[str]) -> Optional[str]:
+    """
+    Returns the shared copy of a string that recurs across many resources (kinds,
+    statuses, time zones, email addresses), so each parsed resource does not hold
+    its own copy. Non-strings are returned as they are.
+    """
+    return sys.intern(value) if type(value) is str else value
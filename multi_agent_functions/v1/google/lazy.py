@@ -0,0 +1,104 @@
+from dataclasses import FrozenInstanceError, fields
+from typing import Any, Callable, ClassVar, Dict, Optional, Sequence
+
+
+class lazy_field:
+    """
+    An attribute of a LazyModel, converted from the raw API dict on first access.
+
+    The converted value is stored in the instance's `__dict__`, which shadows this
+    (non-data) descriptor, so later reads are plain attribute lookups.
+    """
+
+    def __init__(self, key: str, convert: Optional[Callable[[Any], Any]] = None, default: Any = None, default_factory: Optional[Callable[[], Any]] = None):
+        """
+        Args:
+            key (str): The key of the value in the raw dict.
+            convert (Optional[Callable[[Any], Any]]): Converts the raw value, e.g. `_parse_datetime`. None keeps it as is.
+            default (Any): The value when the key is missing.
+            default_factory (Optional[Callable[[], Any]]): Builds the value when the key is missing, e.g. `list`.
+        """
+        self.key = key
+        self.convert = convert
+        self.default = default
+        self.default_factory = default_factory
+        self.name = key
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance, owner=None) -> Any:
+        if instance is None:
+            return self
+        data = instance._data
+        if self.key in data:
+            value = data[self.key]
+            if self.convert is not None:
+                value = self.convert(value)
+        elif self.default_factory is not None:
+            value = self.default_factory()
+        else:
+            value = self.default
+        instance.__dict__[self.name] = value
+        return value
+
+
+class LazyModel:
+    """
+    A read-only view of a raw API dict that stands in for one of the frozen model
+    dataclasses. Each attribute is parsed the way the model's `from_dict` parses it,
+    but only when first read, so objects whose nested values are never used cost
+    little more than the dict they wrap.
+
+    Subclasses set `__model__` to the dataclass they stand in for and declare one
+    `lazy_field` per dataclass field. `to_dict()` and equality match the eager
+    model's. `repr()` does not: it shows the wrapped dict, so printing a view (or
+    returning it from a tool, whose output is stringified) parses nothing. Use
+    `materialize()` for the eager repr.
+    """
+    __model__: ClassVar[type]
+    # Keys the eager `from_dict` reads with `data[key]`; missing ones fail at construction just the same.
+    __required__: ClassVar[Sequence[str]] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        missing = [f.name for f in fields(cls.__model__) if not isinstance(cls.__dict__.get(f.name), lazy_field)]
+        if missing:
+            raise TypeError(f"{cls.__name__} does not declare the {cls.__model__.__name__} fields {missing}")
+
+    def __init__(self, data: Dict[str, Any]):
+        missing = [key for key in self.__required__ if key not in data]
+        if missing:
+            raise KeyError(missing[0])
+        object.__setattr__(self, '_data', data)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LazyModel":
+        return cls(data)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, f.name) for f in fields(self.__model__))
+
+    def materialize(self) -> Any:
+        """
+        Returns the equivalent eager model instance, parsing every field.
+        """
+        return self.__model__(**{f.name: getattr(self, f.name) for f in fields(self.__model__)})
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self._data!r})'
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyModel) and other.__model__ is self.__model__:
+            return self._values() == other._values()
+        if type(other) is self.__model__:
+            return self._values() == tuple(getattr(other, f.name) for f in fields(other))
+        return NotImplemented
+
+    __hash__ = None
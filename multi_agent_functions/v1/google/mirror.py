@@ -0,0 +1,141 @@
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Optional
+
+from googleapiclient.errors import HttpError
+from sqlalchemy import Column, Engine, Float, MetaData, String, Table, Text, create_engine, delete, select, update
+
+metadata = MetaData()
+
+sync_state_table = Table(
+    'mirror_sync_state',
+    metadata,
+    Column('resource', String, primary_key=True),
+    Column('token', Text),
+    Column('synced_at', Float, nullable=False),
+)
+
+
+def to_utc(value: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Normalizes an event time ({'dateTime': ...} or {'date': ...}) to a sortable UTC timestamp.
+    All-day dates are taken as midnight UTC.
+    """
+    if not value:
+        return None
+    if value.get('dateTime'):
+        moment = datetime.fromisoformat(value['dateTime'].replace('Z', '+00:00'))
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return moment.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+    if value.get('date'):
+        return date.fromisoformat(value['date']).strftime('%Y-%m-%dT00:00:00')
+    return None
+
+
+def is_gone(error: Exception) -> bool:
+    """
+    Whether a sync token or updatedMin window was rejected and a full resync is needed.
+    """
+    return isinstance(error, HttpError) and error.status_code == 410
+
+
+class Mirror(ABC):
+    """
+    Base of the local mirrors of Google data, stored with SQLAlchemy (SQLite by default).
+
+    Each mirrored resource (e.g. the events of one calendar) remembers the token of its
+    last sync. The first sync fetches everything; later syncs only fetch what changed.
+    Reads are answered from the database, after a delta sync if the resource is older
+    than `max_age_seconds` or was invalidated by a change made through the client.
+    """
+
+    def __init__(self, url: str = 'sqlite:///mirror.db', engine: Optional[Engine] = None, max_age_seconds: float = 60.0):
+        """
+        Args:
+            url (str): Database URL, used when no engine is given.
+            engine (Optional[Engine]): An existing engine to store the mirror in.
+            max_age_seconds (float): How long mirrored data is served without syncing first.
+        """
+        if engine is None:
+            connect_args = {'check_same_thread': False} if url.startswith('sqlite') else {}
+            engine = create_engine(url, connect_args=connect_args)
+        self.engine = engine
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.RLock()
+        metadata.create_all(self.engine)
+
+    def _sync_state(self, resource: str) -> Optional[Any]:
+        with self.engine.connect() as connection:
+            return connection.execute(
+                select(sync_state_table).where(sync_state_table.c.resource == resource)
+            ).first()
+
+    def _save_sync_state(self, connection, resource: str, token: Optional[str], synced_at: float) -> None:
+        connection.execute(delete(sync_state_table).where(sync_state_table.c.resource == resource))
+        connection.execute(sync_state_table.insert().values(resource=resource, token=token, synced_at=synced_at))
+
+    def synced_at(self, resource: str) -> Optional[float]:
+        """
+        Returns the `time.time()` of the last sync of a resource, or None if it was never synced.
+        """
+        state = self._sync_state(resource)
+        return state.synced_at if state is not None else None
+
+    def _forget(self, resource: str) -> None:
+        with self.engine.begin() as connection:
+            connection.execute(delete(sync_state_table).where(sync_state_table.c.resource == resource))
+
+    def invalidate(self, resource: str) -> None:
+        """
+        Marks a resource as stale, so the next read syncs it first. The sync token is
+        kept, so that sync only fetches the changes.
+
+        Args:
+            resource (str): The resource key, e.g. 'events:primary'.
+        """
+        with self.engine.begin() as connection:
+            connection.execute(update(sync_state_table).where(sync_state_table.c.resource == resource).values(synced_at=0.0))
+
+    @abstractmethod
+    def _sync(self, resource: str, token: Optional[str]) -> None:
+        """
+        Syncs one resource, starting from `token`, or from scratch if it is None.
+        """
+
+    def sync(self, resource: str, force: bool = False) -> None:
+        """
+        Brings one resource up to date. A rejected token (410 Gone) triggers a full resync.
+
+        Args:
+            resource (str): The resource key, e.g. 'events:primary'.
+            force (bool): Sync even if the resource was synced within `max_age_seconds`.
+        """
+        with self._lock:
+            state = self._sync_state(resource)
+            if state is not None and not force and time.time() - state.synced_at < self.max_age_seconds:
+                return
+            token = state.token if state is not None else None
+            try:
+                self._sync(resource, token)
+            except HttpError as e:
+                if token is None or not is_gone(e):
+                    raise
+                print(f"Mirror: sync token for {resource} expired, running a full resync")
+                self._forget(resource)
+                self._sync(resource, None)
+
+    @staticmethod
+    def _now() -> float:
+        return time.time()
+
+    @staticmethod
+    def _dumps(item: Dict[str, Any]) -> str:
+        return json.dumps(item)
+
+    @staticmethod
+    def _loads(data: str) -> Dict[str, Any]:
+        return json.loads(data)
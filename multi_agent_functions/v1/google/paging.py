@@ -0,0 +1,63 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+def iter_pages(fetch: Callable[[Optional[str]], Dict[str, Any]], page_token: Optional[str] = None, prefetch: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Streams the result pages of a list request, following `nextPageToken`.
+
+    Args:
+        fetch (Callable[[Optional[str]], Dict[str, Any]]): Executes the list request for a page token.
+        page_token (Optional[str]): The page to start from. None starts from the first page.
+        prefetch (bool): Request the next page on a background thread while the current one is consumed.
+
+    Yields:
+        Dict[str, Any]: Each response page. The last page carries `nextSyncToken`, if the API returns one.
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='prefetch') if prefetch else None
+    try:
+        page = fetch(page_token)
+        while True:
+            page_token = page.get('nextPageToken')
+            upcoming: Optional[Future] = executor.submit(fetch, page_token) if executor and page_token else None
+            yield page
+            if not page_token:
+                return
+            page = upcoming.result() if upcoming else fetch(page_token)
+    finally:
+        # A consumer that stops early leaves at most one prefetched page unread.
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_items(
+    fetch: Callable[[Optional[str]], Dict[str, Any]],
+    transform: Callable[[Dict[str, Any]], T] = lambda item: item,
+    page_token: Optional[str] = None,
+    prefetch: bool = False,
+    max_items: Optional[int] = None,
+) -> Iterator[T]:
+    """
+    Streams the items of a paginated list request, fetching pages only as they are needed.
+
+    Args:
+        fetch (Callable[[Optional[str]], Dict[str, Any]]): Executes the list request for a page token.
+        transform (Callable[[Dict[str, Any]], T]): Converts each raw item, e.g. `Event.from_dict`.
+        page_token (Optional[str]): The page to start from. None starts from the first page.
+        prefetch (bool): Request the next page on a background thread while the current one is consumed.
+        max_items (Optional[int]): Stop after this many items. None streams every page.
+
+    Yields:
+        T: Each item, in the order the API returns them.
+    """
+    if max_items is not None and max_items <= 0:
+        return
+    count = 0
+    for page in iter_pages(fetch, page_token, prefetch):
+        for item in page.get('items', []):
+            yield transform(item)
+            count += 1
+            if max_items is not None and count >= max_items:
+                return
@@ -0,0 +1,247 @@
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional, TypeVar
+
+from googleapiclient.errors import HttpError
+
+from multi_agent_functions.v1.llm.rate_limiter import record_wait
+from multi_agent_functions.v1.llm.retry_policy import RetryPolicy
+
+T = TypeVar('T')
+
+# Server errors worth retrying for requests that can safely be repeated.
+SERVER_ERROR_STATUSES = (500, 502, 503, 504)
+
+
+@dataclass(frozen=True)
+class QuotaMetrics:
+    """
+    Args:
+        requests (int): Attempts admitted, including retries.
+        throttled (int): Attempts rejected with a rate-limit error.
+        retries (int): Attempts that were retries.
+        decreases (int): Times the limits were cut after throttling.
+        concurrency_limit (float): Current limit on requests in flight.
+        rate_limit (float): Current limit on requests started per second.
+        in_flight (int): Requests currently in flight.
+        wait_seconds (float): Total time callers waited for admission or before retrying.
+    """
+    requests: int
+    throttled: int
+    retries: int
+    decreases: int
+    concurrency_limit: float
+    rate_limit: float
+    in_flight: int
+    wait_seconds: float
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """
+    Whether an error reports an exceeded quota: a 429, or a 403 rateLimitExceeded /
+    userRateLimitExceeded as returned by the Calendar and Tasks APIs.
+    """
+    if not isinstance(error, HttpError):
+        return False
+    if error.status_code == 429:
+        return True
+    if error.status_code == 403:
+        reasons = [str(detail.get('reason', '')) for detail in error.error_details or [] if isinstance(detail, dict)]
+        return any('RateLimitExceeded' in reason or 'rateLimitExceeded' in reason for reason in reasons) \
+            or 'rate limit' in (error.reason or '').lower()
+    return False
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """
+    Returns the delay requested by a `Retry-After` header (seconds or an HTTP date), if any.
+    """
+    response = getattr(error, 'resp', None)
+    value = response.get('retry-after') if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class QuotaController:
+    """
+    Adaptive client-side quota control for Google API calls (AIMD).
+
+    Requests are admitted under a concurrency limit and a pacing rate. Every success
+    raises both limits additively; a rate-limit response cuts them multiplicatively
+    (at most once per `decrease_interval`, so a burst of rejections from requests that
+    were already in flight counts as one signal). The limits thus settle just below
+    the quota the server enforces, instead of using fixed sleeps.
+
+    Throttled requests are retried after the server's `Retry-After`, or the retry
+    policy's exponential backoff if none is given; during that pause no other request
+    is admitted either. Server errors are retried after the backoff too, for requests
+    that can safely be repeated, without pausing other requests.
+
+    One instance is shared by the Google clients so they back off together.
+    """
+
+    def __init__(
+        self,
+        retry_policy: Optional[RetryPolicy] = None,
+        initial_concurrency: float = 4.0,
+        max_concurrency: float = 16.0,
+        initial_rate: float = 10.0,
+        min_rate: float = 0.5,
+        max_rate: float = 50.0,
+        decrease_factor: float = 0.5,
+        decrease_interval: float = 1.0,
+    ):
+        """
+        Args:
+            retry_policy (Optional[RetryPolicy]): Attempts, backoff and deadline of retries.
+            initial_concurrency (float): Requests allowed in flight at first.
+            max_concurrency (float): Upper bound of the concurrency limit.
+            initial_rate (float): Requests started per second at first.
+            min_rate (float): Lower bound of the rate limit.
+            max_rate (float): Upper bound of the rate limit.
+            decrease_factor (float): Factor the limits are multiplied by after throttling.
+            decrease_interval (float): Minimum seconds between two decreases.
+        """
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=5, base_delay=1.0, max_delay=32.0)
+        self.max_concurrency = max_concurrency
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.decrease_factor = decrease_factor
+        self.decrease_interval = decrease_interval
+        self._concurrency = initial_concurrency
+        self._rate = initial_rate
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._next_start = 0.0
+        self._paused_until = 0.0
+        self._last_decrease = float('-inf')
+        self._requests = 0
+        self._throttled = 0
+        self._retries = 0
+        self._decreases = 0
+        self._wait_seconds = 0.0
+
+    def _admit(self) -> None:
+        started = time.monotonic()
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                wait = max(self._paused_until, self._next_start) - now
+                if self._in_flight < max(1, int(self._concurrency)) and wait <= 0:
+                    break
+                self._condition.wait(timeout=wait if wait > 0 else None)
+            self._in_flight += 1
+            self._requests += 1
+            self._next_start = now + 1.0 / self._rate
+            waited = now - started
+            self._wait_seconds += waited
+        record_wait(waited)
+
+    def _release(self, outcome: str, pause: Optional[float] = None) -> None:
+        """
+        Frees an admitted request's slot and adapts the limits to its outcome:
+        'success', 'throttled', or 'error' (other failures leave the limits unchanged).
+        """
+        with self._condition:
+            self._in_flight -= 1
+            now = time.monotonic()
+            if outcome == 'throttled':
+                self._throttled += 1
+                if pause is not None:
+                    self._paused_until = max(self._paused_until, now + pause)
+                if now - self._last_decrease >= self.decrease_interval:
+                    self._last_decrease = now
+                    self._decreases += 1
+                    self._concurrency = max(1.0, self._concurrency * self.decrease_factor)
+                    self._rate = max(self.min_rate, self._rate * self.decrease_factor)
+            elif outcome == 'success':
+                # Additive increase: roughly +1 request in flight and +1 request/s per round of successes.
+                self._concurrency = min(self.max_concurrency, self._concurrency + 1.0 / self._concurrency)
+                self._rate = min(self.max_rate, self._rate + 1.0 / self._rate)
+            self._condition.notify_all()
+
+    def _sleep(self, seconds: float) -> None:
+        with self._condition:
+            self._wait_seconds += seconds
+        record_wait(seconds)
+        time.sleep(seconds)
+
+    def execute(self, call: Callable[[], T], retry_server_errors: bool = True) -> T:
+        """
+        Runs an API call under the quota limits, retrying rate-limit and transient errors.
+
+        Args:
+            call (Callable[[], T]): Sends the request, e.g. `lambda: request.execute()`.
+            retry_server_errors (bool): Also retry 5xx errors. Disable for requests that are not safe to repeat.
+
+        Returns:
+            T: The call's result.
+
+        Raises:
+            HttpError: The last error, once it is not retryable or the retry policy is exhausted.
+        """
+        attempt = 0
+        started = time.monotonic()
+        while True:
+            attempt += 1
+            if attempt > 1:
+                with self._condition:
+                    self._retries += 1
+            self._admit()
+            try:
+                result = call()
+            except HttpError as e:
+                throttled = is_rate_limited(e)
+                requested = retry_after(e) if throttled else None
+                delay = requested if requested is not None else self.retry_policy.backoff(attempt)
+                self._release('throttled' if throttled else 'error', delay if throttled else None)
+                if not throttled and not (retry_server_errors and e.status_code in SERVER_ERROR_STATUSES):
+                    raise
+                deadline = self.retry_policy.deadline_seconds
+                if attempt >= self.retry_policy.max_attempts or (deadline is not None and time.monotonic() - started + delay > deadline):
+                    raise
+                print(f"Quota: {e.status_code} from Google API, retrying in {delay:.1f}s (attempt {attempt + 1})")
+                self._sleep(delay)
+                continue
+            except BaseException:
+                self._release('error')
+                raise
+            self._release('success')
+            return result
+
+    def throttled(self, pause: Optional[float] = None) -> None:
+        """
+        Reports a rate-limit response received outside `execute`, e.g. a sub-request of a batch.
+
+        Args:
+            pause (Optional[float]): Seconds during which no request is admitted, e.g. until the throttled request is retried.
+        """
+        with self._condition:
+            self._in_flight += 1
+        self._release('throttled', pause)
+
+    def metrics(self) -> QuotaMetrics:
+        with self._condition:
+            return QuotaMetrics(
+                requests=self._requests,
+                throttled=self._throttled,
+                retries=self._retries,
+                decreases=self._decreases,
+                concurrency_limit=self._concurrency,
+                rate_limit=self._rate,
+                in_flight=self._in_flight,
+                wait_seconds=self._wait_seconds,
+            )
+
+
+default_quota = QuotaController()
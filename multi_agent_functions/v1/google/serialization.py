@@ -0,0 +1,75 @@
+import copy
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict
+
+# Immutable values that `dataclasses.asdict` would copy without changing them.
+_ATOMIC = frozenset({str, int, float, bool, type(None), datetime, date})
+
+_serializers: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+
+
+def to_plain(value: Any) -> Any:
+    """
+    Converts a field value the way `dataclasses.asdict` does: dataclasses become dicts,
+    lists, tuples and dicts are rebuilt, and immutable values are kept as they are.
+    """
+    kind = type(value)
+    if kind in _ATOMIC:
+        return value
+    if kind is list:
+        return [to_plain(item) for item in value]
+    if kind is dict:
+        return {to_plain(key): to_plain(item) for key, item in value.items()}
+    if is_dataclass(kind):
+        return serializer(kind)(value)
+    if kind is tuple:
+        return tuple(to_plain(item) for item in value)
+    if isinstance(value, tuple) and hasattr(value, '_fields'):
+        return kind(*[to_plain(item) for item in value])
+    # Anything else is deep-copied, as asdict does.
+    return copy.deepcopy(value)
+
+
+def _compile(cls: type) -> Callable[[Any], Dict[str, Any]]:
+    names = [f.name for f in fields(cls)]
+    body = ', '.join(f'{name!r}: to_plain(obj.{name})' for name in names)
+    namespace: Dict[str, Any] = {'to_plain': to_plain}
+    exec(f'def to_dict(obj):\n    return {{{body}}}\n', namespace)
+    function = namespace['to_dict']
+    function.__qualname__ = f'{cls.__qualname__}.to_dict'
+    return function
+
+
+def serializer(cls: type) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Returns the serializer of a dataclass, compiled on first use from its field list.
+
+    The serializer produces the same dict as `dataclasses.asdict`, without its generic
+    recursion and deep copies. It reads the fields as attributes, so it also
+    serializes objects that only mimic the dataclass, such as a LazyModel.
+
+    Args:
+        cls (type): The dataclass.
+
+    Returns:
+        Callable[[Any], Dict[str, Any]]: Converts an instance to a dict.
+    """
+    function = _serializers.get(cls)
+    if function is None:
+        function = _serializers[cls] = _compile(cls)
+    return function
+
+
+@lru_cache(maxsize=None)
+def pytz_timezone(name: str):
+    """
+    Returns the pytz time zone with the given name, looked up once per name.
+
+    Raises:
+        ImportError: If pytz is not installed.
+        pytz.UnknownTimeZoneError: If the name is not a known time zone.
+    """
+    from pytz import timezone
+    return timezone(name)
@@ -2,43 +2,114 @@
 import os
 from pathlib import Path
 import pickle
-from typing import List
-from googleapiclient.discovery import build
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Union
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
-from time import sleep # Added for potential delays
+from pydantic import BaseModel, Field
+
+from multi_agent_functions.v1.google.batch import BatchItemResult, execute_batch
+from multi_agent_functions.v1.google.fields import item_fields, list_fields
+from multi_agent_functions.v1.google.http import ServicePool, default_pool
+from multi_agent_functions.v1.google.paging import iter_items
+from multi_agent_functions.v1.google.quota import QuotaController, default_quota
 
 from multi_agent_functions.v1.google.tasks.model.task import Task
 from multi_agent_functions.v1.google.tasks.model.tasklist import TaskList
 
+# Default projections (partial responses) of the read tools: the fields the agents use.
+# Passing fields='*' returns full resources.
+TASKLIST_FIELDS = 'id,title,updated'
+TASK_FIELDS = 'id,title,notes,status,due,completed,parent,position,updated'
+
+# TaskList.from_dict and Task.from_dict need a title.
+_REQUIRED = ('title',)
+
+class NewTask(BaseModel):
+    title: str = Field(description="The title of the new task.")
+    notes: Optional[str] = Field(default=None, description="The notes for the new task.")
+    due: Optional[str] = Field(default=None, description="The due date for the new task (RFC 3339 timestamp).")
+
+
+class TaskPatch(BaseModel):
+    task_id: str = Field(description="The ID of the Task to update.")
+    title: Optional[str] = Field(default=None, description="The new title for the task.")
+    notes: Optional[str] = Field(default=None, description="The new notes for the task.")
+    due: Optional[str] = Field(default=None, description="The new due date for the task (RFC 3339 timestamp).")
+    status: Optional[str] = Field(default=None, description="'needsAction' or 'completed'.")
+
+
+def _fields(item: Union[BaseModel, dict]) -> dict:
+    """
+    Returns the fields that were set, whether the tool passed a model or a plain dict.
+    """
+    values = item.model_dump() if isinstance(item, BaseModel) else item
+    return {key: value for key, value in values.items() if value is not None}
+
+
 class GoogleTasksClient:
-    def __init__(self):
+    def __init__(self, pool: Optional[ServicePool] = None, quota: Optional[QuotaController] = None):
         """
         Initializes the GoogleTasksClient by setting up credentials and the Google Tasks API service.
+
+        Args:
+            pool (Optional[ServicePool]): Where the service and HTTP transports come from. Defaults to the process-wide pool.
+            quota (Optional[QuotaController]): Paces requests and retries throttled ones. Defaults to the process-wide controller.
         """
         self.credentials = self.__get_credentials()
-        self.service = build('tasks', 'v1', credentials=self.credentials)
-        self._call_count = 0
-        self._rebuild_threshold = 50 # Rebuild service after this many API calls
+        self.pool = pool or default_pool
+        self.quota = quota or default_quota
+        self.service = self.pool.service('tasks', 'v1', self.credentials)
+        self._change_listeners: List[Callable[[str], None]] = []
+
+    def on_change(self, listener: Callable[[str], None]) -> None:
+        """
+        Registers a callback told the key of every resource this client changes ('tasklists'
+        or 'tasks:<task list id>'), once the change succeeded. Mirrors use it to go stale.
+        """
+        self._change_listeners.append(listener)
+
+    def _changed(self, resources: Sequence[str]) -> None:
+        for resource in resources:
+            for listener in self._change_listeners:
+                listener(resource)
+
+    def _execute_and_manage_service(self, api_request_object, changes: Sequence[str] = ()):
+        """
+        Executes an API request under the shared quota controller, on the calling thread's pooled HTTP transport.
+
+        Args:
+            api_request_object: The request to send.
+            changes (Sequence[str]): Keys of the resources the request modifies, reported to the change listeners once it succeeded.
+        """
+        result = self.quota.execute(
+            lambda: self.pool.execute(api_request_object, self.credentials),
+            # Inserts are not idempotent; a server error may come after the task was created.
+            retry_server_errors=api_request_object.method != 'POST',
+        )
+        self._changed(changes)
+        return result
 
-    def _rebuild_service(self):
+    def _send_round_trip(self, round_trip: Callable[[Any], Any]) -> Any:
         """
-        Rebuilds the Google Tasks API service to refresh connections and release resources.
+        Sends one batch round trip on the calling thread's pooled transport, under the shared quota controller.
+        Only a throttled batch request is sent again: its sub-requests were not processed.
         """
-        self.service = build('tasks', 'v1', credentials=self.credentials)
-        print("GoogleTasksClient: Service rebuilt due to call threshold.")
+        def send() -> Any:
+            with self.pool.lease(self.credentials) as http:
+                return round_trip(http)
+
+        return self.quota.execute(send, retry_server_errors=False)
 
-    def _execute_and_manage_service(self, api_request_object):
+    def _execute_batch(self, api_request_objects: List, changes: Sequence[str] = ()) -> List[BatchItemResult]:
         """
-        Executes an API request, increments call count, and rebuilds service if threshold is met.
+        Executes API requests through the batch endpoint, in as few round trips as the batch limit allows.
+        Each round trip is admitted by the shared quota controller on its own, so a throttled round trip is
+        sent again without repeating the ones before it. The `changes` are reported if any sub-request succeeded.
         """
-        self._call_count += 1
-        if self._call_count >= self._rebuild_threshold:
-            self._rebuild_service()
-            self._call_count = 0 # Reset count after rebuild
-        # Add a small delay to prevent overwhelming the API or for resource cleanup
-        sleep(0.05)
-        return api_request_object.execute()
+        results = execute_batch(self.service, api_request_objects, on_rate_limited=self.quota.throttled, run=self._send_round_trip)
+        if any(result.ok for result in results):
+            self._changed(changes)
+        return results
 
     def __get_credentials(self):
         """
@@ -66,41 +137,59 @@ class GoogleTasksClient:
                 pickle.dump(creds, token)
         return creds
 
-    def __paging_collect(self, func, args, kwargs):
+    def __paging_iter(self, func, args, kwargs, max_items: Optional[int] = None, prefetch: bool = False) -> Iterator[dict]:
         """
-        Helper function to collect all items from a paginated API response.
+        Helper function to stream the items of a paginated API response, fetching pages as they are needed.
 
         Args:
             func (callable): The API function to call (e.g., self.service.tasklists().list).
             args (list): Positional arguments to pass to the API function.
             kwargs (dict): Keyword arguments to pass to the API function.
+            max_items (Optional[int]): Stop after this many items. None streams every page.
+            prefetch (bool): Fetch the next page on a background thread while the current one is consumed.
 
         Returns:
-            list: A list of all collected items from the API.
-        """
-        items = []
-        page_token = None
-        while True:
-            results = func(*args, **kwargs, pageToken=page_token).execute()
-            items.extend(results.get('items', []))
-            page_token = results.get('nextPageToken')
-            if not page_token:
-                break
-        return items
-    
-    def tasklists_list(self) -> List[TaskList]:
+            Iterator[dict]: The items from the API, in order.
+        """
+        return iter_items(
+            lambda page_token: self._execute_and_manage_service(func(*args, **kwargs, pageToken=page_token)),
+            max_items=max_items,
+            prefetch=prefetch,
+        )
+
+    def tasklists_list(self, fields: Optional[str] = None) -> List[TaskList]:
         """
         Lists all task lists for the authenticated user.
 
+        Args:
+            fields (Optional[str]): Fields to return for each task list, e.g. 'id,title'. Defaults to the commonly used fields; '*' returns all.
+
         Returns:
             List[TaskList]: A list of TaskList objects.
         """
-        tasklists = self.__paging_collect(
+        return list(self.iter_tasklists(fields=fields))
+
+    def iter_tasklists(self, max_items: Optional[int] = None, prefetch: bool = False, fields: Optional[str] = None) -> Iterator[TaskList]:
+        """
+        Streams the task lists of the authenticated user, fetching result pages lazily.
+
+        Args:
+            max_items (Optional[int]): Stop after this many task lists. None streams every page.
+            prefetch (bool): Fetch the next page on a background thread while the current one is consumed.
+            fields (Optional[str]): Fields to return for each task list. Defaults to the commonly used fields; '*' returns all.
+
+        Returns:
+            Iterator[TaskList]: The task lists, in order.
+        """
+        projection = list_fields(fields, TASKLIST_FIELDS, _REQUIRED)
+        tasklists = self.__paging_iter(
             self.service.tasklists().list,
             args=[],
-            kwargs={}
+            kwargs={'fields': projection} if projection is not None else {},
+            max_items=max_items,
+            prefetch=prefetch,
         )
-        return [TaskList.from_dict(tasklist) for tasklist in tasklists]
+        return map(TaskList.from_dict, tasklists)
 
     def tasklists_delete(self, tasklist_id: str) -> None:
         """
@@ -109,19 +198,23 @@ class GoogleTasksClient:
         Args:
             tasklist_id (str): The ID of the TaskList to be deleted.
         """
-        self._execute_and_manage_service(self.service.tasklists().delete(tasklist=tasklist_id))
+        self._execute_and_manage_service(self.service.tasklists().delete(tasklist=tasklist_id), changes=['tasklists', f'tasks:{tasklist_id}'])
 
-    def tasklists_get(self, tasklist_id: str) -> TaskList:
+    def tasklists_get(self, tasklist_id: str, fields: Optional[str] = None) -> TaskList:
         """
         Retrieves a specific task list by its ID.
 
         Args:
             tasklist_id (str): The ID of the task list to retrieve.
+            fields (Optional[str]): Fields to return, e.g. 'id,title'. Defaults to the commonly used fields; '*' returns all.
 
         Returns:
             TaskList: The retrieved TaskList object.
         """
-        tasklist = self._execute_and_manage_service(self.service.tasklists().get(tasklist=tasklist_id))
+        tasklist = self._execute_and_manage_service(self.service.tasklists().get(
+            tasklist=tasklist_id,
+            fields=item_fields(fields, TASKLIST_FIELDS, _REQUIRED),
+        ))
         return TaskList.from_dict(tasklist)
 
     def tasklists_insert(self, title: str) -> TaskList:
@@ -135,7 +228,7 @@ class GoogleTasksClient:
             TaskList: The newly created TaskList object.
         """
         tasklist_data = {"title": title}
-        tasklist = self._execute_and_manage_service(self.service.tasklists().insert(body=tasklist_data))
+        tasklist = self._execute_and_manage_service(self.service.tasklists().insert(body=tasklist_data), changes=['tasklists'])
         return TaskList.from_dict(tasklist)
 
     def tasklists_patch(self, tasklist_id: str, title: str) -> TaskList:
@@ -150,7 +243,7 @@ class GoogleTasksClient:
             TaskList: The updated TaskList object.
         """
         tasklist_data = {"title": title}
-        tasklist = self._execute_and_manage_service(self.service.tasklists().patch(tasklist=tasklist_id, body=tasklist_data))
+        tasklist = self._execute_and_manage_service(self.service.tasklists().patch(tasklist=tasklist_id, body=tasklist_data), changes=['tasklists'])
         return TaskList.from_dict(tasklist)
 
     def tasklists_update(self, tasklist_id: str, title: str) -> TaskList:
@@ -165,7 +258,7 @@ class GoogleTasksClient:
             TaskList: The updated TaskList object.
         """
         tasklist_data = {"title": title}
-        tasklist = self._execute_and_manage_service(self.service.tasklists().update(tasklist=tasklist_id, body=tasklist_data))
+        tasklist = self._execute_and_manage_service(self.service.tasklists().update(tasklist=tasklist_id, body=tasklist_data), changes=['tasklists'])
         return TaskList.from_dict(tasklist)
 
     def tasks_clear(self, tasklist_id: str) -> None:
@@ -175,7 +268,7 @@ class GoogleTasksClient:
         Args:
             tasklist_id (str): The ID of the TaskList from which to clear completed tasks.
         """
-        self._execute_and_manage_service(self.service.tasks().clear(tasklist=tasklist_id))
+        self._execute_and_manage_service(self.service.tasks().clear(tasklist=tasklist_id), changes=[f'tasks:{tasklist_id}'])
 
     def tasks_delete(self, tasklist_id: str, task_id: str) -> None:
         """
@@ -185,20 +278,25 @@ class GoogleTasksClient:
             tasklist_id (str): The ID of the TaskList containing the task.
             task_id (str): The ID of the Task to be deleted.
         """
-        self._execute_and_manage_service(self.service.tasks().delete(tasklist=tasklist_id, task=task_id))
+        self._execute_and_manage_service(self.service.tasks().delete(tasklist=tasklist_id, task=task_id), changes=[f'tasks:{tasklist_id}'])
 
-    def tasks_get(self, tasklist_id: str, task_id: str) -> Task:
+    def tasks_get(self, tasklist_id: str, task_id: str, fields: Optional[str] = None) -> Task:
         """
         Retrieves a specific task from a task list.
 
         Args:
             tasklist_id (str): The ID of the TaskList containing the task.
             task_id (str): The ID of the task to retrieve.
+            fields (Optional[str]): Fields to return, e.g. 'id,title,due'. Defaults to the commonly used fields; '*' returns all.
 
         Returns:
             Task: The retrieved Task object.
         """
-        task = self._execute_and_manage_service(self.service.tasks().get(tasklist=tasklist_id, task=task_id))
+        task = self._execute_and_manage_service(self.service.tasks().get(
+            tasklist=tasklist_id,
+            task=task_id,
+            fields=item_fields(fields, TASK_FIELDS, _REQUIRED),
+        ))
         return task
 
     def tasks_insert(self, tasklist_id: str, title: str, notes: str = None, due: str = None) -> Task:
@@ -215,25 +313,47 @@ class GoogleTasksClient:
             Task: The newly created Task object.
         """
         body = {'title': title, 'notes': notes, 'due': due}
-        task = self._execute_and_manage_service(self.service.tasks().insert(tasklist=tasklist_id, body=body))
+        task = self._execute_and_manage_service(self.service.tasks().insert(tasklist=tasklist_id, body=body), changes=[f'tasks:{tasklist_id}'])
         return task
 
-    def tasks_list(self, tasklist_id: str) -> List[Task]:
+    def tasks_list(self, tasklist_id: str, max_items: Optional[int] = 500, fields: Optional[str] = None) -> List[Task]:
         """
-        Lists all tasks in a specified task list.
+        Lists the tasks in a specified task list.
 
         Args:
             tasklist_id (str): The ID of the TaskList from which to list tasks.
+            max_items (Optional[int]): Maximum number of tasks to return. Defaults to 500.
+            fields (Optional[str]): Fields to return for each task, e.g. 'id,title,status'. Defaults to the commonly used fields; '*' returns all.
 
         Returns:
             List[Task]: A list of Task objects.
         """
-        tasks = self.__paging_collect(
+        return list(self.iter_tasks(tasklist_id, max_items=max_items, fields=fields))
+
+    def iter_tasks(self, tasklist_id: str, max_items: Optional[int] = None, prefetch: bool = False, fields: Optional[str] = None) -> Iterator[Task]:
+        """
+        Streams the tasks in a specified task list, fetching result pages lazily.
+
+        Args:
+            tasklist_id (str): The ID of the TaskList from which to list tasks.
+            max_items (Optional[int]): Stop after this many tasks. None streams every page.
+            prefetch (bool): Fetch the next page on a background thread while the current one is consumed.
+            fields (Optional[str]): Fields to return for each task. Defaults to the commonly used fields; '*' returns all.
+
+        Returns:
+            Iterator[Task]: The tasks, in order.
+        """
+        kwargs = {'tasklist': tasklist_id}
+        projection = list_fields(fields, TASK_FIELDS, _REQUIRED)
+        if projection is not None:
+            kwargs['fields'] = projection
+        return self.__paging_iter(
             self.service.tasks().list,
             args=[],
-            kwargs={'tasklist': tasklist_id}
+            kwargs=kwargs,
+            max_items=max_items,
+            prefetch=prefetch,
         )
-        return tasks
 
     def tasks_patch(self, tasklist_id: str, task_id: str, title: str = None, notes: str = None, due: str = None) -> Task:
         """
@@ -250,7 +370,7 @@ class GoogleTasksClient:
             Task: The updated Task object.
         """
         body = {'title': title, 'notes': notes, 'due': due}
-        task = self._execute_and_manage_service(self.service.tasks().patch(tasklist=tasklist_id, task=task_id, body=body))
+        task = self._execute_and_manage_service(self.service.tasks().patch(tasklist=tasklist_id, task=task_id, body=body), changes=[f'tasks:{tasklist_id}'])
         return task
 
     def tasks_update(self, tasklist_id: str, task_id: str, title: str = None, notes: str = None, due: str = None) -> Task:
@@ -268,5 +388,55 @@ class GoogleTasksClient:
             Task: The updated Task object.
         """
         body = {'title': title, 'notes': notes, 'due': due}
-        task = self._execute_and_manage_service(self.service.tasks().update(tasklist=tasklist_id, task=task_id, body=body))
+        task = self._execute_and_manage_service(self.service.tasks().update(tasklist=tasklist_id, task=task_id, body=body), changes=[f'tasks:{tasklist_id}'])
         return task
+
+    def tasks_insert_many(self, tasklist_id: str, tasks: List[NewTask]) -> List[BatchItemResult]:
+        """
+        Inserts several tasks into a task list in a single batched request.
+
+        Args:
+            tasklist_id (str): The ID of the TaskList where the tasks will be inserted.
+            tasks (List[NewTask]): The tasks to create.
+
+        Returns:
+            List[BatchItemResult]: The created task or the error, for each task in order.
+        """
+        return self._execute_batch([
+            self.service.tasks().insert(tasklist=tasklist_id, body=_fields(task))
+            for task in tasks
+        ], changes=[f'tasks:{tasklist_id}'])
+
+    def tasks_patch_many(self, tasklist_id: str, patches: List[TaskPatch]) -> List[BatchItemResult]:
+        """
+        Partially updates several tasks of a task list in a single batched request.
+
+        Args:
+            tasklist_id (str): The ID of the TaskList containing the tasks.
+            patches (List[TaskPatch]): The updates, each with the task's ID and the fields to change.
+
+        Returns:
+            List[BatchItemResult]: The updated task or the error, for each patch in order.
+        """
+        requests = []
+        for patch in patches:
+            body = _fields(patch)
+            task_id = body.pop('task_id')
+            requests.append(self.service.tasks().patch(tasklist=tasklist_id, task=task_id, body=body))
+        return self._execute_batch(requests, changes=[f'tasks:{tasklist_id}'])
+
+    def tasks_delete_many(self, tasklist_id: str, task_ids: List[str]) -> List[BatchItemResult]:
+        """
+        Deletes several tasks from a task list in a single batched request.
+
+        Args:
+            tasklist_id (str): The ID of the TaskList containing the tasks.
+            task_ids (List[str]): The IDs of the Tasks to be deleted.
+
+        Returns:
+            List[BatchItemResult]: The outcome of each deletion in order.
+        """
+        return self._execute_batch([
+            self.service.tasks().delete(tasklist=tasklist_id, task=task_id)
+            for task_id in task_ids
+        ], changes=[f'tasks:{tasklist_id}'])
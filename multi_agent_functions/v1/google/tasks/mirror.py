@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import Column, Engine, String, Table, Text, and_, delete, select
+
+from multi_agent_functions.v1.google.mirror import Mirror, metadata
+from multi_agent_functions.v1.google.paging import iter_pages
+from multi_agent_functions.v1.google.tasks.client import GoogleTasksClient
+from multi_agent_functions.v1.google.tasks.model.task import Task
+from multi_agent_functions.v1.google.tasks.model.tasklist import TaskList
+
+tasklists_table = Table(
+    'mirror_tasklists',
+    metadata,
+    Column('id', String, primary_key=True),
+    Column('data', Text, nullable=False),
+)
+
+tasks_table = Table(
+    'mirror_tasks',
+    metadata,
+    Column('tasklist_id', String, primary_key=True),
+    Column('id', String, primary_key=True),
+    Column('position', String),
+    Column('status', String),
+    Column('data', Text, nullable=False),
+)
+
+# Changes made while a sync is running must not fall outside the next updatedMin window.
+_CLOCK_SKEW = timedelta(seconds=30)
+
+
+class TasksMirror(Mirror):
+    """
+    A local copy of the task lists and of the tasks of each task list that was read.
+
+    The Tasks API has no sync tokens, so task deltas are fetched with `updatedMin`
+    set to the start of the previous sync, including deleted and hidden tasks. Task
+    lists are few and are fetched in full. Changes made through the client mark the
+    changed task lists or tasks stale, so the next read picks them up.
+    """
+
+    def __init__(self, client: GoogleTasksClient, url: str = 'sqlite:///mirror.db', engine: Optional[Engine] = None, max_age_seconds: float = 60.0):
+        """
+        Args:
+            client (GoogleTasksClient): The client used to fetch changes.
+            url (str): Database URL, used when no engine is given.
+            engine (Optional[Engine]): An existing engine to store the mirror in.
+            max_age_seconds (float): How long mirrored data is served without syncing first.
+        """
+        super().__init__(url, engine, max_age_seconds)
+        self.client = client
+        client.on_change(self.invalidate)
+
+    def _sync(self, resource: str, token: Optional[str]) -> None:
+        if resource == 'tasklists':
+            self._sync_tasklists()
+        else:
+            self._sync_tasks(resource.split(':', 1)[1], token)
+
+    def _sync_tasklists(self) -> None:
+        tasklists = list(self.client.iter_tasklists())
+        with self.engine.begin() as connection:
+            connection.execute(delete(tasklists_table))
+            for tasklist in tasklists:
+                connection.execute(tasklists_table.insert().values(id=tasklist.id, data=self._dumps(tasklist.to_dict())))
+            self._save_sync_state(connection, 'tasklists', None, self._now())
+
+    def _sync_tasks(self, tasklist_id: str, updated_min: Optional[str]) -> None:
+        started = datetime.now(timezone.utc)
+        params = {'showCompleted': True, 'showHidden': True, 'maxResults': 100}
+        if updated_min:
+            params.update(updatedMin=updated_min, showDeleted=True)
+        pages = iter_pages(lambda page_token: self.client._execute_and_manage_service(
+            self.client.service.tasks().list(tasklist=tasklist_id, **params, pageToken=page_token)
+        ))
+        in_tasklist = tasks_table.c.tasklist_id == tasklist_id
+        with self.engine.begin() as connection:
+            if updated_min is None:
+                connection.execute(delete(tasks_table).where(in_tasklist))
+            for page in pages:
+                for item in page.get('items', []):
+                    connection.execute(delete(tasks_table).where(and_(in_tasklist, tasks_table.c.id == item['id'])))
+                    if not item.get('deleted'):
+                        connection.execute(tasks_table.insert().values(
+                            tasklist_id=tasklist_id,
+                            id=item['id'],
+                            position=item.get('position'),
+                            status=item.get('status'),
+                            data=self._dumps(item),
+                        ))
+            next_updated_min = (started - _CLOCK_SKEW).isoformat(timespec='seconds').replace('+00:00', 'Z')
+            self._save_sync_state(connection, f'tasks:{tasklist_id}', next_updated_min, self._now())
+
+    def list_tasklists(self, refresh: bool = False) -> List[TaskList]:
+        """
+        Returns the task lists from a local mirror. Much faster than `tasklists_list`; the
+        mirror includes changes made through this client and is at most a minute old otherwise.
+
+        Args:
+            refresh (bool): Sync first, even if the mirror is recent, e.g. to pick up changes made elsewhere.
+
+        Returns:
+            List[TaskList]: The mirrored task lists.
+        """
+        self.sync('tasklists', force=refresh)
+        with self.engine.connect() as connection:
+            rows = connection.execute(select(tasklists_table.c.data)).all()
+        return [TaskList.from_dict(self._loads(row.data)) for row in rows]
+
+    def list_tasks(self, tasklist_id: str, show_completed: bool = True, refresh: bool = False) -> List[Task]:
+        """
+        Returns the tasks of a task list from a local mirror, in the list's order. Much faster
+        than `tasks_list`; the mirror includes changes made through this client and is at most
+        a minute old otherwise.
+
+        Args:
+            tasklist_id (str): The ID of the TaskList from which to list tasks.
+            show_completed (bool): Whether to include completed tasks.
+            refresh (bool): Sync the changes first, even if the mirror is recent, e.g. to pick up changes made elsewhere.
+
+        Returns:
+            List[Task]: The mirrored tasks.
+        """
+        self.sync(f'tasks:{tasklist_id}', force=refresh)
+        query = select(tasks_table.c.data).where(tasks_table.c.tasklist_id == tasklist_id)
+        if not show_completed:
+            query = query.where(tasks_table.c.status != 'completed')
+        with self.engine.connect() as connection:
+            rows = connection.execute(query.order_by(tasks_table.c.position)).all()
+        return [Task.from_dict(self._loads(row.data)) for row in rows]
@@ -1,8 +1,11 @@
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field
 from typing import Optional
 
+from multi_agent_functions.v1.google.interning import interned
+from multi_agent_functions.v1.google.serialization import serializer
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class TaskList:
     title: str
     kind: str = field(default="tasks#taskList")
@@ -29,7 +32,7 @@ class TaskList:
             TaskList: A TaskList object populated with the provided data.
         """
         return TaskList(
-            kind=data.get("kind", "tasks#taskList"),
+            kind=interned(data.get("kind", "tasks#taskList")),
             id=data.get("id"),
             etag=data.get("etag"),
             title=data["title"],
@@ -44,7 +47,7 @@ class TaskList:
         Returns:
             dict: A dictionary representation of the TaskList object.
         """
-        return asdict(self)
+        return serializer(type(self))(self)
 
     def __repr__(self):
         return f"TaskList(id={self.id}, title={self.title})"
@@ -2,7 +2,9 @@ from typing import List
 from langchain_core.tools import create_schema_from_function, BaseTool, StructuredTool
 from datetime import datetime
 
+from multi_agent_functions.v1.google.tool_selection import MUTATING, READ_ONLY, SERIALIZATION, UTILITY, ToolSelector, categorized
 from multi_agent_functions.v1.google.tasks.client import GoogleTasksClient
+from multi_agent_functions.v1.google.tasks.mirror import TasksMirror
 from multi_agent_functions.v1.google.tasks.model.task import Task
 from multi_agent_functions.v1.google.tasks.model.tasklist import TaskList
 from multi_agent_functions.v1.google.tasks.state import GoogleTasksAgentState
@@ -10,6 +12,7 @@ from multi_agent_functions.v1.google.tasks.state import GoogleTasksAgentState
 class GoogleTasksToolkit:
     def __init__(self):
         self.client = GoogleTasksClient()
+        self.mirror = TasksMirror(self.client)
 
     def get_current_time(self) -> str:
         """
@@ -18,26 +21,42 @@ class GoogleTasksToolkit:
         return datetime.now().astimezone().isoformat()
 
     def get_tools(self) -> List[BaseTool]:
-        return list(map(
-            StructuredTool.from_function,
-            [
-                self.get_current_time,
-                Task.from_dict,
-                TaskList.from_dict,
-                Task.to_dict,
-                TaskList.to_dict,
-                self.client.tasklists_list,
-                self.client.tasklists_delete,
-                self.client.tasklists_get,
-                self.client.tasklists_insert,
-                self.client.tasklists_patch,
-                self.client.tasklists_update,
-                self.client.tasks_list,
-                self.client.tasks_clear,
-                self.client.tasks_delete,
-                self.client.tasks_get,
-                self.client.tasks_insert,
-                self.client.tasks_patch,
-                self.client.tasks_update,
-            ]
-        ))
+        return [
+            categorized(self.get_current_time, UTILITY),
+            categorized(Task.from_dict, READ_ONLY, 'tasks', SERIALIZATION),
+            categorized(TaskList.from_dict, READ_ONLY, 'tasklists', SERIALIZATION),
+            categorized(Task.to_dict, READ_ONLY, 'tasks', SERIALIZATION),
+            categorized(TaskList.to_dict, READ_ONLY, 'tasklists', SERIALIZATION),
+            categorized(self.client.tasklists_list, READ_ONLY, 'tasklists'),
+            categorized(self.mirror.list_tasklists, READ_ONLY, 'tasklists'),
+            categorized(self.client.tasklists_delete, MUTATING, 'tasklists'),
+            categorized(self.client.tasklists_get, READ_ONLY, 'tasklists'),
+            categorized(self.client.tasklists_insert, MUTATING, 'tasklists'),
+            categorized(self.client.tasklists_patch, MUTATING, 'tasklists'),
+            categorized(self.client.tasklists_update, MUTATING, 'tasklists'),
+            categorized(self.client.tasks_list, READ_ONLY, 'tasks'),
+            categorized(self.mirror.list_tasks, READ_ONLY, 'tasks'),
+            categorized(self.client.tasks_clear, MUTATING, 'tasks'),
+            categorized(self.client.tasks_delete, MUTATING, 'tasks'),
+            categorized(self.client.tasks_get, READ_ONLY, 'tasks'),
+            categorized(self.client.tasks_insert, MUTATING, 'tasks'),
+            categorized(self.client.tasks_patch, MUTATING, 'tasks'),
+            categorized(self.client.tasks_update, MUTATING, 'tasks'),
+            categorized(self.client.tasks_insert_many, MUTATING, 'tasks'),
+            categorized(self.client.tasks_patch_many, MUTATING, 'tasks'),
+            categorized(self.client.tasks_delete_many, MUTATING, 'tasks'),
+        ]
+
+    def get_tool_selector(self) -> ToolSelector:
+        """
+        Returns a selector that narrows the tools to the task or task list operations a subtask needs.
+        """
+        return ToolSelector(
+            self.get_tools(),
+            resources={
+                'tasks': r'\b(tasks?(?! ?lists?\b)|to-?dos?|items?|due|notes?|subtasks?|completed?)\b',
+                'tasklists': r'\b(task ?lists?|lists?)\b',
+            },
+            # Tasks are addressed by the id of their task list.
+            dependencies={'tasks': ['tasklists']},
+        )
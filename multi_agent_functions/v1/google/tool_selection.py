@@ -0,0 +1,166 @@
+import json
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from multi_agent_functions.v1.google.async_tools import to_structured_tool
+from multi_agent_functions.v1.intent import is_read_only_intent
+
+# Every tool is either read-only or mutating, and belongs to one resource (e.g. 'events').
+READ_ONLY = 'read_only'
+MUTATING = 'mutating'
+# Always offered.
+UTILITY = 'utility'
+# Offered only when the request asks for them, see ToolSelector's `optional`.
+SERIALIZATION = 'serialization'
+WATCH = 'watch'
+
+DEFAULT_OPTIONAL = {
+    SERIALIZATION: r'\b(json|dict|dictionary|serializ\w*|deserializ\w*)\b',
+    WATCH: r'\b(watch|webhook|notif\w*|push|channel)\b',
+}
+
+
+def categorized(func: Callable[..., Any], *categories: str) -> BaseTool:
+    """
+    Creates a tool for `func`, tagged with the categories the ToolSelector selects by.
+    """
+    tool = to_structured_tool(func)
+    tool.tags = list(categories)
+    return tool
+
+
+@dataclass(frozen=True)
+class ToolSelection:
+    tools: List[BaseTool]
+    categories: List[str]
+    schema_tokens: int
+    total_schema_tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.total_schema_tokens - self.schema_tokens
+
+
+@dataclass(frozen=True)
+class ToolSelectionMetrics:
+    selections: int
+    schema_tokens: int
+    total_schema_tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.total_schema_tokens - self.schema_tokens
+
+
+class ToolSelector:
+    """
+    Picks the tools relevant to a subtask, so each ReAct step ships fewer tool
+    schemas and the model chooses among fewer tools.
+
+    Mutating tools are left out only when the subtask clearly just reads; when it
+    cannot be classified, they are offered so the agent is never unable to act.
+    Resources are narrowed to the ones the subtask mentions and the resources that
+    live in them (asking to add something to a task list needs the task tools),
+    together with the read-only tools of the resources they depend on (for example,
+    tasks need task list ids). When no resource is mentioned, all of them are
+    offered. Utility tools are always offered; optional categories only when their
+    pattern matches.
+    """
+
+    def __init__(
+        self,
+        tools: Sequence[BaseTool],
+        resources: Dict[str, str],
+        dependencies: Optional[Dict[str, Sequence[str]]] = None,
+        optional: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Args:
+            tools (Sequence[BaseTool]): The full tool set, tagged with `categorized`.
+            resources (Dict[str, str]): Resource category to the pattern that signals it in a request.
+            dependencies (Optional[Dict[str, Sequence[str]]]): Resources whose read-only tools are needed by another resource.
+            optional (Optional[Dict[str, str]]): Categories offered only when their pattern matches.
+                Defaults to serialization helpers and watch endpoints.
+        """
+        self.tools = list(tools)
+        self.resources = {name: re.compile(pattern, re.IGNORECASE) for name, pattern in resources.items()}
+        self.dependencies = dependencies or {}
+        self.optional = {
+            name: re.compile(pattern, re.IGNORECASE)
+            for name, pattern in (optional if optional is not None else DEFAULT_OPTIONAL).items()
+        }
+        # Tool schemas are fixed, so their size is estimated once (about 4 characters per token).
+        self._tokens = [len(json.dumps(convert_to_openai_tool(tool), default=str)) // 4 for tool in self.tools]
+        self._total_tokens = sum(self._tokens)
+        self._lock = threading.Lock()
+        self._selections = 0
+        self._schema_tokens = 0
+        self._total_schema_tokens = 0
+
+    def _categories(self, request: str) -> List[str]:
+        categories = [UTILITY, READ_ONLY]
+        if not is_read_only_intent(request):
+            categories.append(MUTATING)
+        mentioned = [name for name, pattern in self.resources.items() if pattern.search(request)]
+        # Resources that depend on a mentioned one may be what the request is really about.
+        contained = [
+            name for name, dependencies in self.dependencies.items()
+            if name not in mentioned and any(dependency in mentioned for dependency in dependencies)
+        ]
+        categories += (mentioned + contained) or list(self.resources)
+        categories += [name for name, pattern in self.optional.items() if pattern.search(request)]
+        return categories
+
+    def _selected(self, tags: Sequence[str], categories: List[str], read_only_resources: List[str]) -> bool:
+        if UTILITY in tags:
+            return True
+        if any(name in tags and name not in categories for name in self.optional):
+            return False
+        if READ_ONLY in tags and any(resource in tags for resource in read_only_resources):
+            return True
+        mutability = MUTATING if MUTATING in tags else READ_ONLY
+        return mutability in categories and any(resource in tags for resource in categories if resource in self.resources)
+
+    def select(self, request: str) -> ToolSelection:
+        """
+        Args:
+            request (str): The subtask the agent is about to work on.
+
+        Returns:
+            ToolSelection: The tools to bind, and the schema tokens they take compared to the full set.
+        """
+        categories = self._categories(request)
+        read_only_resources = [
+            dependency
+            for resource in categories
+            for dependency in self.dependencies.get(resource, ())
+        ]
+        selected = [
+            (tool, tokens)
+            for tool, tokens in zip(self.tools, self._tokens)
+            if self._selected(tool.tags or [], categories, read_only_resources)
+        ]
+        selection = ToolSelection(
+            tools=[tool for tool, _ in selected],
+            categories=categories,
+            schema_tokens=sum(tokens for _, tokens in selected),
+            total_schema_tokens=self._total_tokens,
+        )
+        with self._lock:
+            self._selections += 1
+            self._schema_tokens += selection.schema_tokens
+            self._total_schema_tokens += selection.total_schema_tokens
+        return selection
+
+    def metrics(self) -> ToolSelectionMetrics:
+        with self._lock:
+            return ToolSelectionMetrics(
+                selections=self._selections,
+                schema_tokens=self._schema_tokens,
+                total_schema_tokens=self._total_schema_tokens,
+            )
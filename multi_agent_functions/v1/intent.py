@@ -0,0 +1,25 @@
+import re
+
+# Requests that change Google Tasks or Calendar.
+MUTATING_INTENT = re.compile(
+    r'\b(create|add|insert|delete|remove|update|patch|move|clear|schedule|reschedule|rename|cancel|complete|mark|import|book'
+    r'|change|set|edit|modify|replace|postpone|push back|bring forward|shift|extend|shorten|assign|invite|accept|decline'
+    r'|finish|check off|tick off|undo|restore|archive|drop|erase|put|make|new|plan|remind)\b',
+    re.IGNORECASE
+)
+
+# Requests that only ask about Google Tasks or Calendar.
+READ_INTENT = re.compile(
+    r'\b(list|show|get|find|search|look up|view|display|read|check|what|which|when|where|who|how many|how much|'
+    r'is there|are there|do i have|am i|any|free|busy|availab\w*|conflicts?)\b',
+    re.IGNORECASE
+)
+
+
+def is_read_only_intent(request: str) -> bool:
+    """
+    Whether a request clearly only reads: it asks a question or for a listing, and
+    nothing in it asks for a change. Requests that match neither pattern are not
+    read-only, so callers that must not miss a change treat them as mutating.
+    """
+    return not MUTATING_INTENT.search(request) and bool(READ_INTENT.search(request))
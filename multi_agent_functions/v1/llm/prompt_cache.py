@@ -0,0 +1,301 @@
+import hashlib
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+# Request arguments that belong to the cached prefix rather than to the individual call.
+_PREFIX_KWARGS = ('tools', 'tool_choice', 'tool_config')
+
+
+@dataclass(frozen=True)
+class PromptCacheUsage:
+    prefix_key: str
+    cached_tokens: int
+    uncached_tokens: int
+
+
+@dataclass(frozen=True)
+class PromptCacheMetrics:
+    calls: int
+    hits: int
+    cached_tokens: int
+    uncached_tokens: int
+
+
+@dataclass(frozen=True)
+class CachedPrefix:
+    """
+    A prompt prefix the provider (or the local stand-in) holds on to.
+
+    Args:
+        key (str): Stable hash of the system prompt and tool definitions.
+        handle (Optional[str]): Provider name of the cached content. None if the prefix could not be cached.
+        tokens (int): Estimated size of the prefix.
+        expires_at (float): `time.monotonic()` timestamp after which the handle is recreated.
+    """
+    key: str
+    handle: Optional[str]
+    tokens: int
+    expires_at: float
+
+
+@dataclass(frozen=True)
+class PreparedCall:
+    messages: List[BaseMessage]
+    kwargs: Dict[str, Any]
+    prefix: Optional[CachedPrefix]
+    hit: bool
+
+
+def split_prefix(messages: List[BaseMessage]) -> Tuple[List[BaseMessage], List[BaseMessage]]:
+    """
+    Splits the agent's system prompt, which is identical across its calls, from the
+    conversation that follows it.
+
+    Only the first system message is part of the prefix. Later system messages,
+    such as the rolling summary of a compacted history, change from call to call
+    and stay in the uncached tail.
+    """
+    if messages and isinstance(messages[0], SystemMessage):
+        return messages[:1], messages[1:]
+    return [], messages
+
+
+def prefix_key(model_name: str, prefix: List[BaseMessage], kwargs: Dict[str, Any]) -> str:
+    """
+    Hashes the stable part of a request: model, system prompt and tool definitions.
+
+    Args:
+        model_name (str): Name of the model the prefix is cached for.
+        prefix (List[BaseMessage]): The system prompt, as split off by `split_prefix`.
+        kwargs (Dict[str, Any]): The call arguments, of which the tool definitions are part of the key.
+
+    Returns:
+        str: A hex digest identifying the prefix.
+    """
+    payload = {
+        'model': model_name,
+        'system': [message.content for message in prefix],
+        **{name: kwargs[name] for name in _PREFIX_KWARGS if kwargs.get(name) is not None},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class PromptCache(ABC):
+    """
+    Reuses the static prefix of agent prompts (system prompt plus tool definitions)
+    across calls, and reports how many input tokens were served from the cache.
+
+    Subclasses decide how a prefix is stored and how a request refers to it.
+    Creating a prefix happens outside the cache's lock, so calls for other prefixes
+    are never held up by it; concurrent calls for the same prefix wait for the one
+    creation in flight.
+    """
+
+    def __init__(self, ttl_seconds: float = 600.0, min_tokens: int = 0):
+        """
+        Args:
+            ttl_seconds (float): How long a cached prefix is reused before it is recreated.
+            min_tokens (int): Prefixes estimated below this size are sent uncached.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.min_tokens = min_tokens
+        self._prefixes: Dict[str, CachedPrefix] = {}
+        self._creating: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._hits = 0
+        self._cached_tokens = 0
+        self._uncached_tokens = 0
+
+    @abstractmethod
+    def _create(self, model: BaseChatModel, key: str, prefix: List[BaseMessage], kwargs: Dict[str, Any]) -> Optional[str]:
+        """
+        Stores a prefix with the provider.
+
+        Returns:
+            Optional[str]: The handle requests use to refer to the prefix, or None if it cannot be cached.
+        """
+
+    @abstractmethod
+    def _attach(self, handle: str, prefix: List[BaseMessage], rest: List[BaseMessage], kwargs: Dict[str, Any]) -> Tuple[List[BaseMessage], Dict[str, Any]]:
+        """
+        Rewrites a request to refer to a cached prefix.
+        """
+
+    def _lookup(self, model: BaseChatModel, prefix: List[BaseMessage], kwargs: Dict[str, Any]) -> Tuple[Optional[CachedPrefix], bool]:
+        model_name = getattr(model, 'model', None) or model._llm_type
+        key = prefix_key(str(model_name), prefix, kwargs)
+        while True:
+            with self._lock:
+                cached = self._prefixes.get(key)
+                if cached is not None and cached.expires_at > time.monotonic():
+                    return cached, cached.handle is not None
+                creating = self._creating.get(key)
+                if creating is None:
+                    creating = self._creating[key] = threading.Event()
+                    break
+            # Another call is creating this prefix; use its result rather than creating a second copy.
+            creating.wait()
+        try:
+            tokens = count_tokens_approximately(prefix) + len(json.dumps(kwargs.get('tools') or [], default=str)) // 4
+            handle = None
+            if tokens >= self.min_tokens:
+                try:
+                    handle = self._create(model, key, prefix, kwargs)
+                except Exception as e:
+                    print(f"Prompt cache: could not cache prefix {key[:12]}: {str(e)[:80]}")
+            # Prefixes that cannot be cached are remembered too, so creation is not retried on every call.
+            cached = CachedPrefix(key, handle, tokens, time.monotonic() + self.ttl_seconds)
+            with self._lock:
+                self._prefixes[key] = cached
+            return cached, False
+        finally:
+            with self._lock:
+                del self._creating[key]
+            creating.set()
+
+    def prepare(self, model: BaseChatModel, messages: List[BaseMessage], kwargs: Dict[str, Any]) -> PreparedCall:
+        """
+        Looks up (or creates) the cached prefix of a request and rewrites the request to use it.
+
+        Args:
+            model (BaseChatModel): The model the request is sent to.
+            messages (List[BaseMessage]): The full prompt.
+            kwargs (Dict[str, Any]): The call arguments, including bound tools.
+
+        Returns:
+            PreparedCall: The messages and arguments to send, and the prefix they refer to.
+        """
+        prefix, rest = split_prefix(messages)
+        if not prefix:
+            return PreparedCall(messages, kwargs, None, False)
+        cached, hit = self._lookup(model, prefix, kwargs)
+        if cached is None or cached.handle is None:
+            return PreparedCall(messages, kwargs, cached, False)
+        messages, kwargs = self._attach(cached.handle, prefix, rest, kwargs)
+        return PreparedCall(messages, kwargs, cached, hit)
+
+    def _cache_reads(self, call: PreparedCall, usage: Dict[str, Any]) -> int:
+        return (usage.get('input_token_details') or {}).get('cache_read') or 0
+
+    def record(self, call: PreparedCall, usage: Optional[Dict[str, Any]]) -> Optional[PromptCacheUsage]:
+        """
+        Records the cached and uncached input tokens the provider reported for a call.
+
+        Args:
+            call (PreparedCall): The call as returned by `prepare`.
+            usage (Optional[Dict[str, Any]]): The `usage_metadata` of the response.
+
+        Returns:
+            Optional[PromptCacheUsage]: The split for this call, or None if no usage was reported.
+        """
+        if not usage:
+            return None
+        cached_tokens = min(self._cache_reads(call, usage), usage.get('input_tokens', 0))
+        result = PromptCacheUsage(
+            prefix_key=call.prefix.key if call.prefix else '',
+            cached_tokens=cached_tokens,
+            uncached_tokens=usage.get('input_tokens', 0) - cached_tokens,
+        )
+        with self._lock:
+            self._calls += 1
+            self._hits += 1 if cached_tokens else 0
+            self._cached_tokens += result.cached_tokens
+            self._uncached_tokens += result.uncached_tokens
+        return result
+
+    def metrics(self) -> PromptCacheMetrics:
+        with self._lock:
+            return PromptCacheMetrics(
+                calls=self._calls,
+                hits=self._hits,
+                cached_tokens=self._cached_tokens,
+                uncached_tokens=self._uncached_tokens,
+            )
+
+
+class GeminiContextCache(PromptCache):
+    """
+    Stores prompt prefixes as Gemini cached contents.
+
+    The system instruction and tool definitions move into the cached content, and
+    requests refer to it through `cached_content` instead of resending them. Gemini
+    only caches prefixes above a model-specific minimum size, so smaller prefixes
+    are sent as usual.
+    """
+
+    def __init__(self, ttl_seconds: float = 600.0, min_tokens: int = 1024):
+        super().__init__(ttl_seconds, min_tokens)
+        self._client = None
+
+    def _cache_client(self, model: BaseChatModel):
+        from google.ai.generativelanguage_v1beta import CacheServiceClient
+
+        if self._client is None:
+            credentials = getattr(model, 'credentials', None)
+            if credentials:
+                self._client = CacheServiceClient(credentials=credentials)
+            else:
+                api_key = model.google_api_key.get_secret_value() if model.google_api_key else None
+                self._client = CacheServiceClient(client_options={'api_key': api_key})
+        return self._client
+
+    def _create(self, model: BaseChatModel, key: str, prefix: List[BaseMessage], kwargs: Dict[str, Any]) -> Optional[str]:
+        from google.ai.generativelanguage_v1beta import CachedContent
+        from google.protobuf.duration_pb2 import Duration
+
+        # Let the model format the prefix exactly as it would in a regular request.
+        request = model._prepare_request(
+            prefix,
+            **{name: kwargs[name] for name in _PREFIX_KWARGS if kwargs.get(name) is not None}
+        )
+        cached_content = self._cache_client(model).create_cached_content(
+            cached_content=CachedContent(
+                model=request.model,
+                display_name=f"prefix-{key[:12]}",
+                system_instruction=request.system_instruction,
+                tools=request.tools,
+                tool_config=request.tool_config,
+                # Outlive the local entry, so a handle is never used after the provider dropped it.
+                ttl=Duration(seconds=int(self.ttl_seconds) + 60),
+            )
+        )
+        return cached_content.name
+
+    def _attach(self, handle: str, prefix: List[BaseMessage], rest: List[BaseMessage], kwargs: Dict[str, Any]) -> Tuple[List[BaseMessage], Dict[str, Any]]:
+        kwargs = {name: value for name, value in kwargs.items() if name not in _PREFIX_KWARGS}
+        kwargs['cached_content'] = handle
+        # A request that uses cached content cannot set its own system instruction, so
+        # system messages of the tail (e.g. a conversation summary) are sent as user turns.
+        rest = [HumanMessage(message.content) if isinstance(message, SystemMessage) else message for message in rest]
+        return rest, kwargs
+
+
+class LocalPrefixCache(PromptCache):
+    """
+    A stand-in for provider-side caching that goes through the same lookup, expiry
+    and accounting as GeminiContextCache, for models without context caching.
+
+    Requests are sent unchanged. When the provider reports no cache reads, a reused
+    prefix is counted as cached using its estimated size.
+    """
+
+    def _create(self, model: BaseChatModel, key: str, prefix: List[BaseMessage], kwargs: Dict[str, Any]) -> Optional[str]:
+        return f"local/{key}"
+
+    def _attach(self, handle: str, prefix: List[BaseMessage], rest: List[BaseMessage], kwargs: Dict[str, Any]) -> Tuple[List[BaseMessage], Dict[str, Any]]:
+        return prefix + rest, kwargs
+
+    def _cache_reads(self, call: PreparedCall, usage: Dict[str, Any]) -> int:
+        reported = super()._cache_reads(call, usage)
+        if reported or not call.hit:
+            return reported
+        return call.prefix.tokens
@@ -1,27 +1,227 @@
+import asyncio
+import json
 import time
-from typing import Any, List, Mapping, Optional
-# Removed datetime, timedelta as proactive rate limiting is removed
-# from datetime import datetime, timedelta
+from dataclasses import asdict
+from typing import Any, AsyncIterator, Iterator, List, Mapping, Optional
 
-from langchain_core.callbacks.manager import CallbackManagerForLLMRun
+from langchain_core.callbacks.manager import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import LanguageModelInput
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.messages import BaseMessage
-from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, message_chunk_to_message
+from langchain_core.messages.ai import UsageMetadata, add_usage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
+
+from pydantic import Field
+
+from multi_agent_functions.v1.llm.prompt_cache import PreparedCall, PromptCache, PromptCacheMetrics
+from multi_agent_functions.v1.llm.response_cache import ResponseCache, ResponseCacheMetrics
+from multi_agent_functions.v1.llm.rate_limiter import RateLimiterMetrics, Reservation, SlidingWindowRateLimiter, record_wait
+from multi_agent_functions.v1.llm.retry_policy import RetryPolicy
+
+class StreamDivergedError(RuntimeError):
+    """
+    Raised when a stream replayed after a mid-stream failure does not start with
+    what was already handed to the caller (e.g. sampling at temperature > 0 produced
+    a different completion), so it cannot be resumed without garbling the output.
+    """
+
+
+def _tool_call_key(chunk: Mapping[str, Any]) -> tuple:
+    # Tool call ids are generated per response, so only the call itself is compared.
+    return chunk.get('index'), chunk.get('name'), chunk.get('args')
+
+
+class _EmittedChunks:
+    """
+    Records what a streamed response has already handed to the caller, so a
+    replayed stream can be checked against it and fast-forwarded past it.
+    """
+
+    def __init__(self):
+        self.text: List[str] = []
+        self.tool_call_chunks: List[tuple] = []
+
+    def record(self, chunk: ChatGenerationChunk) -> None:
+        if isinstance(chunk.message.content, str):
+            self.text.append(chunk.message.content)
+        self.tool_call_chunks.extend(_tool_call_key(call) for call in getattr(chunk.message, 'tool_call_chunks', None) or [])
+
+    def replay(self) -> "_Replay":
+        return _Replay(''.join(self.text), list(self.tool_call_chunks))
+
+
+class _Replay:
+    def __init__(self, text: str, tool_call_chunks: List[tuple]):
+        self.text = text
+        self.tool_call_chunks = tool_call_chunks
+
+    def skip(self, chunk: ChatGenerationChunk) -> Optional[ChatGenerationChunk]:
+        """
+        Trims the part of `chunk` that was already emitted before the failure,
+        after checking that the replayed stream reproduces it.
+
+        Returns:
+            Optional[ChatGenerationChunk]: The remainder of the chunk, or None if nothing new is left.
+
+        Raises:
+            StreamDivergedError: If the replayed stream differs from what was emitted.
+        """
+        if not self.text and not self.tool_call_chunks:
+            return chunk
+        message = chunk.message
+        content = message.content
+        if self.text and isinstance(content, str) and content:
+            replayed = content[:len(self.text)]
+            if not self.text.startswith(replayed):
+                raise StreamDivergedError('The replayed stream differs from the text already emitted')
+            self.text = self.text[len(replayed):]
+            content = content[len(replayed):]
+        tool_call_chunks = list(getattr(message, 'tool_call_chunks', None) or [])
+        if self.tool_call_chunks and tool_call_chunks:
+            dropped = min(len(self.tool_call_chunks), len(tool_call_chunks))
+            if [_tool_call_key(call) for call in tool_call_chunks[:dropped]] != self.tool_call_chunks[:dropped]:
+                raise StreamDivergedError('The replayed stream differs from the tool calls already emitted')
+            self.tool_call_chunks = self.tool_call_chunks[dropped:]
+            tool_call_chunks = tool_call_chunks[dropped:]
+        if (self.text or self.tool_call_chunks) and (content or tool_call_chunks):
+            # New output before the emitted prefix was fully reproduced.
+            raise StreamDivergedError('The replayed stream differs from the output already emitted')
+        if not content and not tool_call_chunks:
+            return None
+        update = {'content': content}
+        if isinstance(message, AIMessageChunk):
+            update['tool_call_chunks'] = tool_call_chunks
+        return ChatGenerationChunk(
+            message=message.model_copy(update=update),
+            generation_info=chunk.generation_info,
+        )
+
+    def finish(self) -> None:
+        """
+        Checks, once the replayed stream has ended, that it reproduced everything emitted before.
+
+        Raises:
+            StreamDivergedError: If the replayed stream ended early.
+        """
+        if self.text or self.tool_call_chunks:
+            raise StreamDivergedError('The replayed stream ended before reproducing the output already emitted')
+
+
+def _cached_chunk(result: ChatResult) -> ChatGenerationChunk:
+    """
+    Turns a cached response into a single stream chunk.
+    """
+    message: AIMessage = result.generations[0].message
+    return ChatGenerationChunk(
+        message=AIMessageChunk(
+            content=message.content,
+            id=message.id,
+            tool_call_chunks=[
+                {'name': call['name'], 'args': json.dumps(call['args']), 'id': call['id'], 'index': index}
+                for index, call in enumerate(getattr(message, 'tool_calls', None) or [])
+            ],
+            usage_metadata=getattr(message, 'usage_metadata', None),
+            response_metadata=message.response_metadata,
+        ),
+        generation_info=result.generations[0].generation_info,
+    )
 
-# Import the specific exceptions to catch
-from google.api_core.exceptions import InternalServerError, ResourceExhausted, GoogleAPICallError
 
 class RateLimitedModel(BaseChatModel):
-    """A wrapper around a chat model that adds a delay after InternalServerError."""
+    """
+    A wrapper around a chat model that paces calls against a requests-per-minute and
+    tokens-per-minute budget, and retries transient errors with jittered exponential
+    backoff that honors the retry delay returned by the server.
+
+    The limiter lives on the wrapper, so every agent compiled from the same
+    RateLimitedModel (including tool-bound and structured-output variants) draws
+    from one shared budget.
+
+    With a `prompt_cache`, the static prefix of each prompt (system prompt and tool
+    definitions) is served from the provider's context cache, and the cached and
+    uncached input tokens of every call are reported in the response metadata
+    under 'prompt_cache'.
+
+    With a `response_cache`, repeated calls are answered from the cache before they
+    take any budget from the limiter.
+    """
 
     model: BaseChatModel
-    # delay_seconds is no longer used for fixed delay, but keep for potential future use or identification
-    delay_seconds: float = 0 # Default to 0 as fixed delay is removed
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+    limiter: Optional[SlidingWindowRateLimiter] = None
+    retry_policy: RetryPolicy = Field(default_factory=RetryPolicy)
+    prompt_cache: Optional[PromptCache] = None
+    response_cache: Optional[ResponseCache] = None
+
+    def __init__(self, model: BaseChatModel, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None, limiter: Optional[SlidingWindowRateLimiter] = None, **kwargs: Any):
+        if limiter is None and (requests_per_minute is not None or tokens_per_minute is not None):
+            limiter = SlidingWindowRateLimiter(requests_per_minute, tokens_per_minute)
+        super().__init__(
+            model=model,
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+            limiter=limiter,
+            **kwargs
+        )
+
+    @property
+    def metrics(self) -> Optional[RateLimiterMetrics]:
+        """Current budget, queue depth and wait-time metrics of the shared limiter."""
+        return self.limiter.metrics() if self.limiter else None
+
+    @property
+    def prompt_cache_metrics(self) -> Optional[PromptCacheMetrics]:
+        """Cached versus uncached input tokens across all calls."""
+        return self.prompt_cache.metrics() if self.prompt_cache else None
+
+    @property
+    def response_cache_metrics(self) -> Optional[ResponseCacheMetrics]:
+        """Hit rate and per-tier hits of the response cache."""
+        return self.response_cache.metrics() if self.response_cache else None
+
+    def _response_cache_key(self, messages: List[BaseMessage], stop: Optional[List[str]], kwargs: Any) -> Optional[str]:
+        if self.response_cache is None:
+            return None
+        return self.response_cache.key(dict(self._identifying_params), messages, stop, kwargs)
+
+    def _prepare(self, messages: List[BaseMessage], kwargs: Any) -> PreparedCall:
+        if self.prompt_cache is None:
+            return PreparedCall(messages, kwargs, None, False)
+        return self.prompt_cache.prepare(self.model, messages, kwargs)
 
-    def __init__(self, model: BaseChatModel, delay_seconds: float = 0, **kwargs: Any):
-        super().__init__(model=model, delay_seconds=delay_seconds, **kwargs)
-        # request_timestamps and _wait_for_rate_limit are removed
+    @staticmethod
+    def _streamed_result(streamed: ChatGenerationChunk) -> ChatResult:
+        return ChatResult(generations=[
+            ChatGeneration(message=message_chunk_to_message(streamed.message), generation_info=streamed.generation_info)
+        ])
 
+    def _record_cache_usage(self, call: PreparedCall, result: ChatResult) -> None:
+        if self.prompt_cache is None or not result.generations:
+            return
+        message = result.generations[0].message
+        usage = self.prompt_cache.record(call, getattr(message, 'usage_metadata', None))
+        if usage is not None:
+            message.response_metadata['prompt_cache'] = asdict(usage)
+
+    def _reserve(self, messages: List[BaseMessage]) -> Optional[Reservation]:
+        if self.limiter is None:
+            return None
+        return self.limiter.acquire_budget(count_tokens_approximately(messages))
+
+    async def _areserve(self, messages: List[BaseMessage]) -> Optional[Reservation]:
+        if self.limiter is None:
+            return None
+        return await self.limiter.aacquire_budget(count_tokens_approximately(messages))
+
+    def _reconcile(self, reservation: Optional[Reservation], result: ChatResult) -> None:
+        if reservation is None or not result.generations:
+            return
+        usage = getattr(result.generations[0].message, 'usage_metadata', None)
+        if usage:
+            self.limiter.reconcile(reservation, usage['total_tokens'])
 
 
     def _generate(
@@ -29,55 +229,174 @@ class RateLimitedModel(BaseChatModel):
         messages: List[BaseMessage],
         stop: Optional[List[str]] = None,
         run_manager: CallbackManagerForLLMRun | None = None,
-        count=0,
         **kwargs: Any,
     ) -> ChatResult:
-        """Generate chat response with a delay after InternalServerError."""
-        try:
-            return self.model._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
-        except GoogleAPICallError as e:
-            print("BARE", e.message)
-            if 'retry_daly' not in e.message:
-                raise e
-            print(f"API error encountered: {e.message[:40]}. Sleeping for 60 seconds before re-raising.")
-            time.sleep(60) # Sleep for 1 minute
-            if count >= 3:
-                raise e
-            return self._generate(
-            messages, 
-            stop=stop, 
-            run_manager=run_manager, 
-            count=count+1,
-            **kwargs
-            )
-
+        """Generate chat response, retrying transient errors according to the retry policy."""
+        cache_key = self._response_cache_key(messages, stop, kwargs)
+        if cache_key is not None and (cached := self.response_cache.lookup(cache_key)) is not None:
+            return cached
+        started = time.monotonic()
+        attempt = 0
+        call = self._prepare(messages, kwargs)
+        while True:
+            attempt += 1
+            reservation = self._reserve(messages)
+            try:
+                result = self.model._generate(call.messages, stop=stop, run_manager=run_manager, **call.kwargs)
+            except Exception as e:
+                delay = self.retry_policy.retry_delay(attempt, e, started)
+                if delay is None:
+                    raise
+                print(f"API error encountered: {str(e)[:80]}. Retrying in {delay:.1f} seconds (attempt {attempt}).")
+                record_wait(delay)
+                time.sleep(delay)
+                continue
+            self._reconcile(reservation, result)
+            self._record_cache_usage(call, result)
+            if cache_key is not None:
+                self.response_cache.store(cache_key, result)
+            return result
 
     def _stream(
         self,
         messages: List[BaseMessage],
         stop: Optional[List[str]] = None,
         run_manager: CallbackManagerForLLMRun | None = None,
-        count=0,
         **kwargs: Any,
-    ) -> Any:
-        """Stream chat response with a delay after InternalServerError."""
-        try:
-            return self.model._stream(messages, stop=stop, run_manager=run_manager, **kwargs)
-        except GoogleAPICallError as e:
-            if 'retry_daly' not in e.message:
-                raise e
-            print(f"API error encountered: {e.message[:40]}. Sleeping for 60 seconds before re-raising.")
-            time.sleep(60) # Sleep for 1 minute
-            if count >= 3:
-                raise e
-            return self._stream(
-            messages, 
-            stop=stop, 
-            run_manager=run_manager, 
-            count=count+1,
-            **kwargs
-            )
+    ) -> Iterator[ChatGenerationChunk]:
+        """
+        Stream chat response chunks as the wrapped model produces them.
 
+        Errors raised while iterating go through the retry policy as well. The
+        request is then replayed and everything up to what was already yielded is
+        skipped, so callers never see a chunk twice. If the replayed response does
+        not reproduce that prefix, StreamDivergedError is raised instead of
+        splicing two different completions together.
+        """
+        cache_key = self._response_cache_key(messages, stop, kwargs)
+        if cache_key is not None and (cached := self.response_cache.lookup(cache_key)) is not None:
+            yield _cached_chunk(cached)
+            return
+        started = time.monotonic()
+        attempt = 0
+        emitted = _EmittedChunks()
+        streamed: Optional[ChatGenerationChunk] = None
+        call = self._prepare(messages, kwargs)
+        while True:
+            attempt += 1
+            reservation = self._reserve(messages)
+            replay = emitted.replay()
+            usage_total: Optional[UsageMetadata] = None
+            try:
+                for chunk in self.model._stream(call.messages, stop=stop, **call.kwargs):
+                    usage = getattr(chunk.message, 'usage_metadata', None)
+                    if usage:
+                        usage_total = add_usage(usage_total, usage)
+                    chunk = replay.skip(chunk)
+                    if chunk is None:
+                        continue
+                    emitted.record(chunk)
+                    streamed = chunk if streamed is None else streamed + chunk
+                    yield chunk
+                replay.finish()
+            except Exception as e:
+                delay = self.retry_policy.retry_delay(attempt, e, started)
+                if delay is None:
+                    raise
+                print(f"API error encountered mid-stream: {str(e)[:80]}. Resuming in {delay:.1f} seconds (attempt {attempt}).")
+                record_wait(delay)
+                time.sleep(delay)
+                continue
+            if reservation is not None and usage_total:
+                self.limiter.reconcile(reservation, usage_total['total_tokens'])
+            if self.prompt_cache is not None:
+                self.prompt_cache.record(call, usage_total)
+            if cache_key is not None and streamed is not None:
+                self.response_cache.store(cache_key, self._streamed_result(streamed))
+            return
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """Async counterpart of `_generate`; waits for budget and backoff without blocking the event loop."""
+        cache_key = self._response_cache_key(messages, stop, kwargs)
+        if cache_key is not None and (cached := await asyncio.to_thread(self.response_cache.lookup, cache_key)) is not None:
+            return cached
+        started = time.monotonic()
+        attempt = 0
+        call = await asyncio.to_thread(self._prepare, messages, kwargs)
+        while True:
+            attempt += 1
+            reservation = await self._areserve(messages)
+            try:
+                result = await self.model._agenerate(call.messages, stop=stop, run_manager=run_manager, **call.kwargs)
+            except Exception as e:
+                delay = self.retry_policy.retry_delay(attempt, e, started)
+                if delay is None:
+                    raise
+                print(f"API error encountered: {str(e)[:80]}. Retrying in {delay:.1f} seconds (attempt {attempt}).")
+                record_wait(delay)
+                await asyncio.sleep(delay)
+                continue
+            self._reconcile(reservation, result)
+            self._record_cache_usage(call, result)
+            if cache_key is not None:
+                await asyncio.to_thread(self.response_cache.store, cache_key, result)
+            return result
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        """Async counterpart of `_stream`, with the same resume-without-duplicates behaviour."""
+        cache_key = self._response_cache_key(messages, stop, kwargs)
+        if cache_key is not None and (cached := await asyncio.to_thread(self.response_cache.lookup, cache_key)) is not None:
+            yield _cached_chunk(cached)
+            return
+        started = time.monotonic()
+        attempt = 0
+        emitted = _EmittedChunks()
+        streamed: Optional[ChatGenerationChunk] = None
+        call = await asyncio.to_thread(self._prepare, messages, kwargs)
+        while True:
+            attempt += 1
+            reservation = await self._areserve(messages)
+            replay = emitted.replay()
+            usage_total: Optional[UsageMetadata] = None
+            try:
+                async for chunk in self.model._astream(call.messages, stop=stop, **call.kwargs):
+                    usage = getattr(chunk.message, 'usage_metadata', None)
+                    if usage:
+                        usage_total = add_usage(usage_total, usage)
+                    chunk = replay.skip(chunk)
+                    if chunk is None:
+                        continue
+                    emitted.record(chunk)
+                    streamed = chunk if streamed is None else streamed + chunk
+                    yield chunk
+                replay.finish()
+            except Exception as e:
+                delay = self.retry_policy.retry_delay(attempt, e, started)
+                if delay is None:
+                    raise
+                print(f"API error encountered mid-stream: {str(e)[:80]}. Resuming in {delay:.1f} seconds (attempt {attempt}).")
+                record_wait(delay)
+                await asyncio.sleep(delay)
+                continue
+            if reservation is not None and usage_total:
+                self.limiter.reconcile(reservation, usage_total['total_tokens'])
+            if self.prompt_cache is not None:
+                self.prompt_cache.record(call, usage_total)
+            if cache_key is not None and streamed is not None:
+                await asyncio.to_thread(self.response_cache.store, cache_key, self._streamed_result(streamed))
+            return
 
     @property
     def _llm_type(self) -> str:
@@ -87,9 +406,16 @@ class RateLimitedModel(BaseChatModel):
     def _identifying_params(self) -> Mapping[str, Any]:
         return {
             "model": self.model._identifying_params,
-            "delay_seconds": self.delay_seconds, # Keep for identification
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
         }
 
-    def bind_tools(self, tools: List, **kwargs: Any) -> BaseChatModel:
-        """Bind tools to the model."""
-        return self.model.bind_tools(tools, **kwargs)
+    def bind_tools(self, tools: List, **kwargs: Any) -> Runnable[LanguageModelInput, BaseMessage]:
+        """
+        Bind tools to the model.
+
+        The wrapped model formats the tools, but the binding is re-targeted at this
+        wrapper so tool-calling requests still go through the shared limiter.
+        """
+        binding = self.model.bind_tools(tools, **kwargs)
+        return self.bind(**binding.kwargs)
@@ -0,0 +1,283 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Deque, Iterator, Optional, Tuple
+
+from langchain_core.rate_limiters import BaseRateLimiter
+
+
+@dataclass(frozen=True)
+class RateLimiterMetrics:
+    requests_remaining: Optional[int]
+    tokens_remaining: Optional[int]
+    queue_depth: int
+    total_requests: int
+    total_waits: int
+    total_wait_seconds: float
+    max_wait_seconds: float
+    last_wait_seconds: float
+
+
+class WaitTracker:
+    """
+    Accumulates the time spent waiting on quota (limiter admission and retry
+    backoff) by everything running inside a `track_waits()` block, including
+    worker threads that inherited the context.
+    """
+
+    def __init__(self):
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self.waited += seconds
+
+
+_wait_tracker: ContextVar[Optional[WaitTracker]] = ContextVar('wait_tracker', default=None)
+
+
+@contextmanager
+def track_waits() -> Iterator[WaitTracker]:
+    """
+    Collects the quota waits of the enclosed block into a fresh WaitTracker.
+    """
+    tracker = WaitTracker()
+    token = _wait_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _wait_tracker.reset(token)
+
+
+def record_wait(seconds: float) -> None:
+    """
+    Adds `seconds` to the active WaitTracker, if any.
+    """
+    tracker = _wait_tracker.get()
+    if tracker is not None and seconds > 0:
+        tracker.add(seconds)
+
+
+class Reservation:
+    """
+    A slot taken from the sliding window. The token estimate can be corrected
+    once the real usage is known via `SlidingWindowRateLimiter.reconcile`.
+    """
+    __slots__ = ('timestamp', 'tokens')
+
+    def __init__(self, timestamp: float, tokens: int):
+        self.timestamp = timestamp
+        self.tokens = tokens
+
+
+class SlidingWindowRateLimiter(BaseRateLimiter):
+    """
+    A proactive rate limiter enforcing requests-per-minute and tokens-per-minute
+    budgets over a sliding window.
+
+    A single instance is meant to be shared by every caller drawing from the same
+    quota, so that callers wait just long enough to stay under the ceiling instead
+    of tripping the provider's 429 handling.
+    """
+
+    def __init__(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None, window_seconds: float = 60.0):
+        """
+        Args:
+            requests_per_minute (Optional[int]): Maximum requests admitted per window. None disables the request budget.
+            tokens_per_minute (Optional[int]): Maximum tokens admitted per window. None disables the token budget.
+            window_seconds (float): Length of the sliding window in seconds.
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.window_seconds = window_seconds
+        self._window: Deque[Reservation] = deque()
+        self._condition = threading.Condition()
+        self._queue_depth = 0
+        self._total_requests = 0
+        self._total_waits = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._last_wait_seconds = 0.0
+
+    def _evict(self, now: float) -> None:
+        while self._window and self._window[0].timestamp + self.window_seconds <= now:
+            self._window.popleft()
+
+    def _tokens_used(self) -> int:
+        return sum(reservation.tokens for reservation in self._window)
+
+    def _clamp(self, tokens: int) -> int:
+        # A single request larger than the whole budget could otherwise never be admitted.
+        if self.tokens_per_minute is not None:
+            return min(tokens, self.tokens_per_minute)
+        return tokens
+
+    def _time_until_available(self, tokens: int, now: float) -> float:
+        """
+        Returns how long a request of `tokens` tokens has to wait before it fits
+        in both budgets. Must be called with the condition held.
+        """
+        self._evict(now)
+        wait = 0.0
+        if self.requests_per_minute is not None and len(self._window) >= self.requests_per_minute:
+            oldest = self._window[len(self._window) - self.requests_per_minute]
+            wait = max(wait, oldest.timestamp + self.window_seconds - now)
+        if self.tokens_per_minute is not None:
+            excess = self._tokens_used() + tokens - self.tokens_per_minute
+            if excess > 0:
+                for reservation in self._window:
+                    excess -= reservation.tokens
+                    if excess <= 0:
+                        wait = max(wait, reservation.timestamp + self.window_seconds - now)
+                        break
+        return wait
+
+    def _admit(self, tokens: int, now: float, waited: float) -> Reservation:
+        reservation = Reservation(now, tokens)
+        self._window.append(reservation)
+        self._total_requests += 1
+        if waited > 0:
+            self._total_waits += 1
+            self._total_wait_seconds += waited
+            self._max_wait_seconds = max(self._max_wait_seconds, waited)
+        self._last_wait_seconds = waited
+        return reservation
+
+    def _wait(self, tokens: int, blocking: bool, reserve: bool) -> Tuple[Optional[Reservation], float]:
+        tokens = self._clamp(tokens)
+        started = time.monotonic()
+        queued = False
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                wait = self._time_until_available(tokens, now)
+                if wait <= 0:
+                    waited = now - started if queued else 0.0
+                    if not reserve:
+                        return None, waited
+                    record_wait(waited)
+                    return self._admit(tokens, now, waited), waited
+                if not blocking:
+                    return None, 0.0
+                queued = True
+                self._queue_depth += 1
+                try:
+                    self._condition.wait(timeout=wait)
+                finally:
+                    self._queue_depth -= 1
+
+    async def _await(self, tokens: int, blocking: bool, reserve: bool) -> Tuple[Optional[Reservation], float]:
+        tokens = self._clamp(tokens)
+        started = time.monotonic()
+        queued = False
+        try:
+            while True:
+                with self._condition:
+                    now = time.monotonic()
+                    wait = self._time_until_available(tokens, now)
+                    if wait <= 0:
+                        waited = now - started if queued else 0.0
+                        if not reserve:
+                            return None, waited
+                        record_wait(waited)
+                        return self._admit(tokens, now, waited), waited
+                    if not blocking:
+                        return None, 0.0
+                    if not queued:
+                        self._queue_depth += 1
+                        queued = True
+                await asyncio.sleep(wait)
+        finally:
+            if queued:
+                with self._condition:
+                    self._queue_depth -= 1
+
+    def acquire_budget(self, tokens: int = 0, blocking: bool = True) -> Optional[Reservation]:
+        """
+        Takes one request and `tokens` tokens from the budget, waiting until both fit.
+
+        Args:
+            tokens (int): Estimated number of tokens the request will consume.
+            blocking (bool): If False, return None immediately instead of waiting.
+
+        Returns:
+            Optional[Reservation]: The reservation, or None if not blocking and no budget was available.
+        """
+        return self._wait(tokens, blocking, reserve=True)[0]
+
+    async def aacquire_budget(self, tokens: int = 0, blocking: bool = True) -> Optional[Reservation]:
+        """
+        Async counterpart of `acquire_budget`; waits on the event loop instead of blocking the thread.
+
+        Args:
+            tokens (int): Estimated number of tokens the request will consume.
+            blocking (bool): If False, return None immediately instead of waiting.
+
+        Returns:
+            Optional[Reservation]: The reservation, or None if not blocking and no budget was available.
+        """
+        return (await self._await(tokens, blocking, reserve=True))[0]
+
+    def wait_for_budget(self, tokens: int = 0) -> float:
+        """
+        Blocks until a request of `tokens` tokens would be admitted, without taking any budget.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        return self._wait(tokens, blocking=True, reserve=False)[1]
+
+    async def await_for_budget(self, tokens: int = 0) -> float:
+        """
+        Async counterpart of `wait_for_budget`.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        return (await self._await(tokens, blocking=True, reserve=False))[1]
+
+    def reconcile(self, reservation: Reservation, actual_tokens: int) -> None:
+        """
+        Replaces a reservation's token estimate with the usage reported by the provider.
+
+        Args:
+            reservation (Reservation): The reservation returned by `acquire_budget`.
+            actual_tokens (int): Tokens the request actually consumed.
+        """
+        with self._condition:
+            reservation.tokens = actual_tokens
+            self._condition.notify_all()
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        return self.acquire_budget(0, blocking=blocking) is not None
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        return await self.aacquire_budget(0, blocking=blocking) is not None
+
+    def metrics(self) -> RateLimiterMetrics:
+        """
+        Returns a snapshot of the remaining budget, queue depth and wait-time counters.
+        """
+        with self._condition:
+            self._evict(time.monotonic())
+            requests_remaining = None
+            if self.requests_per_minute is not None:
+                requests_remaining = max(self.requests_per_minute - len(self._window), 0)
+            tokens_remaining = None
+            if self.tokens_per_minute is not None:
+                tokens_remaining = max(self.tokens_per_minute - self._tokens_used(), 0)
+            return RateLimiterMetrics(
+                requests_remaining=requests_remaining,
+                tokens_remaining=tokens_remaining,
+                queue_depth=self._queue_depth,
+                total_requests=self._total_requests,
+                total_waits=self._total_waits,
+                total_wait_seconds=self._total_wait_seconds,
+                max_wait_seconds=self._max_wait_seconds,
+                last_wait_seconds=self._last_wait_seconds,
+            )
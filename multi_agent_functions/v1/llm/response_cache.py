@@ -0,0 +1,313 @@
+import hashlib
+import json
+import re
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage, HumanMessage, messages_from_dict, messages_to_dict
+from langchain_core.outputs import ChatGeneration, ChatResult
+from sqlalchemy import Column, Engine, Float, MetaData, String, Table, Text, create_engine, delete, select
+
+from multi_agent_functions.v1.intent import MUTATING_INTENT
+
+# Requests that change Google Tasks or Calendar (see MUTATING_INTENT) must always reach the model.
+MUTATING_TOOL = re.compile(r'(insert|delete|patch|update|move|clear|import|quick_add|watch)')
+
+_bypass: ContextVar[bool] = ContextVar('response_cache_bypass', default=False)
+
+
+@contextmanager
+def bypass_response_cache() -> Iterator[None]:
+    """
+    Sends every model call made inside the block to the model, neither reading nor writing the cache.
+    """
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def _normalize_text(content: Any) -> Any:
+    if isinstance(content, str):
+        return ' '.join(content.split())
+    return content
+
+
+def normalize_messages(messages: Sequence[BaseMessage]) -> List[Dict[str, Any]]:
+    """
+    Reduces messages to what determines the model's answer. Ids, metadata and
+    whitespace differences do not affect the cache key.
+    """
+    normalized = []
+    for message in messages:
+        entry = {'type': message.type, 'content': _normalize_text(message.content)}
+        if message.name:
+            entry['name'] = message.name
+        tool_calls = getattr(message, 'tool_calls', None)
+        if tool_calls:
+            entry['tool_calls'] = [{'name': call['name'], 'args': call['args']} for call in tool_calls]
+        tool_call_id = getattr(message, 'tool_call_id', None)
+        if tool_call_id:
+            entry['tool_call_id'] = tool_call_id
+        normalized.append(entry)
+    return normalized
+
+
+def response_cache_key(model_params: Dict[str, Any], messages: Sequence[BaseMessage], stop: Optional[List[str]], kwargs: Dict[str, Any]) -> str:
+    """
+    Builds the cache key of a call from the model parameters, the normalized messages
+    and the call arguments, which include the bound tool set.
+    """
+    payload = {
+        'model': model_params,
+        'messages': normalize_messages(messages),
+        'stop': stop,
+        'kwargs': kwargs,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def is_mutating_request(messages: Sequence[BaseMessage]) -> bool:
+    for message in messages:
+        if isinstance(message, HumanMessage) and isinstance(message.content, str) and MUTATING_INTENT.search(message.content):
+            return True
+        for call in getattr(message, 'tool_calls', None) or []:
+            if MUTATING_TOOL.search(call['name']):
+                return True
+    return False
+
+
+def is_mutating_response(result: ChatResult) -> bool:
+    for generation in result.generations:
+        for call in getattr(generation.message, 'tool_calls', None) or []:
+            if MUTATING_TOOL.search(call['name']):
+                return True
+    return False
+
+
+def _copy_result(result: ChatResult) -> ChatResult:
+    return ChatResult(
+        generations=[
+            ChatGeneration(message=generation.message.model_copy(deep=True), generation_info=generation.generation_info)
+            for generation in result.generations
+        ],
+        llm_output=result.llm_output,
+    )
+
+
+@dataclass(frozen=True)
+class ResponseCacheMetrics:
+    lookups: int
+    hits: int
+    misses: int
+    bypassed: int
+    stores: int
+    tier_hits: Tuple[int, ...]
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+class ResponseCacheTier(ABC):
+    """
+    A single storage tier. Entries expire at an absolute `time.time()` timestamp.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Tuple[ChatResult, float]]:
+        """
+        Returns:
+            Optional[Tuple[ChatResult, float]]: The cached response and its expiry, or None on a miss.
+        """
+
+    @abstractmethod
+    def set(self, key: str, result: ChatResult, expires_at: float) -> None:
+        """
+        Stores a response until `expires_at`.
+        """
+
+
+class LRUResponseCache(ResponseCacheTier):
+    """
+    In-memory tier holding the most recently used responses.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        """
+        Args:
+            max_entries (int): Number of responses kept before the least recently used is evicted.
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[ChatResult, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[ChatResult, float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            result, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return _copy_result(result), expires_at
+
+    def set(self, key: str, result: ChatResult, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (_copy_result(result), expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_metadata = MetaData()
+
+_responses_table = Table(
+    'response_cache',
+    _metadata,
+    Column('key', String, primary_key=True),
+    Column('result', Text, nullable=False),
+    Column('expires_at', Float, nullable=False),
+)
+
+
+class SQLiteResponseCache(ResponseCacheTier):
+    """
+    On-disk tier that survives restarts. Any SQLAlchemy URL works; SQLite is the default.
+    """
+
+    def __init__(self, url: str = 'sqlite:///response_cache.db', engine: Optional[Engine] = None):
+        """
+        Args:
+            url (str): Database URL, used when no engine is given.
+            engine (Optional[Engine]): An existing engine to store responses with.
+        """
+        if engine is None:
+            connect_args = {'check_same_thread': False} if url.startswith('sqlite') else {}
+            engine = create_engine(url, connect_args=connect_args)
+        self.engine = engine
+        _metadata.create_all(self.engine)
+
+    def get(self, key: str) -> Optional[Tuple[ChatResult, float]]:
+        with self.engine.connect() as connection:
+            row = connection.execute(
+                select(_responses_table.c.result, _responses_table.c.expires_at).where(_responses_table.c.key == key)
+            ).first()
+        if row is None:
+            return None
+        if row.expires_at <= time.time():
+            with self.engine.begin() as connection:
+                connection.execute(delete(_responses_table).where(_responses_table.c.key == key))
+            return None
+        messages = messages_from_dict(json.loads(row.result))
+        return ChatResult(generations=[ChatGeneration(message=message) for message in messages]), row.expires_at
+
+    def set(self, key: str, result: ChatResult, expires_at: float) -> None:
+        with self.engine.begin() as connection:
+            connection.execute(delete(_responses_table).where(_responses_table.c.key == key))
+            connection.execute(_responses_table.insert().values(
+                key=key,
+                result=json.dumps(messages_to_dict([generation.message for generation in result.generations])),
+                expires_at=expires_at,
+            ))
+
+    def purge_expired(self) -> None:
+        with self.engine.begin() as connection:
+            connection.execute(delete(_responses_table).where(_responses_table.c.expires_at <= time.time()))
+
+
+class ResponseCache:
+    """
+    Serves repeated model calls from a stack of tiers, checked fastest first.
+    A hit in a slower tier is copied into the faster ones.
+
+    Calls whose history asks to change Tasks or Calendar data, responses that call
+    a mutating tool, and calls made inside `bypass_response_cache()` always go to
+    the model and are never stored.
+    """
+
+    def __init__(self, tiers: Optional[Sequence[ResponseCacheTier]] = None, ttl_seconds: float = 300.0):
+        """
+        Args:
+            tiers (Optional[Sequence[ResponseCacheTier]]): Storage tiers, fastest first. Defaults to an in-memory LRU.
+            ttl_seconds (float): How long a response stays valid.
+        """
+        self.tiers = list(tiers) if tiers is not None else [LRUResponseCache()]
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._lookups = 0
+        self._hits = 0
+        self._bypassed = 0
+        self._stores = 0
+        self._tier_hits = [0] * len(self.tiers)
+
+    @classmethod
+    def tiered(cls, url: str = 'sqlite:///response_cache.db', max_entries: int = 512, ttl_seconds: float = 300.0) -> "ResponseCache":
+        """
+        Creates the usual in-memory LRU in front of an on-disk SQLite tier.
+        """
+        return cls([LRUResponseCache(max_entries), SQLiteResponseCache(url)], ttl_seconds)
+
+    def key(self, model_params: Dict[str, Any], messages: List[BaseMessage], stop: Optional[List[str]], kwargs: Dict[str, Any]) -> Optional[str]:
+        """
+        Returns the cache key of a call, or None if the call must bypass the cache.
+        """
+        if _bypass.get() or is_mutating_request(messages):
+            with self._lock:
+                self._bypassed += 1
+            return None
+        return response_cache_key(model_params, messages, stop, kwargs)
+
+    def lookup(self, key: str) -> Optional[ChatResult]:
+        for index, tier in enumerate(self.tiers):
+            entry = tier.get(key)
+            if entry is None:
+                continue
+            result, expires_at = entry
+            for faster in self.tiers[:index]:
+                faster.set(key, result, expires_at)
+            # A replayed answer is a new message; reusing its ids would clash with the original in the history.
+            for generation in result.generations:
+                generation.message.id = None
+                if getattr(generation.message, 'tool_calls', None):
+                    generation.message.tool_calls = [
+                        {**call, 'id': str(uuid.uuid4())} for call in generation.message.tool_calls
+                    ]
+            with self._lock:
+                self._lookups += 1
+                self._hits += 1
+                self._tier_hits[index] += 1
+            return result
+        with self._lock:
+            self._lookups += 1
+        return None
+
+    def store(self, key: str, result: ChatResult) -> None:
+        if is_mutating_response(result):
+            return
+        expires_at = time.time() + self.ttl_seconds
+        for tier in self.tiers:
+            tier.set(key, result, expires_at)
+        with self._lock:
+            self._stores += 1
+
+    def metrics(self) -> ResponseCacheMetrics:
+        with self._lock:
+            return ResponseCacheMetrics(
+                lookups=self._lookups,
+                hits=self._hits,
+                misses=self._lookups - self._hits,
+                bypassed=self._bypassed,
+                stores=self._stores,
+                tier_hits=tuple(self._tier_hits),
+            )
@@ -0,0 +1,112 @@
+import random
+import re
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple, Type
+
+from google.api_core.exceptions import (
+    DeadlineExceeded,
+    InternalServerError,
+    ResourceExhausted,
+    ServiceUnavailable,
+    TooManyRequests,
+)
+
+_RETRY_DELAY_PATTERN = re.compile(r'retry_delay\s*\{\s*seconds:\s*(\d+)(?:\s*nanos:\s*(\d+))?')
+_RETRY_IN_PATTERN = re.compile(r'retry in\s*([\d.]+)\s*s', re.IGNORECASE)
+
+
+def parse_retry_delay(error: BaseException) -> Optional[float]:
+    """
+    Extracts the retry delay the server attached to an error, if any.
+
+    Gemini quota errors carry a `google.rpc.RetryInfo` detail, which shows up either
+    in `error.details` or rendered into the message as `retry_delay { seconds: N }`.
+
+    Args:
+        error (BaseException): The error raised by the API call.
+
+    Returns:
+        Optional[float]: The delay in seconds requested by the server, or None if none was given.
+    """
+    for detail in getattr(error, 'details', None) or []:
+        retry_delay = getattr(detail, 'retry_delay', None)
+        if retry_delay is not None and hasattr(retry_delay, 'seconds'):
+            return retry_delay.seconds + getattr(retry_delay, 'nanos', 0) / 1e9
+
+    message = getattr(error, 'message', None) or str(error)
+    match = _RETRY_DELAY_PATTERN.search(message)
+    if match:
+        return int(match.group(1)) + int(match.group(2) or 0) / 1e9
+    match = _RETRY_IN_PATTERN.search(message)
+    if match:
+        return float(match.group(1))
+    return None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Capped exponential backoff with jitter that honors server-provided retry delays.
+
+    Args:
+        max_attempts (int): Maximum number of attempts per call, including the first one.
+        base_delay (float): Backoff before the second attempt, in seconds.
+        max_delay (float): Upper bound for a single computed backoff, in seconds.
+        multiplier (float): Growth factor of the backoff between attempts.
+        jitter (float): Fraction of each backoff that is randomized (0 disables jitter, 1 is full jitter).
+        deadline_seconds (Optional[float]): Total time budget for a call including all retries. None disables it.
+        retryable (Tuple[Type[BaseException], ...]): Error types that are worth retrying.
+    """
+    max_attempts: int = 4
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    multiplier: float = 2.0
+    jitter: float = 0.5
+    deadline_seconds: Optional[float] = 120.0
+    retryable: Tuple[Type[BaseException], ...] = (
+        ResourceExhausted,
+        TooManyRequests,
+        InternalServerError,
+        ServiceUnavailable,
+        DeadlineExceeded,
+    )
+
+    def is_retryable(self, error: BaseException) -> bool:
+        return isinstance(error, self.retryable)
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Returns the jittered backoff to apply after the given attempt failed.
+
+        Args:
+            attempt (int): Number of attempts made so far (1 after the first failure).
+        """
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return delay * (1 - self.jitter) + random.uniform(0, delay * self.jitter)
+
+    def retry_delay(self, attempt: int, error: BaseException, started: float) -> Optional[float]:
+        """
+        Decides whether a failed attempt should be retried and how long to wait first.
+
+        A delay requested by the server takes precedence over the computed backoff,
+        with a little jitter added so concurrent callers do not retry in lockstep.
+
+        Args:
+            attempt (int): Number of attempts made so far.
+            error (BaseException): The error raised by the last attempt.
+            started (float): `time.monotonic()` timestamp of the first attempt.
+
+        Returns:
+            Optional[float]: Seconds to sleep before retrying, or None if the error should be raised.
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(error):
+            return None
+        server_delay = parse_retry_delay(error)
+        if server_delay is not None:
+            delay = server_delay + random.uniform(0, self.base_delay * self.jitter)
+        else:
+            delay = self.backoff(attempt)
+        if self.deadline_seconds is not None and time.monotonic() - started + delay > self.deadline_seconds:
+            return None
+        return delay
@@ -1,23 +1,41 @@
 import yaml
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Dict, Optional
 from multi_agent_functions.v2.agent.state import AgentState
+from multi_agent_functions.v2.runnable_registry import RunnableRegistry, default_registry
 from langchain_core.messages import SystemMessage
+from langchain_core.runnables import RunnableConfig
 
 class BaseAgent:
     def __init__(self, name: str, system_prompt: str):
         self.name = name
         self.system_prompt = system_prompt
 
-    def compile(self, model) -> None:
+    def compile(self, model, registry: Optional[RunnableRegistry] = None) -> None:
+        """
+        Args:
+            model: The chat model the agent calls.
+            registry (Optional[RunnableRegistry]): Where runnables derived from the model are built and reused.
+                Defaults to the registry shared by all agents.
+        """
+        self.registry = registry or default_registry
         self.model = model
     
-    def invoke(self, state: AgentState) -> AgentState:
+    def invoke(self, state: AgentState, config: Optional[RunnableConfig] = None) -> AgentState:
         messages = [
             SystemMessage(self.system_prompt)
         ] + state['messages']
 
-        response = self.model.invoke(messages)
+        response = self.model.invoke(messages, config)
+        state['messages'].append(response)
+        return state
+
+    async def ainvoke(self, state: AgentState, config: Optional[RunnableConfig] = None) -> AgentState:
+        messages = [
+            SystemMessage(self.system_prompt)
+        ] + state['messages']
+
+        response = await self.model.ainvoke(messages, config)
         state['messages'].append(response)
         return state
 
@@ -25,6 +43,9 @@ class BaseAgent:
     @classmethod
     def create_agent(cls, name: str, system_prompt: str) -> "BaseAgent":
         match(name):
+            case "enhancer":
+                from .enhancer_agent import EnhancerAgent
+                return EnhancerAgent(name, system_prompt)
             case "google_tasks":
                 from .google_tasks_agent import GoogleTasksAgent
                 return GoogleTasksAgent(name, system_prompt)
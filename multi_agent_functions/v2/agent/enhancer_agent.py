@@ -0,0 +1,41 @@
+from typing import Optional
+
+from langchain_core.messages import AIMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
+
+from multi_agent_functions.v2.agent.base_agent import BaseAgent
+from multi_agent_functions.v2.agent.plan import Plan
+from multi_agent_functions.v2.agent.state import AgentState
+from multi_agent_functions.v2.runnable_registry import RunnableRegistry, default_registry
+
+
+class EnhancerAgent(BaseAgent):
+    """
+    Breaks a request down into a structured Plan that the supervisor graph can
+    execute step by step without asking the LLM to route every hop.
+    """
+
+    def compile(self, model, registry: Optional[RunnableRegistry] = None) -> None:
+        self.registry = registry or default_registry
+        self.model = self.registry.structured_output(model, Plan)
+
+    def _result(self, state: AgentState, plan: Plan) -> AgentState:
+        state['messages'].append(AIMessage(plan.render(), name=self.name))
+        state['plan'] = plan
+        return state
+
+    def invoke(self, state: AgentState, config: Optional[RunnableConfig] = None) -> AgentState:
+        messages = [
+            SystemMessage(self.system_prompt)
+        ] + state['messages']
+
+        plan: Plan = self.model.invoke(messages, config)
+        return self._result(state, plan)
+
+    async def ainvoke(self, state: AgentState, config: Optional[RunnableConfig] = None) -> AgentState:
+        messages = [
+            SystemMessage(self.system_prompt)
+        ] + state['messages']
+
+        plan: Plan = await self.model.ainvoke(messages, config)
+        return self._result(state, plan)
@@ -0,0 +1,70 @@
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class PlanStep(BaseModel):
+    agent: Literal['google_tasks', 'google_calendar'] = Field(
+        description="The worker that handles this step: 'google_tasks' or 'google_calendar'."
+    )
+    task: str = Field(
+        description="A brief description of the task."
+    )
+    details: str = Field(
+        description="Detailed information and parameters the worker needs to carry out the task."
+    )
+    output: Optional[str] = Field(
+        default=None,
+        description="Specific output the worker should return, if later steps or the user need it."
+    )
+    depends_on: List[int] = Field(
+        default_factory=list,
+        description="Numbers (1-based) of earlier steps whose output this step needs. Leave empty if the step can run on its own."
+    )
+
+    def instruction(self, results: Dict[int, str]) -> str:
+        """
+        Renders the step as a self-contained instruction for its worker.
+
+        Args:
+            results (Dict[int, str]): Outputs of completed steps, keyed by step number.
+
+        Returns:
+            str: The instruction, including the outputs of the steps it depends on.
+        """
+        lines = [
+            f"**Task:** {self.task}",
+            f"**Details:** {self.details}",
+        ]
+        if self.output:
+            lines.append(f"**Output:** {self.output}")
+        for number in self.depends_on:
+            if number in results:
+                lines.append(f"**Result of step {number}:** {results[number]}")
+        return '\n'.join(lines)
+
+
+class Plan(BaseModel):
+    steps: List[PlanStep] = Field(
+        default_factory=list,
+        description="The ordered steps needed to satisfy the user's request."
+    )
+
+    def render(self) -> str:
+        """
+        Renders the plan in the enhancer's `**Agent:** / **Task:** / **Details:**` format.
+        """
+        blocks = []
+        for number, step in enumerate(self.steps, start=1):
+            lines = [
+                f"Step {number}:",
+                f"**Agent:** {step.agent}",
+                f"**Task:** {step.task}",
+                f"**Details:** {step.details}",
+            ]
+            if step.output:
+                lines.append(f"**output:** {step.output}")
+            if step.depends_on:
+                lines.append(f"**Depends on:** {', '.join(f'step {n}' for n in step.depends_on)}")
+            blocks.append('\n'.join(lines))
+        return '\n\n'.join(blocks)
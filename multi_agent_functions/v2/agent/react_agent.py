@@ -1,20 +1,51 @@
-from multi_agent_functions.v1.google.tasks.toolkit import GoogleTasksToolkit
+from typing import Optional
+
+from langchain_core.runnables import Runnable
+
 from multi_agent_functions.v2.agent.base_agent import BaseAgent
-from langgraph.prebuilt import create_react_agent
+from multi_agent_functions.v2.runnable_registry import RunnableRegistry, default_registry
 
 class ReactAgent(BaseAgent):
-    def __init__(self, name: str, system_prompt: str, toolkit):
+    def __init__(self, name: str, system_prompt: str, toolkit, select_tools: bool = True):
+        """
+        Args:
+            name (str): The agent's name.
+            system_prompt (str): The agent's prompt.
+            toolkit: Provides the agent's tools and a selector for subsetting them.
+            select_tools (bool): Bind only the tools relevant to each subtask instead of the full toolkit.
+        """
         super().__init__(name, system_prompt)
         self.toolkit = toolkit
+        self.select_tools = select_tools
         self.graph = None
+        self.selector = None
+
+    def compile(self, model, registry: Optional[RunnableRegistry] = None):
+        self.registry = registry or default_registry
+        self.model = model
+        self.selector = self.toolkit.get_tool_selector()
+        self.graph = self._graph(self.selector.tools)
 
-    def compile(self, model):
-        self.graph = create_react_agent(
-            model,
-            tools = self.toolkit.get_tools(),
+    def _graph(self, tools) -> Runnable:
+        return self.registry.react_agent(
+            self.model,
+            tools=tools,
             name=self.name,
             prompt=self.system_prompt
         )
 
-    def invoke(self, state):
-        return self.graph.invoke(state)
\ No newline at end of file
+    def _graph_for(self, state) -> Runnable:
+        """
+        Returns the agent graph bound to the tools the latest instruction needs.
+        Graphs are cached per tool subset, so a repeated subset is not rebuilt.
+        """
+        request = state['messages'][-1].content if state['messages'] else ''
+        if not self.select_tools or not isinstance(request, str):
+            return self.graph
+        return self._graph(self.selector.select(request).tools)
+
+    def invoke(self, state, config=None):
+        return self._graph_for(state).invoke(state, config)
+
+    async def ainvoke(self, state, config=None):
+        return await self._graph_for(state).ainvoke(state, config)
@@ -1,7 +1,28 @@
-from typing import List, Annotated, TypedDict
+import operator
+from typing import Dict, List, Annotated, TypedDict
 from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
 
+from multi_agent_functions.v2.agent.plan import Plan
+from multi_agent_functions.v2.compaction import CompactionReport
+from multi_agent_functions.v2.pacing import TurnTiming
+
+def merge_step_outcomes(left: Dict[int, str], right: Dict[int, str]) -> Dict[int, str]:
+    """Merges the outcomes of concurrently finished plan steps. An empty update starts a new plan."""
+    if not right:
+        return {}
+    return {**left, **right}
+
 class AgentState(TypedDict):
     """Represents the state of the supervisor."""
     messages: Annotated[List[BaseMessage], add_messages]
+
+class SupervisorState(AgentState, total=False):
+    """Supervisor state plus the per-hop latency breakdown, the plan being executed and the history summary."""
+    timings: Annotated[List[TurnTiming], operator.add]
+    plan: Plan
+    step_results: Annotated[Dict[int, str], merge_step_outcomes]
+    step_errors: Annotated[Dict[int, str], merge_step_outcomes]
+    summary: str
+    summarized_count: int
+    compaction: CompactionReport
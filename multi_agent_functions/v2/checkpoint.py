@@ -0,0 +1,442 @@
+import asyncio
+import random
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from sqlalchemy import Column, Engine, Integer, LargeBinary, MetaData, String, Table, create_engine, delete, select
+from sqlalchemy.engine import Connection
+
+_MESSAGE_IDS = 'message_ids:'
+
+metadata_obj = MetaData()
+
+checkpoints_table = Table(
+    'checkpoints',
+    metadata_obj,
+    Column('thread_id', String, primary_key=True),
+    Column('checkpoint_ns', String, primary_key=True),
+    Column('checkpoint_id', String, primary_key=True),
+    Column('parent_checkpoint_id', String, nullable=True),
+    Column('type', String, nullable=False),
+    Column('checkpoint', LargeBinary, nullable=False),
+    Column('metadata_type', String, nullable=False),
+    Column('metadata', LargeBinary, nullable=False),
+)
+
+blobs_table = Table(
+    'checkpoint_blobs',
+    metadata_obj,
+    Column('thread_id', String, primary_key=True),
+    Column('checkpoint_ns', String, primary_key=True),
+    Column('channel', String, primary_key=True),
+    Column('version', String, primary_key=True),
+    Column('type', String, nullable=False),
+    Column('blob', LargeBinary, nullable=True),
+)
+
+writes_table = Table(
+    'checkpoint_writes',
+    metadata_obj,
+    Column('thread_id', String, primary_key=True),
+    Column('checkpoint_ns', String, primary_key=True),
+    Column('checkpoint_id', String, primary_key=True),
+    Column('task_id', String, primary_key=True),
+    Column('idx', Integer, primary_key=True),
+    Column('channel', String, nullable=False),
+    Column('type', String, nullable=False),
+    Column('blob', LargeBinary, nullable=False),
+    Column('task_path', String, nullable=False, default=''),
+)
+
+messages_table = Table(
+    'checkpoint_messages',
+    metadata_obj,
+    Column('thread_id', String, primary_key=True),
+    Column('message_id', String, primary_key=True),
+    Column('type', String, nullable=False),
+    Column('blob', LargeBinary, nullable=False),
+)
+
+
+class SQLAlchemyCheckpointSaver(BaseCheckpointSaver[str]):
+    """
+    A checkpoint saver that persists SupervisorGraph runs in any database
+    SQLAlchemy supports, so conversations survive restarts and interrupted runs
+    resume from the last completed node of their thread.
+
+    Channel values are stored per channel version, so a checkpoint only writes the
+    channels that changed in its step. Message lists are stored as references: each
+    message is written once per thread and the channel blob only holds message ids.
+    Messages are assumed not to change once added, which holds as long as nothing
+    replaces a message by id.
+    """
+
+    def __init__(self, url: str = 'sqlite:///checkpoints.db', engine: Optional[Engine] = None, serde: Optional[SerializerProtocol] = None):
+        """
+        Args:
+            url (str): Database URL, used when no engine is given.
+            engine (Optional[Engine]): An existing engine to store checkpoints with.
+            serde (Optional[SerializerProtocol]): Serializer for checkpoints and channel values.
+        """
+        super().__init__(serde=serde)
+        if engine is None:
+            connect_args = {'check_same_thread': False} if url.startswith('sqlite') else {}
+            engine = create_engine(url, connect_args=connect_args)
+        self.engine = engine
+        metadata_obj.create_all(self.engine)
+
+    @staticmethod
+    def _message_ids(value: Any) -> Optional[List[str]]:
+        if not isinstance(value, list) or not value:
+            return None
+        if not all(isinstance(message, BaseMessage) and message.id for message in value):
+            return None
+        return [message.id for message in value]
+
+    def _dump_channel(self, connection: Connection, thread_id: str, channel_value: Any) -> Tuple[str, bytes]:
+        """
+        Serializes a channel value. Message lists are stored as message ids, and only
+        the messages not yet stored for the thread are written.
+        """
+        ids = self._message_ids(channel_value)
+        if ids is None:
+            return self.serde.dumps_typed(channel_value)
+        stored = set(connection.execute(
+            select(messages_table.c.message_id).where(
+                messages_table.c.thread_id == thread_id,
+                messages_table.c.message_id.in_(ids),
+            )
+        ).scalars())
+        new_messages = []
+        for message in channel_value:
+            if message.id in stored:
+                continue
+            stored.add(message.id)
+            type_, blob = self.serde.dumps_typed(message)
+            new_messages.append({'thread_id': thread_id, 'message_id': message.id, 'type': type_, 'blob': blob})
+        if new_messages:
+            connection.execute(messages_table.insert(), new_messages)
+        type_, blob = self.serde.dumps_typed(ids)
+        return _MESSAGE_IDS + type_, blob
+
+    def _load_channel(self, connection: Connection, thread_id: str, type_: str, blob: bytes) -> Any:
+        if not type_.startswith(_MESSAGE_IDS):
+            return self.serde.loads_typed((type_, blob))
+        ids = self.serde.loads_typed((type_[len(_MESSAGE_IDS):], blob))
+        rows = connection.execute(
+            select(messages_table.c.message_id, messages_table.c.type, messages_table.c.blob).where(
+                messages_table.c.thread_id == thread_id,
+                messages_table.c.message_id.in_(ids),
+            )
+        )
+        messages = {row.message_id: self.serde.loads_typed((row.type, row.blob)) for row in rows}
+        return [messages[message_id] for message_id in ids]
+
+    def _load_blobs(self, connection: Connection, thread_id: str, checkpoint_ns: str, versions: ChannelVersions) -> Dict[str, Any]:
+        channel_values: Dict[str, Any] = {}
+        for channel, version in versions.items():
+            row = connection.execute(
+                select(blobs_table.c.type, blobs_table.c.blob).where(
+                    blobs_table.c.thread_id == thread_id,
+                    blobs_table.c.checkpoint_ns == checkpoint_ns,
+                    blobs_table.c.channel == channel,
+                    blobs_table.c.version == str(version),
+                )
+            ).first()
+            if row is not None and row.type != 'empty':
+                channel_values[channel] = self._load_channel(connection, thread_id, row.type, row.blob)
+        return channel_values
+
+    def _to_tuple(self, connection: Connection, row: Any) -> CheckpointTuple:
+        checkpoint: Checkpoint = self.serde.loads_typed((row.type, row.checkpoint))
+        writes = connection.execute(
+            select(writes_table).where(
+                writes_table.c.thread_id == row.thread_id,
+                writes_table.c.checkpoint_ns == row.checkpoint_ns,
+                writes_table.c.checkpoint_id == row.checkpoint_id,
+            ).order_by(writes_table.c.task_id, writes_table.c.idx)
+        )
+        return CheckpointTuple(
+            config={
+                'configurable': {
+                    'thread_id': row.thread_id,
+                    'checkpoint_ns': row.checkpoint_ns,
+                    'checkpoint_id': row.checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint,
+                'channel_values': self._load_blobs(connection, row.thread_id, row.checkpoint_ns, checkpoint['channel_versions']),
+            },
+            metadata=self.serde.loads_typed((row.metadata_type, row.metadata)),
+            parent_config=(
+                {
+                    'configurable': {
+                        'thread_id': row.thread_id,
+                        'checkpoint_ns': row.checkpoint_ns,
+                        'checkpoint_id': row.parent_checkpoint_id,
+                    }
+                }
+                if row.parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[
+                (write.task_id, write.channel, self.serde.loads_typed((write.type, write.blob)))
+                for write in writes
+            ],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """
+        Fetches the checkpoint named by `config`, or the latest one of its thread.
+
+        Args:
+            config (RunnableConfig): Config with a thread_id and optionally a checkpoint_id.
+
+        Returns:
+            Optional[CheckpointTuple]: The checkpoint, or None if the thread has none.
+        """
+        thread_id = config['configurable']['thread_id']
+        checkpoint_ns = config['configurable'].get('checkpoint_ns', '')
+        query = select(checkpoints_table).where(
+            checkpoints_table.c.thread_id == thread_id,
+            checkpoints_table.c.checkpoint_ns == checkpoint_ns,
+        )
+        if checkpoint_id := get_checkpoint_id(config):
+            query = query.where(checkpoints_table.c.checkpoint_id == checkpoint_id)
+        else:
+            query = query.order_by(checkpoints_table.c.checkpoint_id.desc()).limit(1)
+        with self.engine.connect() as connection:
+            row = connection.execute(query).first()
+            if row is None:
+                return None
+            return self._to_tuple(connection, row)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """
+        Lists checkpoints, newest first.
+
+        Args:
+            config (Optional[RunnableConfig]): Restricts the listing to a thread, namespace or checkpoint.
+            filter (Optional[Dict[str, Any]]): Metadata values the checkpoints must have.
+            before (Optional[RunnableConfig]): Only list checkpoints older than this one.
+            limit (Optional[int]): Maximum number of checkpoints to return.
+        """
+        query = select(checkpoints_table).order_by(checkpoints_table.c.checkpoint_id.desc())
+        if config:
+            query = query.where(checkpoints_table.c.thread_id == config['configurable']['thread_id'])
+            if (checkpoint_ns := config['configurable'].get('checkpoint_ns')) is not None:
+                query = query.where(checkpoints_table.c.checkpoint_ns == checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                query = query.where(checkpoints_table.c.checkpoint_id == checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            query = query.where(checkpoints_table.c.checkpoint_id < before_id)
+
+        with self.engine.connect() as connection:
+            rows = connection.execute(query).all()
+            for row in rows:
+                if limit is not None and limit <= 0:
+                    break
+                if filter:
+                    metadata = self.serde.loads_typed((row.metadata_type, row.metadata))
+                    if not all(metadata.get(key) == value for key, value in filter.items()):
+                        continue
+                if limit is not None:
+                    limit -= 1
+                yield self._to_tuple(connection, row)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """
+        Stores a checkpoint together with the channels that changed since its parent.
+
+        Args:
+            config (RunnableConfig): Config of the parent checkpoint.
+            checkpoint (Checkpoint): The checkpoint to store.
+            metadata (CheckpointMetadata): Metadata of the checkpoint.
+            new_versions (ChannelVersions): Channels written in this step and their new versions.
+
+        Returns:
+            RunnableConfig: Config pointing at the stored checkpoint.
+        """
+        thread_id = config['configurable']['thread_id']
+        checkpoint_ns = config['configurable'].get('checkpoint_ns', '')
+        checkpoint = checkpoint.copy()
+        values: Dict[str, Any] = checkpoint.pop('channel_values')
+
+        with self.engine.begin() as connection:
+            for channel, version in new_versions.items():
+                if channel in values:
+                    type_, blob = self._dump_channel(connection, thread_id, values[channel])
+                else:
+                    type_, blob = 'empty', None
+                connection.execute(delete(blobs_table).where(
+                    blobs_table.c.thread_id == thread_id,
+                    blobs_table.c.checkpoint_ns == checkpoint_ns,
+                    blobs_table.c.channel == channel,
+                    blobs_table.c.version == str(version),
+                ))
+                connection.execute(blobs_table.insert().values(
+                    thread_id=thread_id,
+                    checkpoint_ns=checkpoint_ns,
+                    channel=channel,
+                    version=str(version),
+                    type=type_,
+                    blob=blob,
+                ))
+
+            checkpoint_type, checkpoint_blob = self.serde.dumps_typed(checkpoint)
+            metadata_type, metadata_blob = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+            connection.execute(delete(checkpoints_table).where(
+                checkpoints_table.c.thread_id == thread_id,
+                checkpoints_table.c.checkpoint_ns == checkpoint_ns,
+                checkpoints_table.c.checkpoint_id == checkpoint['id'],
+            ))
+            connection.execute(checkpoints_table.insert().values(
+                thread_id=thread_id,
+                checkpoint_ns=checkpoint_ns,
+                checkpoint_id=checkpoint['id'],
+                parent_checkpoint_id=config['configurable'].get('checkpoint_id'),
+                type=checkpoint_type,
+                checkpoint=checkpoint_blob,
+                metadata_type=metadata_type,
+                metadata=metadata_blob,
+            ))
+
+        return {
+            'configurable': {
+                'thread_id': thread_id,
+                'checkpoint_ns': checkpoint_ns,
+                'checkpoint_id': checkpoint['id'],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = '',
+    ) -> None:
+        """
+        Stores the writes of a completed node, so an interrupted step does not redo it on resume.
+
+        Args:
+            config (RunnableConfig): Config of the checkpoint the writes belong to.
+            writes (Sequence[Tuple[str, Any]]): The (channel, value) pairs written by the task.
+            task_id (str): Identifier of the task that produced the writes.
+            task_path (str): Path of the task that produced the writes.
+        """
+        thread_id = config['configurable']['thread_id']
+        checkpoint_ns = config['configurable'].get('checkpoint_ns', '')
+        checkpoint_id = config['configurable']['checkpoint_id']
+
+        with self.engine.begin() as connection:
+            for idx, (channel, value) in enumerate(writes):
+                idx = WRITES_IDX_MAP.get(channel, idx)
+                key = (
+                    writes_table.c.thread_id == thread_id,
+                    writes_table.c.checkpoint_ns == checkpoint_ns,
+                    writes_table.c.checkpoint_id == checkpoint_id,
+                    writes_table.c.task_id == task_id,
+                    writes_table.c.idx == idx,
+                )
+                if connection.execute(select(writes_table.c.idx).where(*key)).first() is not None:
+                    # Regular writes are kept as first recorded; special writes (errors, interrupts) are replaced.
+                    if idx >= 0:
+                        continue
+                    connection.execute(delete(writes_table).where(*key))
+                type_, blob = self.serde.dumps_typed(value)
+                connection.execute(writes_table.insert().values(
+                    thread_id=thread_id,
+                    checkpoint_ns=checkpoint_ns,
+                    checkpoint_id=checkpoint_id,
+                    task_id=task_id,
+                    idx=idx,
+                    channel=channel,
+                    type=type_,
+                    blob=blob,
+                    task_path=task_path,
+                ))
+
+    def delete_thread(self, thread_id: str) -> None:
+        """
+        Deletes every checkpoint, write and message stored for a thread.
+
+        Args:
+            thread_id (str): The thread to delete.
+        """
+        with self.engine.begin() as connection:
+            for table in (checkpoints_table, blobs_table, writes_table, messages_table):
+                connection.execute(delete(table).where(table.c.thread_id == thread_id))
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        checkpoints = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint in checkpoints:
+            yield checkpoint
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = '',
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        if current is None:
+            current_version = 0
+        elif isinstance(current, int):
+            current_version = current
+        else:
+            current_version = int(current.split('.')[0])
+        return f"{current_version + 1:032}.{random.random():016}"
@@ -0,0 +1,164 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+
+@dataclass(frozen=True)
+class CompactionReport:
+    tokens_before: int
+    tokens_after: int
+    messages_before: int
+    messages_after: int
+    summarized_messages: int
+    truncated_messages: int
+
+
+@dataclass(frozen=True)
+class CompactedHistory:
+    messages: List[BaseMessage]
+    summary: str
+    summarized_count: int
+    report: CompactionReport
+
+
+class HistoryCompactor:
+    """
+    Keeps the supervisor prompt bounded as a conversation grows.
+
+    Verbose worker outputs outside the most recent messages are truncated, and
+    messages that no longer fit the token budget are folded into a rolling summary.
+    The summary and the number of messages it covers live in the graph state, so
+    each message is folded in only once.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 8000,
+        keep_recent: int = 4,
+        max_worker_chars: int = 2000,
+        max_summary_chars: int = 4000,
+        worker_names: Sequence[str] = ('google_tasks', 'google_calendar'),
+        summarizer=None,
+    ):
+        """
+        Args:
+            max_tokens (int): Token budget for the conversation part of the prompt, summary included.
+            keep_recent (int): Number of most recent messages that are always sent verbatim.
+            max_worker_chars (int): Older worker outputs longer than this are truncated.
+            max_summary_chars (int): Upper bound for the rolling summary.
+            worker_names (Sequence[str]): Message names whose outputs may be truncated.
+            summarizer: Optional chat model used to write the rolling summary. Without one,
+                the summary is built from the first line of each folded message.
+        """
+        self.max_tokens = max_tokens
+        self.keep_recent = keep_recent
+        self.max_worker_chars = max_worker_chars
+        self.max_summary_chars = max_summary_chars
+        self.worker_names = set(worker_names)
+        self.summarizer = summarizer
+
+    def _truncate(self, message: BaseMessage) -> BaseMessage:
+        content = message.content
+        if message.name not in self.worker_names or not isinstance(content, str) or len(content) <= self.max_worker_chars:
+            return message
+        omitted = len(content) - self.max_worker_chars
+        return message.model_copy(update={
+            'content': f"{content[:self.max_worker_chars]}... [{omitted} characters truncated]"
+        })
+
+    @staticmethod
+    def _summary_message(summary: str) -> List[BaseMessage]:
+        if not summary:
+            return []
+        return [SystemMessage(f"Summary of the earlier conversation:\n{summary}")]
+
+    @staticmethod
+    def _describe(message: BaseMessage) -> str:
+        content = message.content if isinstance(message.content, str) else str(message.content)
+        return f"{message.name or 'user'}: {content}"
+
+    def _summarize(self, summary: str, messages: List[BaseMessage]) -> str:
+        """
+        Folds `messages` into the rolling summary.
+        """
+        if self.summarizer is not None:
+            transcript = '\n\n'.join(self._describe(message) for message in messages)
+            response = self.summarizer.invoke([
+                SystemMessage(
+                    "You maintain a running summary of a conversation between a user, a supervisor and worker agents "
+                    "managing Google Tasks and Google Calendar. Update the summary with the new messages. Keep every "
+                    "id, title, date and decision that later steps might need. Reply with the summary only."
+                ),
+                HumanMessage(f"Current summary:\n{summary or '(empty)'}\n\nNew messages:\n{transcript}"),
+            ])
+            summary = response.content
+        else:
+            lines = [summary] if summary else []
+            for message in messages:
+                first_line = self._describe(message).strip().split('\n', 1)[0]
+                lines.append(f"- {first_line[:200]}")
+            summary = '\n'.join(lines)
+        if len(summary) > self.max_summary_chars:
+            summary = summary[-self.max_summary_chars:]
+        return summary
+
+    def compact(self, messages: List[BaseMessage], summary: str = '', summarized_count: int = 0) -> CompactedHistory:
+        """
+        Builds the conversation part of a prompt that fits the token budget.
+
+        Args:
+            messages (List[BaseMessage]): The full message history from the state.
+            summary (str): The rolling summary so far.
+            summarized_count (int): Number of leading messages already covered by the summary.
+
+        Returns:
+            CompactedHistory: The messages to send, the updated summary and coverage, and a report.
+        """
+        tokens_before = count_tokens_approximately(messages)
+        recent_start = max(len(messages) - self.keep_recent, 0)
+        compacted = [
+            self._truncate(message) if index < recent_start else message
+            for index, message in enumerate(messages)
+        ]
+        truncated = sum(1 for before, after in zip(messages, compacted) if before is not after)
+
+        # Token counts of compacted[i:] for every i, so the window can be found in one pass.
+        suffix_tokens = [0] * (len(compacted) + 1)
+        for index in range(len(compacted) - 1, -1, -1):
+            suffix_tokens[index] = suffix_tokens[index + 1] + count_tokens_approximately([compacted[index]])
+
+        start = min(summarized_count, len(compacted))
+        budget = self.max_tokens - count_tokens_approximately(self._summary_message(summary))
+        while start < recent_start and suffix_tokens[start] > budget:
+            start += 1
+
+        folded = compacted[summarized_count:start]
+        if folded:
+            summary = self._summarize(summary, folded)
+
+        window = self._summary_message(summary) + compacted[start:]
+        return CompactedHistory(
+            messages=window,
+            summary=summary,
+            summarized_count=start,
+            report=CompactionReport(
+                tokens_before=tokens_before,
+                tokens_after=count_tokens_approximately(window),
+                messages_before=len(messages),
+                messages_after=len(window),
+                summarized_messages=len(folded),
+                truncated_messages=truncated,
+            ),
+        )
+
+    @staticmethod
+    def format_report(report: Optional[CompactionReport]) -> str:
+        if report is None:
+            return "Compaction: not run"
+        return (
+            f"Compaction: {report.tokens_before} -> {report.tokens_after} tokens, "
+            f"{report.messages_before} -> {report.messages_after} messages "
+            f"({report.summarized_messages} summarized, {report.truncated_messages} truncated)"
+        )
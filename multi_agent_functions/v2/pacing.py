@@ -0,0 +1,84 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from multi_agent_functions.v1.llm.rate_limiter import SlidingWindowRateLimiter
+
+
+@dataclass(frozen=True)
+class TurnTiming:
+    node: str
+    wall_seconds: float
+    wait_seconds: float
+
+    @property
+    def work_seconds(self) -> float:
+        return max(self.wall_seconds - self.wait_seconds, 0.0)
+
+
+class PacingPolicy:
+    """
+    Admission control applied before each worker hop. The base policy never waits.
+    """
+
+    def admit(self) -> float:
+        """
+        Blocks until the next hop may start.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        return 0.0
+
+    async def aadmit(self) -> float:
+        return 0.0
+
+
+class RateLimiterPacing(PacingPolicy):
+    """
+    Holds a worker hop back only while the shared rate limiter has no budget left
+    for it, instead of sleeping a fixed amount after every hop.
+    """
+
+    def __init__(self, limiter: SlidingWindowRateLimiter, tokens: int = 0):
+        """
+        Args:
+            limiter (SlidingWindowRateLimiter): The limiter shared with the model.
+            tokens (int): Token budget a hop needs to be admitted.
+        """
+        self.limiter = limiter
+        self.tokens = tokens
+
+    def admit(self) -> float:
+        return self.limiter.wait_for_budget(self.tokens)
+
+    async def aadmit(self) -> float:
+        return await self.limiter.await_for_budget(self.tokens)
+
+
+def default_pacing(model) -> PacingPolicy:
+    """
+    Paces against the model's own limiter when it has one, otherwise never waits.
+    """
+    limiter: Optional[SlidingWindowRateLimiter] = getattr(model, 'limiter', None)
+    if limiter is not None:
+        return RateLimiterPacing(limiter)
+    return PacingPolicy()
+
+
+def summarize_timings(timings: List[TurnTiming]) -> Dict[str, float]:
+    """
+    Totals the wall, waiting and working time of a turn's hops.
+
+    Args:
+        timings (List[TurnTiming]): The timings recorded for the turn.
+
+    Returns:
+        Dict[str, float]: Totals keyed by 'wall_seconds', 'wait_seconds' and 'work_seconds'.
+    """
+    wall = sum(timing.wall_seconds for timing in timings)
+    wait = sum(timing.wait_seconds for timing in timings)
+    return {
+        'wall_seconds': wall,
+        'wait_seconds': wait,
+        'work_seconds': max(wall - wait, 0.0),
+    }
@@ -0,0 +1,218 @@
+import json
+import math
+import os
+import random
+import re
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+@dataclass(frozen=True)
+class Route:
+    """
+    Args:
+        next (str): The most likely decision.
+        confidence (float): Its posterior probability.
+        evidence (int): Known tokens of the request that clearly favour it over every other decision.
+    """
+    next: str
+    confidence: float
+    evidence: int = 0
+
+
+@dataclass(frozen=True)
+class RouterMetrics:
+    routed: int
+    fallbacks: int
+    shadow_checks: int
+    shadow_agreements: int
+    examples: int
+
+    @property
+    def shadow_precision(self) -> Optional[float]:
+        """Share of shadow-checked fast-path routes the supervisor LLM agreed with."""
+        return self.shadow_agreements / self.shadow_checks if self.shadow_checks else None
+
+
+class FastPathRouter:
+    """
+    Routes obvious requests straight to a worker without asking the supervisor LLM.
+
+    A multinomial naive Bayes classifier over request keywords is trained from the
+    supervisor's logged `Supervisor.next` decisions, and keeps learning from every
+    decision the LLM makes. Only words seen in past decisions are scored, so unknown
+    words do not push a request towards the decision with the fewest logged words. A
+    request is routed directly only when the classifier is confident it belongs to one
+    of the `routable` workers and enough of its words point there; everything else
+    falls back to the LLM.
+
+    A sample of confident routes is still sent to the LLM as a shadow check, so the
+    precision of the fast path is measured and the threshold can be tuned.
+    `precision_at` estimates the precision of other thresholds from all decisions
+    the LLM made.
+    """
+
+    def __init__(
+        self,
+        log_path: Optional[str] = 'router_decisions.jsonl',
+        threshold: float = 0.9,
+        min_examples: int = 20,
+        shadow_rate: float = 0.1,
+        routable: Sequence[str] = ('google_tasks', 'google_calendar'),
+        min_evidence: int = 2,
+        discriminative_ratio: float = 2.0,
+    ):
+        """
+        Args:
+            log_path (Optional[str]): JSONL file of past decisions to train from and append to. None keeps them in memory only.
+            threshold (float): Minimum posterior probability for a request to be routed without the LLM.
+            min_examples (int): Number of logged decisions needed before the router routes anything.
+            shadow_rate (float): Fraction of confident routes that are still checked against the LLM.
+            routable (Sequence[str]): Workers the router may send requests to directly.
+            min_evidence (int): Number of known words that must favour a worker for a request to be routed to it.
+            discriminative_ratio (float): How many times likelier a word must be under a decision than under
+                every other one to count as evidence for it.
+        """
+        self.log_path = log_path
+        self.threshold = threshold
+        self.min_examples = min_examples
+        self.shadow_rate = shadow_rate
+        self.routable = set(routable)
+        self.min_evidence = min_evidence
+        self.discriminative_ratio = discriminative_ratio
+        self._lock = threading.Lock()
+        self._label_counts: Counter = Counter()
+        self._token_counts: Dict[str, Counter] = defaultdict(Counter)
+        self._token_totals: Counter = Counter()
+        self._vocabulary: set = set()
+        self._scored: List[Tuple[float, bool]] = []
+        self._routed = 0
+        self._fallbacks = 0
+        self._shadow_checks = 0
+        self._shadow_agreements = 0
+        if log_path and os.path.exists(log_path):
+            with open(log_path, 'r') as f:
+                for line in f:
+                    if line.strip():
+                        decision = json.loads(line)
+                        self._learn(decision['request'], decision['next'])
+
+    def _learn(self, request: str, label: str) -> None:
+        tokens = tokenize(request)
+        self._label_counts[label] += 1
+        self._token_counts[label].update(tokens)
+        self._token_totals[label] += len(tokens)
+        self._vocabulary.update(tokens)
+
+    def _classify(self, request: str) -> Optional[Route]:
+        """
+        Returns the most likely decision for a request, its posterior probability and the
+        evidence for it, or None if none of the request's words were seen before.
+        Must be called with the lock held.
+        """
+        examples = sum(self._label_counts.values())
+        tokens = [token for token in tokenize(request) if token in self._vocabulary]
+        if not examples or not tokens:
+            return None
+        vocabulary = len(self._vocabulary)
+        likelihoods = {
+            label: {
+                token: (self._token_counts[label][token] + 1) / (self._token_totals[label] + vocabulary)
+                for token in set(tokens)
+            }
+            for label in self._label_counts
+        }
+        scores = {
+            label: math.log(count / examples) + sum(math.log(likelihoods[label][token]) for token in tokens)
+            for label, count in self._label_counts.items()
+        }
+        best = max(scores, key=scores.get)
+        total = sum(math.exp(score - scores[best]) for score in scores.values())
+        evidence = sum(
+            all(likelihoods[best][token] >= self.discriminative_ratio * likelihoods[label][token] for label in likelihoods if label != best)
+            for token in tokens
+        )
+        return Route(best, 1 / total, evidence)
+
+    def _routes(self, route: Optional[Route]) -> bool:
+        return (
+            route is not None
+            and route.next in self.routable
+            and route.confidence >= self.threshold
+            and route.evidence >= self.min_evidence
+        )
+
+    def route(self, request: str) -> Optional[Route]:
+        """
+        Decides whether a request can skip the supervisor LLM.
+
+        Args:
+            request (str): The user's request.
+
+        Returns:
+            Optional[Route]: The worker to route to, or None to fall back to the LLM.
+        """
+        with self._lock:
+            if sum(self._label_counts.values()) < self.min_examples:
+                self._fallbacks += 1
+                return None
+            route = self._classify(request)
+            if not self._routes(route):
+                self._fallbacks += 1
+                return None
+            self._routed += 1
+            return route
+
+    def shadow(self) -> bool:
+        """
+        Whether the current fast-path route should be checked against the LLM.
+        """
+        return random.random() < self.shadow_rate
+
+    def observe(self, request: str, decision: str, shadowed: Optional[Route] = None) -> None:
+        """
+        Records a decision the supervisor LLM made for a request, and learns from it.
+
+        Args:
+            request (str): The user's request.
+            decision (str): The `Supervisor.next` the LLM chose.
+            shadowed (Optional[Route]): The fast-path route, if this was a shadow check of one.
+        """
+        with self._lock:
+            prediction = self._classify(request)
+            if prediction is not None and prediction.next in self.routable and prediction.evidence >= self.min_evidence:
+                self._scored.append((prediction.confidence, prediction.next == decision))
+            if shadowed is not None:
+                self._shadow_checks += 1
+                self._shadow_agreements += shadowed.next == decision
+            self._learn(request, decision)
+            if self.log_path:
+                with open(self.log_path, 'a') as f:
+                    f.write(json.dumps({'request': request, 'next': decision}) + '\n')
+
+    def precision_at(self, threshold: float) -> Optional[float]:
+        """
+        Estimates the precision the fast path would have at `threshold`, from the
+        predictions made for requests the LLM decided.
+        """
+        with self._lock:
+            outcomes = [correct for confidence, correct in self._scored if confidence >= threshold]
+        return sum(outcomes) / len(outcomes) if outcomes else None
+
+    def metrics(self) -> RouterMetrics:
+        with self._lock:
+            return RouterMetrics(
+                routed=self._routed,
+                fallbacks=self._fallbacks,
+                shadow_checks=self._shadow_checks,
+                shadow_agreements=self._shadow_agreements,
+                examples=sum(self._label_counts.values()),
+            )
@@ -0,0 +1,119 @@
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple, Type
+
+from langchain_core.runnables import Runnable
+from langchain_core.tools import BaseTool
+from langgraph.prebuilt import create_react_agent
+from pydantic import BaseModel
+
+
+@dataclass(frozen=True)
+class RunnableRegistryMetrics:
+    builds: int
+    hits: int
+    build_seconds: float
+
+
+def _freeze(kwargs: Dict[str, Any]) -> str:
+    return json.dumps(kwargs, sort_keys=True, default=str)
+
+
+def _tool_identity(tool: BaseTool) -> Hashable:
+    """
+    Identifies what a tool runs, not just its name: two toolkit instances expose
+    tools with the same names bound to different clients.
+
+    Tools are rebuilt on every `get_tools()` call and bound methods on every
+    attribute access, so a bound method is identified by its instance and function.
+    The registry entry holds the tools, which keeps that instance's `id()` from
+    being reused while the entry exists.
+    """
+    func = getattr(tool, 'func', None) or getattr(tool, 'coroutine', None)
+    if func is None:
+        return tool.name, id(tool)
+    owner = getattr(func, '__self__', None)
+    if owner is not None:
+        return tool.name, id(owner), getattr(func, '__func__', func)
+    return tool.name, func
+
+
+def _tool_set(tools: Sequence[BaseTool]) -> Tuple[Hashable, ...]:
+    return tuple(_tool_identity(tool) for tool in tools)
+
+
+class RunnableRegistry:
+    """
+    Builds each model-derived runnable once and hands out the same instance afterwards.
+
+    Structured-output runnables, tool bindings and ReAct agent graphs are keyed by
+    the model they wrap and the schema or tool set they bind, so a supervisor turn
+    or an agent recompile reuses them instead of rebuilding them. Tool sets are keyed
+    by what each tool runs, so toolkits with the same tool names but different
+    clients get their own runnables.
+
+    The registry holds a reference to every model and tool it has built for, so an
+    `id()` in a key cannot be reused by another object while the entry exists.
+    """
+
+    def __init__(self):
+        self._runnables: Dict[Hashable, Tuple[Any, Tuple[BaseTool, ...], Any]] = {}
+        self._lock = threading.RLock()
+        self._builds = 0
+        self._hits = 0
+        self._build_seconds = 0.0
+
+    def _get_or_build(self, model: Any, key: Hashable, build: Callable[[], Any], tools: Sequence[BaseTool] = ()) -> Any:
+        with self._lock:
+            entry = self._runnables.get((id(model), key))
+            if entry is not None:
+                self._hits += 1
+                return entry[2]
+            started = time.perf_counter()
+            runnable = build()
+            self._build_seconds += time.perf_counter() - started
+            self._builds += 1
+            self._runnables[(id(model), key)] = (model, tuple(tools), runnable)
+            return runnable
+
+    def structured_output(self, model: Any, schema: Type[BaseModel], **kwargs: Any) -> Runnable:
+        """
+        Returns `model.with_structured_output(schema, **kwargs)`, built once per model and schema.
+        """
+        return self._get_or_build(
+            model,
+            ('structured_output', schema, _freeze(kwargs)),
+            lambda: model.with_structured_output(schema, **kwargs)
+        )
+
+    def bind_tools(self, model: Any, tools: Sequence[BaseTool], **kwargs: Any) -> Runnable:
+        """
+        Returns `model.bind_tools(tools, **kwargs)`, built once per model and tool set.
+        """
+        key = ('bind_tools', _tool_set(tools), _freeze(kwargs))
+        return self._get_or_build(model, key, lambda: model.bind_tools(list(tools), **kwargs), tools)
+
+    def react_agent(self, model: Any, tools: Sequence[BaseTool], name: str, prompt: Optional[str] = None) -> Runnable:
+        """
+        Returns a ReAct agent graph for the model and tool set, built once.
+
+        The whole graph is cached rather than a pre-bound model: `create_react_agent`
+        requires a pre-bound model to list its tools one by one, which providers that
+        group function declarations into a single tool (such as Gemini) do not.
+        """
+        key = ('react_agent', _tool_set(tools), name, prompt)
+        return self._get_or_build(model, key, lambda: create_react_agent(model, tools=list(tools), name=name, prompt=prompt), tools)
+
+    def metrics(self) -> RunnableRegistryMetrics:
+        with self._lock:
+            return RunnableRegistryMetrics(
+                builds=self._builds,
+                hits=self._hits,
+                build_seconds=self._build_seconds,
+            )
+
+
+# Shared by the supervisor graph and its agents unless they are given their own.
+default_registry = RunnableRegistry()
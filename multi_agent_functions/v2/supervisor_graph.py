@@ -1,15 +1,32 @@
-from ast import List
+import asyncio
 import time
-from typing import Generic, Hashable, Literal, TypeVar
+from typing import Generic, Hashable, List, Literal, Optional, Tuple, TypeVar
 
 from pydantic import BaseModel, Field
 from multi_agent_functions.v2.agent.base_agent import BaseAgent
 from langgraph.graph.state import CompiledStateGraph
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.errors import GraphBubbleUp
 from langgraph.graph import START, StateGraph
 
-from multi_agent_functions.v2.agent.state import AgentState
-from langgraph.types import Command, N
+from multi_agent_functions.v1.llm.rate_limiter import WaitTracker, track_waits
+from multi_agent_functions.v2.agent.plan import Plan
+from multi_agent_functions.v2.agent.state import AgentState, SupervisorState
+from multi_agent_functions.v2.compaction import CompactedHistory, HistoryCompactor
+from multi_agent_functions.v2.pacing import PacingPolicy, TurnTiming, default_pacing
+from multi_agent_functions.v2.router import FastPathRouter, Route
+from multi_agent_functions.v2.runnable_registry import RunnableRegistry, default_registry
+from langgraph.types import Command, N, Send
+
+class WorkerTask(BaseModel):
+    worker: Literal['google_tasks', 'google_calendar'] = Field(
+        description="The worker that should handle this subtask: 'google_tasks' or 'google_calendar'."
+    )
+    instruction: str = Field(
+        description="A detailed, self-contained description of the work this worker should do."
+    )
 
 class Supervisor(BaseModel):
     next: Literal['enhancer', 'google_tasks', 'google_calendar', '__end__'] = Field(
@@ -18,25 +35,79 @@ class Supervisor(BaseModel):
     reason: str = Field(
         description="The reason for the decision. When 'next' is '__end__', this field should contain the final message to the user (e.g., a summary, a question for more info, or a simple response). When 'next' is not '__end__', this field should contain a detailed description of the work the next worker should do."
     )
+    parallel: List[WorkerTask] = Field(
+        default_factory=list,
+        description="Subtasks that do not depend on each other's output and can run at the same time. When two or more are listed they are dispatched concurrently instead of 'next', and 'reason' should summarize what was dispatched. Leave empty when the next step depends on a previous one."
+    )
 
 class SupervisorGraph:
-    def __init__(self):
+    def __init__(self, pacing: Optional[PacingPolicy] = None, compactor: Optional[HistoryCompactor] = None, router: Optional[FastPathRouter] = None, registry: Optional[RunnableRegistry] = None):
+        """
+        Args:
+            pacing (Optional[PacingPolicy]): Admission policy applied before each worker hop.
+                Defaults to pacing against the model's rate limiter, if it has one.
+            compactor (Optional[HistoryCompactor]): Keeps the supervisor prompt within a token budget.
+                Defaults to a HistoryCompactor with its default budget.
+            router (Optional[FastPathRouter]): Sends obvious new requests straight to a worker,
+                skipping the supervisor LLM. Without one, every request goes through the LLM.
+            registry (Optional[RunnableRegistry]): Builds the structured-output and tool-bound runnables
+                of the supervisor and agents once. Defaults to the shared registry.
+        """
         self.agents = BaseAgent.load_all()
         self.model = None
+        self.pacing = pacing
+        self.compactor = compactor or HistoryCompactor()
+        self.router = router
+        self.registry = registry or default_registry
+        self.supervisor_model = None
 
     @classmethod
-    def init_state(cls) -> AgentState:
-        return AgentState(messages=[])
+    def init_state(cls) -> SupervisorState:
+        return SupervisorState(messages=[], timings=[])
 
-    def supervisor_node(self, state: AgentState) -> Command[Literal['enhancer', 'google_tasks', 'google_calendar', '__end__']]:
-        model = self.model.with_structured_output(Supervisor)
+    @staticmethod
+    def _timed(command: Command, node: str, started: float, tracker: WaitTracker) -> Command:
+        timing = TurnTiming(node, time.monotonic() - started, tracker.waited)
+        return Command(
+            update={**command.update, 'timings': [timing]},
+            goto=command.goto
+        )
 
-        result: Supervisor = model.invoke(
-            [
-                SystemMessage(self.agents['supervisor'].system_prompt),
-            ] + state['messages']
+    def _compact(self, state: SupervisorState) -> CompactedHistory:
+        return self.compactor.compact(
+            state['messages'],
+            state.get('summary', ''),
+            state.get('summarized_count', 0)
         )
 
+    def _supervisor_messages(self, history: CompactedHistory) -> List[BaseMessage]:
+        return [
+            SystemMessage(self.agents['supervisor'].system_prompt),
+        ] + history.messages
+
+    def _supervisor_command(self, state: AgentState, result: Supervisor, history: CompactedHistory) -> Command[Literal['enhancer', 'google_tasks', 'google_calendar', '__end__']]:
+        compaction = {
+            'summary': history.summary,
+            'summarized_count': history.summarized_count,
+            'compaction': history.report,
+        }
+        if len(result.parallel) > 1:
+            return Command(
+                update={
+                    'messages': [
+                        HumanMessage(result.reason, name='supervisor')
+                    ],
+                    **compaction,
+                },
+                goto=[
+                    Send(task.worker, {'messages': [HumanMessage(task.instruction, name='supervisor')]})
+                    for task in result.parallel
+                ]
+            )
+        if len(result.parallel) == 1:
+            result.next = result.parallel[0].worker
+            result.reason = result.parallel[0].instruction
+
         # If delegating to the enhancer, include the original user's request in the reason
         if result.next == 'enhancer' and state['messages']:
             original_user_request = state['messages'][0].content
@@ -47,45 +118,243 @@ class SupervisorGraph:
                 'messages': [
                     HumanMessage(result.reason, name='supervisor')
                 ],
+                **compaction,
             },
             goto=result.next
         )
 
-    def agent_node(self, agent: str):
-        def inner(state: AgentState) -> Command[Literal['supervisor']]:
+    @staticmethod
+    def _user_request(state: SupervisorState) -> Optional[str]:
+        """
+        Returns the text of a fresh user message, the only point where the fast path applies.
+        Messages from the supervisor, workers and plan executor are named. A reply to a
+        question they asked is not a fresh request: routed on its own, it would reach a
+        worker without the question.
+        """
+        if not state['messages']:
+            return None
+        message = state['messages'][-1]
+        if not isinstance(message, HumanMessage) or message.name or not isinstance(message.content, str):
+            return None
+        if len(state['messages']) > 1:
+            previous = state['messages'][-2]
+            from_user = isinstance(previous, HumanMessage) and not previous.name
+            if not from_user and '?' in str(previous.content):
+                return None
+        return message.content
+
+    def _fast_path(self, request: Optional[str]) -> Tuple[Optional[Route], Optional[Route]]:
+        """
+        Returns:
+            Tuple[Optional[Route], Optional[Route]]: The route to take without the LLM, and the
+                route to check against the LLM instead when it was picked for a shadow check.
+        """
+        if self.router is None or request is None:
+            return None, None
+        route = self.router.route(request)
+        if route is not None and self.router.shadow():
+            return None, route
+        return route, None
+
+    def _routed_command(self, request: str, route: Route) -> Command[Literal['google_tasks', 'google_calendar']]:
+        print(f'Fast path: {route.next} ({route.confidence:.2f})')
+        return Command(
+            update={
+                'messages': [
+                    HumanMessage(request, name='supervisor')
+                ],
+            },
+            goto=route.next
+        )
+
+    def _observe(self, request: Optional[str], result: Supervisor, shadowed: Optional[Route]) -> None:
+        if self.router is None or request is None:
+            return
+        decision = result.parallel[0].worker if len(result.parallel) == 1 else result.next
+        self.router.observe(request, 'parallel' if len(result.parallel) > 1 else decision, shadowed)
+
+    def supervisor_node(self, state: SupervisorState, config: RunnableConfig) -> Command[Literal['enhancer', 'google_tasks', 'google_calendar', '__end__']]:
+        started = time.monotonic()
+        with track_waits() as tracker:
+            request = self._user_request(state)
+            route, shadowed = self._fast_path(request)
+            if route is not None:
+                return self._timed(self._routed_command(request, route), 'supervisor', started, tracker)
+            history = self._compact(state)
+            result: Supervisor = self.supervisor_model.invoke(self._supervisor_messages(history), config)
+            self._observe(request, result, shadowed)
+        return self._timed(self._supervisor_command(state, result, history), 'supervisor', started, tracker)
+
+    async def asupervisor_node(self, state: SupervisorState, config: RunnableConfig) -> Command[Literal['enhancer', 'google_tasks', 'google_calendar', '__end__']]:
+        started = time.monotonic()
+        with track_waits() as tracker:
+            request = self._user_request(state)
+            route, shadowed = self._fast_path(request)
+            if route is not None:
+                return self._timed(self._routed_command(request, route), 'supervisor', started, tracker)
+            history = await asyncio.to_thread(self._compact, state)
+            result: Supervisor = await self.supervisor_model.ainvoke(self._supervisor_messages(history), config)
+            await asyncio.to_thread(self._observe, request, result, shadowed)
+        return self._timed(self._supervisor_command(state, result, history), 'supervisor', started, tracker)
+
+    def _agent_command(self, agent: str, state: AgentState, result: AgentState) -> Command[Literal['supervisor', 'plan_executor']]:
+        update = {
+            'messages': [
+                HumanMessage(result['messages'][-1].content, name=agent)
+            ]
+        }
+        if 'step' in state:
+            update['step_results'] = {state['step']: result['messages'][-1].content}
+            return Command(update=update, goto='plan_executor')
+        plan: Optional[Plan] = result.get('plan')
+        if plan is not None and plan.steps:
+            update.update(plan=plan, step_results={}, step_errors={})
+            return Command(update=update, goto='plan_executor')
+        return Command(update=update, goto='supervisor')
+
+    def _step_failed(self, agent: str, state: AgentState, error: Exception) -> Command[Literal['plan_executor']]:
+        print(f'{agent} failed step {state["step"]}:', error)
+        print('======================')
+        return Command(
+            update={
+                'step_errors': {state['step']: f'{type(error).__name__}: {error}'}
+            },
+            goto='plan_executor'
+        )
+
+    def agent_node(self, agent: str) -> RunnableLambda:
+        def inner(state: AgentState, config: RunnableConfig) -> Command[Literal['supervisor', 'plan_executor']]:
             print('======================')
-            print('supervisor:', state['messages'][-1].content)
+            print(f"{state['messages'][-1].name or 'supervisor'}:", state['messages'][-1].content)
 
-            result = self.agents[agent].invoke(
-                {
-                    'messages': [state['messages'][-1]]
-                }
-            )
+            started = time.monotonic()
+            with track_waits() as tracker:
+                tracker.add(self.pacing.admit())
+                try:
+                    result = self.agents[agent].invoke(
+                        {
+                            'messages': [state['messages'][-1]]
+                        },
+                        config
+                    )
+                except GraphBubbleUp:
+                    # Interrupts and parent-graph commands are control flow, not step failures.
+                    raise
+                except Exception as e:
+                    if 'step' not in state:
+                        raise
+                    return self._timed(self._step_failed(agent, state, e), agent, started, tracker)
             # if agent == 'google_calendar':
             #     print(result['messages'])
             print(f'{agent} ({len(result["messages"])}):',result['messages'][-1].content)
             print('======================')
-            time.sleep(10)
 
+            return self._timed(self._agent_command(agent, state, result), agent, started, tracker)
+
+        async def ainner(state: AgentState, config: RunnableConfig) -> Command[Literal['supervisor', 'plan_executor']]:
+            print('======================')
+            print(f"{state['messages'][-1].name or 'supervisor'}:", state['messages'][-1].content)
+
+            started = time.monotonic()
+            with track_waits() as tracker:
+                tracker.add(await self.pacing.aadmit())
+                try:
+                    result = await self.agents[agent].ainvoke(
+                        {
+                            'messages': [state['messages'][-1]]
+                        },
+                        config
+                    )
+                except GraphBubbleUp:
+                    # Interrupts and parent-graph commands are control flow, not step failures.
+                    raise
+                except Exception as e:
+                    if 'step' not in state:
+                        raise
+                    return self._timed(self._step_failed(agent, state, e), agent, started, tracker)
+            print(f'{agent} ({len(result["messages"])}):',result['messages'][-1].content)
+            print('======================')
+
+            return self._timed(self._agent_command(agent, state, result), agent, started, tracker)
+
+        return RunnableLambda(inner, afunc=ainner, name=agent)
+
+    def plan_executor_node(self, state: SupervisorState) -> Command[Literal['google_tasks', 'google_calendar', 'supervisor']]:
+        """
+        Dispatches the enhancer's plan without consulting the LLM.
+
+        Every step whose dependencies have completed is sent to its worker, in
+        parallel when several are ready. Control returns to the supervisor once
+        all steps are done, a step fails, or the remaining steps can never run.
+        """
+        plan = state.get('plan') or Plan()
+        results = state.get('step_results') or {}
+        errors = state.get('step_errors') or {}
+
+        pending = [number for number in range(1, len(plan.steps) + 1) if number not in results]
+        ready = [
+            number for number in pending
+            if all(dependency in results for dependency in plan.steps[number - 1].depends_on)
+        ]
+
+        if errors:
+            report = '\n'.join(f'- Step {number}: {error}' for number, error in sorted(errors.items()))
+            reason = f"Executing the plan failed on the following steps:\n{report}\n\nCompleted steps: {sorted(results) or 'none'}. Decide how to proceed with the remaining steps."
+        elif not pending:
+            reason = f"All {len(plan.steps)} plan steps are complete. Compose the final answer for the user from the workers' results."
+        elif not ready:
+            reason = f"Plan steps {pending} cannot run because they depend on steps that do not exist or never complete. Decide how to proceed with them."
+        else:
             return Command(
-                update={
-                    'messages': [
-                        HumanMessage(result['messages'][-1].content, name=agent)
-                    ]
-                },
-                goto='supervisor'
+                goto=[
+                    Send(
+                        plan.steps[number - 1].agent,
+                        {
+                            'messages': [HumanMessage(plan.steps[number - 1].instruction(results), name='plan_executor')],
+                            'step': number,
+                        }
+                    )
+                    for number in ready
+                ]
             )
-        return inner
 
-    def compile(self, model) -> CompiledStateGraph:
+        return Command(
+            update={
+                'messages': [
+                    HumanMessage(reason, name='plan_executor')
+                ],
+                'plan': Plan(),
+            },
+            goto='supervisor'
+        )
+
+    def compile(self, model, checkpointer: Optional[BaseCheckpointSaver] = None) -> CompiledStateGraph:
+        """
+        Args:
+            model: The chat model shared by the supervisor and all agents.
+            checkpointer (Optional[BaseCheckpointSaver]): Persists the state after every node, so runs
+                invoked with a `thread_id` can be resumed after a crash or restart.
+        """
         self.model = model
+        self.supervisor_model = self.registry.structured_output(model, Supervisor)
+        if self.pacing is None:
+            self.pacing = default_pacing(model)
         for agent in self.agents.values():
-            agent.compile(model)
-        graph = StateGraph(AgentState)
-        graph.add_node("supervisor", self.supervisor_node)
-        graph.add_node("google_tasks", self.agent_node('google_tasks'))
-        graph.add_node('google_calendar', self.agent_node('google_calendar'))
-        graph.add_node('enhancer', self.agent_node('enhancer'))
+            agent.compile(model, self.registry)
+        graph = StateGraph(SupervisorState)
+        graph.add_node(
+            "supervisor",
+            RunnableLambda(self.supervisor_node, afunc=self.asupervisor_node, name='supervisor'),
+            destinations=('enhancer', 'google_tasks', 'google_calendar', '__end__')
+        )
+        graph.add_node(
+            'plan_executor',
+            self.plan_executor_node,
+            destinations=('google_tasks', 'google_calendar', 'supervisor')
+        )
+        graph.add_node("google_tasks", self.agent_node('google_tasks'), destinations=('supervisor', 'plan_executor'))
+        graph.add_node('google_calendar', self.agent_node('google_calendar'), destinations=('supervisor', 'plan_executor'))
+        graph.add_node('enhancer', self.agent_node('enhancer'), destinations=('supervisor', 'plan_executor'))
         graph.add_edge(START, 'supervisor')
 
-        return graph.compile()
+        return graph.compile(checkpointer=checkpointer)
@@ -0,0 +1,134 @@
+import json
+from typing import Any, Dict, List, Optional
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from multi_agent_functions.v1.google.batch import execute_batch
+from multi_agent_functions.v1.google.quota import QuotaController
+from multi_agent_functions.v1.llm.retry_policy import RetryPolicy
+
+RETRY = RetryPolicy(max_attempts=3, base_delay=0.0, max_delay=0.0)
+
+
+def http_error(status: int, reason: str = 'error') -> HttpError:
+    content = json.dumps({'error': {'code': status, 'message': reason}}).encode()
+    return HttpError(httplib2.Response({'status': status}), content)
+
+
+class FakeRequest:
+    def __init__(self, name: str, method: str = 'POST'):
+        self.name = name
+        self.method = method
+
+
+class FakeBatch:
+    def __init__(self, service: "FakeService", callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request: FakeRequest, request_id: str) -> None:
+        self.requests.append((request, request_id))
+
+    def execute(self, http=None) -> None:
+        self.service.round_trips.append([request.name for request, _ in self.requests])
+        if self.service.round_trip_failures:
+            status = self.service.round_trip_failures.pop(0)
+            if status:
+                raise http_error(status)
+        for request, request_id in self.requests:
+            failures = self.service.failures.get(request.name)
+            if failures:
+                self.callback(request_id, None, http_error(failures.pop(0)))
+            else:
+                self.callback(request_id, {'id': request.name}, None)
+
+
+class FakeService:
+    """
+    Answers each sub-request with the next status queued for it in `failures`, or succeeds.
+    A batch request as a whole fails with the next non-zero status in `round_trip_failures`.
+    """
+
+    def __init__(self, failures: Optional[Dict[str, List[int]]] = None, round_trip_failures: Optional[List[int]] = None):
+        self.failures = failures or {}
+        self.round_trip_failures = round_trip_failures or []
+        self.round_trips: List[List[str]] = []
+
+    def new_batch_http_request(self, callback) -> FakeBatch:
+        return FakeBatch(self, callback)
+
+
+def test_only_failed_sub_requests_are_resent():
+    service = FakeService({'b': [429], 'c': [503]})
+    requests = [FakeRequest('a', 'PATCH'), FakeRequest('b', 'PATCH'), FakeRequest('c', 'PATCH')]
+
+    results = execute_batch(service, requests, retry_policy=RETRY)
+
+    assert [result.ok for result in results] == [True, True, True]
+    assert [result.result for result in results] == [{'id': 'a'}, {'id': 'b'}, {'id': 'c'}]
+    assert service.round_trips == [['a', 'b', 'c'], ['b', 'c']]
+
+
+def test_post_sub_requests_are_not_resent_after_server_errors():
+    service = FakeService({'a': [500], 'b': [429]})
+
+    results = execute_batch(service, [FakeRequest('a'), FakeRequest('b')], retry_policy=RETRY)
+
+    assert not results[0].ok and results[0].status == 500
+    assert results[1].ok
+    assert service.round_trips == [['a', 'b'], ['b']]
+
+
+def test_rate_limits_are_reported_with_the_retry_delay():
+    service = FakeService({'a': [429, 429, 429]})
+    reported = []
+
+    results = execute_batch(service, [FakeRequest('a')], retry_policy=RETRY, on_rate_limited=reported.append)
+
+    assert not results[0].ok and results[0].rate_limited
+    # Retried twice after a zero backoff, then given up on.
+    assert reported == [0.0, 0.0, None]
+
+
+def test_without_a_retry_policy_failures_are_reported_as_they_are():
+    service = FakeService({'a': [503]})
+
+    results = execute_batch(service, [FakeRequest('a', 'DELETE'), FakeRequest('b', 'DELETE')])
+
+    assert (results[0].ok, results[0].status, results[1].ok) == (False, 503, True)
+    assert service.round_trips == [['a', 'b']]
+
+
+def test_requests_are_split_into_chunks_and_results_keep_their_order():
+    service = FakeService()
+    requests = [FakeRequest(str(i)) for i in range(5)]
+
+    results = execute_batch(service, requests, max_batch_size=2)
+
+    assert [result.index for result in results] == [0, 1, 2, 3, 4]
+    assert service.round_trips == [['0', '1'], ['2', '3'], ['4']]
+
+
+def test_a_throttled_round_trip_is_resent_without_repeating_the_earlier_ones():
+    quota = QuotaController(retry_policy=RETRY)
+    service = FakeService(round_trip_failures=[0, 429])
+    requests = [FakeRequest(str(i)) for i in range(4)]
+
+    results = execute_batch(service, requests, max_batch_size=2, run=lambda round_trip: quota.execute(lambda: round_trip(None)))
+
+    assert [result.ok for result in results] == [True, True, True, True]
+    assert service.round_trips == [['0', '1'], ['2', '3'], ['2', '3']]
+    assert quota.metrics().throttled == 1
+
+
+def test_a_failed_round_trip_keeps_the_results_of_the_others():
+    service = FakeService(round_trip_failures=[0, 400])
+    requests = [FakeRequest(str(i)) for i in range(4)]
+
+    results = execute_batch(service, requests, max_batch_size=2)
+
+    assert [result.ok for result in results] == [True, True, False, False]
+    assert results[0].result == {'id': '0'}
+    assert results[2].status == 400
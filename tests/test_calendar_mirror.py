@@ -0,0 +1,132 @@
+import json
+from typing import Any, Dict, List, Optional
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from multi_agent_functions.v1.google.calender.mirror import CalendarMirror
+
+
+def http_error(status: int) -> HttpError:
+    content = json.dumps({'error': {'code': status, 'message': 'error'}}).encode()
+    return HttpError(httplib2.Response({'status': status}), content)
+
+
+def event(event_id: str, start: str, end: str, **fields: Any) -> Dict[str, Any]:
+    return {'kind': 'calendar#event', 'id': event_id, 'status': 'confirmed', 'summary': event_id,
+            'start': {'dateTime': start}, 'end': {'dateTime': end}, **fields}
+
+
+class FakeEvents:
+    def list(self, **params: Any) -> Dict[str, Any]:
+        return params
+
+
+class FakeService:
+    def events(self) -> FakeEvents:
+        return FakeEvents()
+
+
+class FakeCalendarClient:
+    """
+    Serves queued events().list responses, an HttpError to raise, or a full listing
+    of `events` when nothing is queued, and records the sync token of every request.
+    """
+
+    def __init__(self, events: List[Dict[str, Any]]):
+        self.service = FakeService()
+        self.events = events
+        self.responses: List[Any] = []
+        self.sync_tokens: List[Optional[str]] = []
+        self.listeners = []
+
+    def on_change(self, listener) -> None:
+        self.listeners.append(listener)
+
+    def _execute(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        self.sync_tokens.append(params.get('syncToken'))
+        response = self.responses.pop(0) if self.responses else {'items': self.events, 'nextSyncToken': 'full'}
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def mirror_of(client: FakeCalendarClient) -> CalendarMirror:
+    return CalendarMirror(client, url='sqlite://')
+
+
+def ids(events) -> List[str]:
+    return [event.id for event in events]
+
+
+def test_recurring_series_are_listed_in_every_range_they_recur_in():
+    client = FakeCalendarClient([
+        event('standup', '2025-01-06T09:00:00Z', '2025-01-06T09:15:00Z', recurrence=['RRULE:FREQ=DAILY']),
+        event('course', '2025-01-06T18:00:00Z', '2025-01-06T19:00:00Z', recurrence=['RRULE:FREQ=WEEKLY;COUNT=4']),
+        event('sprint', '2026-01-05T10:00:00Z', '2026-01-05T11:00:00Z', recurrence=['RRULE:FREQ=WEEKLY;UNTIL=20260301T000000Z']),
+        event('lunch', '2026-02-02T12:00:00Z', '2026-02-02T13:00:00Z'),
+    ])
+    mirror = mirror_of(client)
+
+    next_week = ids(mirror.list_events(time_min='2026-02-02T00:00:00Z', time_max='2026-02-09T00:00:00Z'))
+    after_sprints = ids(mirror.list_events(time_min='2026-03-02T00:00:00Z', time_max='2026-03-09T00:00:00Z'))
+
+    assert next_week == ['standup', 'sprint', 'lunch']
+    assert after_sprints == ['standup']
+
+
+def test_an_all_day_series_ends_with_its_last_day():
+    client = FakeCalendarClient([{
+        'kind': 'calendar#event', 'id': 'holiday', 'status': 'confirmed',
+        'start': {'date': '2026-03-02'}, 'end': {'date': '2026-03-03'},
+        'recurrence': ['RRULE:FREQ=DAILY;UNTIL=20260304'],
+    }])
+    mirror = mirror_of(client)
+
+    assert ids(mirror.list_events(time_min='2026-03-04T12:00:00Z')) == ['holiday']
+    assert ids(mirror.list_events(time_min='2026-03-05T00:00:00Z')) == []
+
+
+def test_deltas_apply_changes_and_cancellations():
+    client = FakeCalendarClient([
+        event('a', '2026-02-02T09:00:00Z', '2026-02-02T10:00:00Z'),
+        event('b', '2026-02-03T09:00:00Z', '2026-02-03T10:00:00Z'),
+    ])
+    mirror = mirror_of(client)
+    mirror.list_events()
+    client.responses.append({
+        'items': [
+            event('a', '2026-02-04T09:00:00Z', '2026-02-04T10:00:00Z'),
+            {'id': 'b', 'status': 'cancelled'},
+        ],
+        'nextSyncToken': 'delta',
+    })
+
+    events = mirror.list_events(refresh=True)
+
+    assert ids(events) == ['a'] and events[0].start.date_time.day == 4
+    assert client.sync_tokens == [None, 'full']
+
+
+def test_an_expired_sync_token_falls_back_to_a_full_resync():
+    client = FakeCalendarClient([event('a', '2026-02-02T09:00:00Z', '2026-02-02T10:00:00Z')])
+    mirror = mirror_of(client)
+    mirror.list_events()
+    client.events = [event('c', '2026-02-05T09:00:00Z', '2026-02-05T10:00:00Z')]
+    client.responses.append(http_error(410))
+
+    assert ids(mirror.list_events(refresh=True)) == ['c']
+    assert client.sync_tokens == [None, 'full', None]
+
+
+def test_writes_through_the_client_make_the_next_read_sync():
+    client = FakeCalendarClient([])
+    mirror = mirror_of(client)
+    mirror.list_events()
+    client.responses.append({'items': [event('a', '2026-02-02T09:00:00Z', '2026-02-02T10:00:00Z')], 'nextSyncToken': 'delta'})
+
+    for listener in client.listeners:
+        listener('events:primary')
+
+    assert ids(mirror.list_events()) == ['a']
+    assert client.sync_tokens == [None, 'full']
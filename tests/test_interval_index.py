@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+
+from multi_agent_functions.v1.google.calender.interval_index import IntervalIndex, event_intervals, series_end
+from multi_agent_functions.v1.google.calender.model.events import Event
+
+
+def utc(text: str) -> datetime:
+    return datetime.fromisoformat(text).replace(tzinfo=timezone.utc)
+
+
+def timed(event_id: str, start: str, end: str, **fields: Any) -> Dict[str, Any]:
+    return {
+        'id': event_id,
+        'status': 'confirmed',
+        'start': {'dateTime': f'{start}Z', 'timeZone': 'UTC'},
+        'end': {'dateTime': f'{end}Z', 'timeZone': 'UTC'},
+        **fields,
+    }
+
+
+def build(*events: Dict[str, Any], start: str = '2026-02-01T00:00:00', end: str = '2026-03-01T00:00:00') -> IntervalIndex:
+    return IntervalIndex.from_events([Event.from_dict(event) for event in events], utc(start), utc(end), 'UTC')
+
+
+WEEKLY = timed('weekly', '2026-02-02T09:00:00', '2026-02-02T10:00:00', recurrence=['RRULE:FREQ=WEEKLY;COUNT=4'])
+MOVED = timed(
+    'weekly_20260209T090000Z', '2026-02-10T14:00:00', '2026-02-10T15:00:00',
+    recurringEventId='weekly', originalStartTime={'dateTime': '2026-02-09T09:00:00Z', 'timeZone': 'UTC'},
+)
+CANCELLED = {
+    'id': 'weekly_20260216T090000Z',
+    'status': 'cancelled',
+    'recurringEventId': 'weekly',
+    'originalStartTime': {'dateTime': '2026-02-16T09:00:00Z', 'timeZone': 'UTC'},
+}
+
+
+def test_recurring_series_skip_moved_and_cancelled_instances():
+    index = build(WEEKLY, MOVED, CANCELLED)
+
+    assert [(interval.event_id, interval.start) for interval in index.intervals] == [
+        ('weekly', utc('2026-02-02T09:00:00')),
+        ('weekly_20260209T090000Z', utc('2026-02-10T14:00:00')),
+        ('weekly', utc('2026-02-23T09:00:00')),
+    ]
+    assert index.is_free(utc('2026-02-09T09:00:00'), utc('2026-02-09T10:00:00'))
+    assert index.is_free(utc('2026-02-16T09:00:00'), utc('2026-02-16T10:00:00'))
+
+
+def test_occurrences_overlapping_the_window_start_are_included():
+    event = Event.from_dict(timed('night', '2026-01-31T22:00:00', '2026-02-01T06:00:00', recurrence=['RRULE:FREQ=DAILY']))
+
+    intervals = event_intervals(event, utc('2026-02-01T00:00:00'), utc('2026-02-02T00:00:00'), 'UTC')
+
+    assert [interval.start for interval in intervals] == [utc('2026-01-31T22:00:00'), utc('2026-02-01T22:00:00')]
+
+
+def test_all_day_recurrences_end_on_their_until_date():
+    holiday = {
+        'id': 'holiday',
+        'status': 'confirmed',
+        'start': {'date': '2026-03-02'},
+        'end': {'date': '2026-03-03'},
+        'recurrence': ['RRULE:FREQ=DAILY;UNTIL=20260304'],
+    }
+
+    index = build(holiday, start='2026-03-01T00:00:00', end='2026-03-10T00:00:00')
+
+    assert index.busy(utc('2026-03-01T00:00:00'), utc('2026-03-10T00:00:00')) == [
+        (utc('2026-03-02T00:00:00'), utc('2026-03-05T00:00:00')),
+    ]
+    assert series_end(Event.from_dict(holiday), 'UTC') == utc('2026-03-05T00:00:00')
+
+
+def test_series_end_is_none_for_open_ended_series():
+    daily = Event.from_dict(timed('daily', '2026-02-02T09:00:00', '2026-02-02T09:15:00', recurrence=['RRULE:FREQ=DAILY']))
+
+    assert series_end(daily) is None
+    assert series_end(Event.from_dict(WEEKLY)) == utc('2026-02-23T10:00:00')
+
+
+def test_transparent_and_cancelled_events_do_not_block_time():
+    index = build(
+        timed('optional', '2026-02-02T09:00:00', '2026-02-02T10:00:00', transparency='transparent'),
+        timed('called_off', '2026-02-02T11:00:00', '2026-02-02T12:00:00', status='cancelled'),
+    )
+
+    assert index.intervals == []
+
+
+def test_free_periods_and_the_next_free_slot():
+    index = build(
+        timed('a', '2026-02-02T09:00:00', '2026-02-02T10:00:00'),
+        timed('b', '2026-02-02T09:30:00', '2026-02-02T10:15:00'),
+        timed('c', '2026-02-02T10:45:00', '2026-02-02T11:00:00'),
+    )
+    morning = (utc('2026-02-02T08:00:00'), utc('2026-02-02T12:00:00'))
+
+    assert index.busy(*morning) == [
+        (utc('2026-02-02T09:00:00'), utc('2026-02-02T10:15:00')),
+        (utc('2026-02-02T10:45:00'), utc('2026-02-02T11:00:00')),
+    ]
+    assert index.free(*morning) == [
+        (utc('2026-02-02T08:00:00'), utc('2026-02-02T09:00:00')),
+        (utc('2026-02-02T10:15:00'), utc('2026-02-02T10:45:00')),
+        (utc('2026-02-02T11:00:00'), utc('2026-02-02T12:00:00')),
+    ]
+    after_nine = (utc('2026-02-02T09:00:00'), utc('2026-02-02T12:00:00'))
+    assert index.next_free_slot(timedelta(minutes=30), *after_nine) == (utc('2026-02-02T10:15:00'), utc('2026-02-02T10:45:00'))
+    assert index.next_free_slot(timedelta(minutes=45), *after_nine) == (utc('2026-02-02T11:00:00'), utc('2026-02-02T11:45:00'))
+    assert index.next_free_slot(timedelta(hours=2), *after_nine) is None
@@ -0,0 +1,147 @@
+import threading
+import time
+from typing import Any, List, Optional
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from multi_agent_functions.v1.llm.prompt_cache import GeminiContextCache, LocalPrefixCache, PromptCache, split_prefix
+from multi_agent_functions.v1.llm.rate_limited_model import RateLimitedModel
+
+
+class RecordingModel(BaseChatModel):
+    """
+    Answers every call with the same message and reports the input size as usage,
+    without any cache reads, like a provider without context caching.
+    """
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        message = AIMessage('done', usage_metadata={'input_tokens': 500, 'output_tokens': 1, 'total_tokens': 501})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    @property
+    def _llm_type(self) -> str:
+        return 'recording'
+
+
+SYSTEM_PROMPT = SystemMessage('You manage Google Tasks. ' * 40)
+
+
+def test_prompt_cache_is_abstract():
+    with pytest.raises(TypeError):
+        PromptCache()
+
+
+def test_split_prefix_keeps_the_summary_in_the_tail():
+    summary = SystemMessage('Summary of the earlier conversation: ...')
+    question = HumanMessage('What is due today?')
+
+    prefix, rest = split_prefix([SYSTEM_PROMPT, summary, question])
+
+    assert prefix == [SYSTEM_PROMPT]
+    assert rest == [summary, question]
+    assert split_prefix([question]) == ([], [question])
+
+
+def test_prepare_reuses_the_prefix_across_summaries():
+    cache = LocalPrefixCache()
+    model = RecordingModel()
+    first = [SYSTEM_PROMPT, SystemMessage('Summary: one'), HumanMessage('hi')]
+    second = [SYSTEM_PROMPT, SystemMessage('Summary: two'), HumanMessage('hi again')]
+
+    miss = cache.prepare(model, first, {})
+    hit = cache.prepare(model, second, {})
+
+    assert not miss.hit and miss.prefix.handle.startswith('local/')
+    assert hit.hit and hit.prefix.key == miss.prefix.key
+    # The local stand-in sends requests unchanged.
+    assert miss.messages == first and hit.messages == second
+
+
+def test_gemini_attach_moves_the_tail_system_messages_into_user_turns():
+    summary = SystemMessage('Summary: one')
+    question = HumanMessage('hi')
+
+    messages, kwargs = GeminiContextCache()._attach('cachedContents/1', [SYSTEM_PROMPT], [summary, question], {'tools': [{}], 'stop': None})
+
+    assert [type(message) for message in messages] == [HumanMessage, HumanMessage]
+    assert messages[0].content == summary.content
+    assert kwargs == {'stop': None, 'cached_content': 'cachedContents/1'}
+
+
+def test_prefix_key_includes_the_tools():
+    cache = LocalPrefixCache()
+    model = RecordingModel()
+    messages = [SYSTEM_PROMPT, HumanMessage('hi')]
+
+    without_tools = cache.prepare(model, messages, {})
+    with_tools = cache.prepare(model, messages, {'tools': [{'name': 'tasks_list'}]})
+
+    assert without_tools.prefix.key != with_tools.prefix.key
+    assert not with_tools.hit
+
+
+def test_small_prefixes_are_sent_uncached():
+    cache = LocalPrefixCache(min_tokens=10_000)
+    model = RecordingModel()
+
+    call = cache.prepare(model, [SYSTEM_PROMPT, HumanMessage('hi')], {})
+    again = cache.prepare(model, [SYSTEM_PROMPT, HumanMessage('hi')], {})
+
+    assert call.prefix.handle is None and not call.hit
+    assert again.prefix is call.prefix and not again.hit
+
+
+def test_cached_and_uncached_tokens_are_reported():
+    cache = LocalPrefixCache()
+    model = RateLimitedModel(RecordingModel(), prompt_cache=cache)
+
+    first = model.invoke([SYSTEM_PROMPT, HumanMessage('hi')])
+    second = model.invoke([SYSTEM_PROMPT, HumanMessage('hi again')])
+
+    prefix_tokens = cache.prepare(model.model, [SYSTEM_PROMPT], {}).prefix.tokens
+    assert first.response_metadata['prompt_cache']['cached_tokens'] == 0
+    assert first.response_metadata['prompt_cache']['uncached_tokens'] == 500
+    assert second.response_metadata['prompt_cache']['cached_tokens'] == prefix_tokens
+    assert second.response_metadata['prompt_cache']['uncached_tokens'] == 500 - prefix_tokens
+    metrics = cache.metrics()
+    assert (metrics.calls, metrics.hits) == (2, 1)
+    assert metrics.cached_tokens == prefix_tokens
+    assert metrics.uncached_tokens == 1000 - prefix_tokens
+
+
+def test_reported_cache_reads_take_precedence():
+    cache = LocalPrefixCache()
+    model = RecordingModel()
+    call = cache.prepare(model, [SYSTEM_PROMPT, HumanMessage('hi')], {})
+
+    usage = cache.record(call, {'input_tokens': 500, 'input_token_details': {'cache_read': 320}})
+
+    assert (usage.cached_tokens, usage.uncached_tokens) == (320, 180)
+
+
+def test_concurrent_calls_create_a_prefix_once():
+    class SlowCache(LocalPrefixCache):
+        created = 0
+
+        def _create(self, model, key, prefix, kwargs):
+            time.sleep(0.05)
+            SlowCache.created += 1
+            return super()._create(model, key, prefix, kwargs)
+
+    cache = SlowCache()
+    model = RecordingModel()
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.prepare(model, [SYSTEM_PROMPT, HumanMessage('hi')], {})))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert SlowCache.created == 1
+    assert len({call.prefix.key for call in results}) == 1
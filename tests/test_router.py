@@ -0,0 +1,57 @@
+from langchain_core.messages import HumanMessage
+
+from multi_agent_functions.v2.router import FastPathRouter
+from multi_agent_functions.v2.supervisor_graph import SupervisorGraph
+
+TASK_REQUESTS = [
+    'add milk to my groceries task list',
+    'mark the report task as completed',
+    'show my tasks due today',
+    'create a task to call the plumber',
+    'delete the laundry task',
+]
+CALENDAR_REQUESTS = [
+    'schedule a meeting with anna tomorrow at 3pm',
+    'what events do i have on friday',
+    'move my dentist appointment to next week',
+    'book a calendar slot for the team meeting',
+]
+
+
+def trained_router(tasks: int, calendar: int, **kwargs) -> FastPathRouter:
+    router = FastPathRouter(log_path=None, min_examples=1, shadow_rate=0.0, **kwargs)
+    for i in range(tasks):
+        router.observe(TASK_REQUESTS[i % len(TASK_REQUESTS)], 'google_tasks')
+    for i in range(calendar):
+        router.observe(CALENDAR_REQUESTS[i % len(CALENDAR_REQUESTS)], 'google_calendar')
+    return router
+
+
+def test_clear_requests_are_routed():
+    router = trained_router(10, 8)
+
+    assert router.route('add eggs to my groceries task list').next == 'google_tasks'
+    assert router.route('schedule a meeting with the dentist').next == 'google_calendar'
+
+
+def test_unknown_words_do_not_favour_the_smaller_decision():
+    router = trained_router(19, 1)
+
+    assert router.route('the second one please') is None
+    assert router.route('xyzzy plugh') is None
+
+
+def test_requests_without_enough_evidence_fall_back():
+    router = trained_router(10, 8, min_evidence=3)
+
+    assert router.route('the meeting') is None
+    assert router.metrics().fallbacks == 1
+
+
+def test_replies_to_questions_are_not_fresh_requests():
+    question = HumanMessage('Which of these two lists do you mean?', name='google_tasks')
+    answer = HumanMessage('the second one please')
+
+    assert SupervisorGraph._user_request({'messages': [question, answer]}) is None
+    assert SupervisorGraph._user_request({'messages': [HumanMessage('Done.', name='supervisor'), answer]}) == answer.content
+    assert SupervisorGraph._user_request({'messages': [answer]}) == answer.content